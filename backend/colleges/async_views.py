@@ -0,0 +1,84 @@
+"""
+Async versions of the public college read endpoints (see kcet_eduguide.async_api).
+
+Responses match the synchronous views in colleges.views.
+"""
+from .models import College, Branch, Cutoff, Category
+from .serializers import CollegeSerializer, BranchSerializer, BranchSearchSerializer
+from .views import cutoff_rounds, search_querysets
+from kcet_eduguide.async_api import async_read_view, json_error
+
+
+@async_read_view
+async def college_list(request):
+    colleges = [college async for college in College.objects.all()]
+    return CollegeSerializer(colleges, many=True).data
+
+
+@async_read_view
+async def college_cutoff(request, public_id):
+    try:
+        college = await College.objects.aget(public_id=public_id)
+    except College.DoesNotExist:
+        return json_error('College not found', 404)
+
+    cutoffs = Cutoff.objects.filter(unique_key__college=college).select_related(
+        'unique_key__college', 'unique_key__cluster'
+    )
+
+    # Structure data for charts
+    cutoff_data = {}
+    async for cutoff in cutoffs:
+        branch_key = cutoff.unique_key.unique_key
+        if branch_key not in cutoff_data:
+            cutoff_data[branch_key] = {
+                'branch': BranchSerializer(cutoff.unique_key).data,
+                'categories': {}
+            }
+        cutoff_data[branch_key]['categories'][cutoff.category] = cutoff_rounds(cutoff)
+    return cutoff_data
+
+
+@async_read_view
+async def branch_cutoff(request, public_id):
+    try:
+        branch = await Branch.objects.select_related('college', 'cluster').aget(public_id=public_id)
+    except Branch.DoesNotExist:
+        return json_error('Branch not found', 404)
+
+    # Optional category filter, widened to its fall-back categories
+    category_filter = request.GET.get('category', None)
+    valid_categories = set()
+    if category_filter:
+        try:
+            cat_obj = await Category.objects.aget(category=category_filter)
+            valid_categories = {c.strip() for c in cat_obj.fall_back.split(',') if c.strip()}
+        except Category.DoesNotExist:
+            valid_categories = {category_filter}
+
+    cutoff_data = {
+        'branch': BranchSerializer(branch).data,
+        'categories': {}
+    }
+    async for cutoff in Cutoff.objects.filter(unique_key=branch):
+        if category_filter and cutoff.category not in valid_categories:
+            continue
+        cutoff_data['categories'][cutoff.category] = cutoff_rounds(cutoff)
+    return cutoff_data
+
+
+@async_read_view
+async def search(request):
+    query = request.GET.get('query', '').strip()
+    location = request.GET.get('location', '').strip()
+
+    colleges_qs, branches_qs, locations_qs = search_querysets(query, location)
+    colleges = [college async for college in colleges_qs]
+    branches = [branch async for branch in branches_qs]
+    locations = [location async for location in locations_qs]
+
+    return {
+        'colleges': CollegeSerializer(colleges, many=True).data,
+        'branches': BranchSearchSerializer(branches, many=True).data,
+        'locations': locations,
+    }
@@ -0,0 +1,125 @@
+"""
+Compare per-request latency with and without persistent database connections.
+
+Sends sequential requests to a read endpoint through the WSGI app, so the
+request_started/request_finished connection handling runs exactly as in
+production, under three connection policies:
+  - per-request: CONN_MAX_AGE=0, a new connection (TCP + TLS + auth) per request
+  - persistent:  CONN_MAX_AGE=--max-age, no health checks
+  - checked:     CONN_MAX_AGE=--max-age with CONN_HEALTH_CHECKS
+
+--drop-every N closes the driver connection behind Django's back every N
+requests, like the server timing out an idle connection; without health
+checks the next request on it fails. (The SQLite backend always reports its
+connections as usable, so use MySQL to see health checks recover.)
+
+Point DB_HOST at a local MySQL with SSL enabled (e.g. the mysql:8 Docker
+image) as a stand-in for the remote database; connection setup there is
+cheaper than over the network, so real savings are larger.
+
+Usage:
+    python manage.py benchmark_db_connections --requests 200
+    python manage.py benchmark_db_connections --requests 200 --drop-every 50
+"""
+import io
+import statistics
+import sys
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from kcet_eduguide.benchmark import request_host
+
+POLICIES = ('per-request', 'persistent', 'checked')
+
+
+class Command(BaseCommand):
+    help = 'Compare request latency with and without persistent database connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Requests per policy')
+        parser.add_argument('--path', default='/api/colleges/', help='Endpoint to request')
+        parser.add_argument('--max-age', type=int, default=60, help='CONN_MAX_AGE for the persistent policies')
+        parser.add_argument('--drop-every', type=int, default=0,
+                            help='Drop the connection every N requests (0 = never)')
+
+    def handle(self, *args, **options):
+        self.host = request_host()
+        connection = connections['default']
+        original = {key: connection.settings_dict[key] for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+        app = WSGIHandler()
+
+        self.connects = 0
+
+        def count_connect(sender, connection, **kwargs):
+            self.connects += 1
+
+        connection_created.connect(count_connect)
+        try:
+            self.stdout.write(
+                f"{options['requests']} requests to {options['path']} on {connection.vendor} "
+                f"({connection.settings_dict['HOST'] or 'local'})"
+            )
+            for policy in POLICIES:
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = 0 if policy == 'per-request' else options['max_age']
+                connection.settings_dict['CONN_HEALTH_CHECKS'] = policy == 'checked'
+                self.connects = 0
+                results = self._run(app, connection, options['path'], options['requests'], options['drop_every'])
+                self._report(policy, results)
+        finally:
+            connection_created.disconnect(count_connect)
+            connection.close()
+            connection.settings_dict.update(original)
+
+    def _environ(self, path):
+        return {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': self.host,
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': self.host,
+            'REMOTE_ADDR': '127.0.0.1',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': False,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+    def _run(self, app, connection, path, count, drop_every):
+        results = []
+        for i in range(count):
+            if drop_every and i and i % drop_every == 0 and connection.connection is not None:
+                connection.connection.close()
+
+            status = []
+            start = time.perf_counter()
+            response = app(self._environ(path), lambda s, headers, exc_info=None: status.append(s))
+            try:
+                b''.join(response)
+            finally:
+                # Fires request_finished, which closes or keeps the connection
+                response.close()
+            results.append((int(status[0].split()[0]), time.perf_counter() - start))
+
+        if all(status != 200 for status, _ in results):
+            raise CommandError(f'Every request to {path} failed (status {results[0][0]})')
+        return results
+
+    def _report(self, policy, results):
+        latencies = sorted(latency for _, latency in results)
+        errors = sum(1 for status, _ in results if status != 200)
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+        self.stdout.write(
+            f'{policy:<12} mean {statistics.mean(latencies) * 1000:7.2f} ms  '
+            f'p50 {statistics.median(latencies) * 1000:7.2f} ms  p95 {p95 * 1000:7.2f} ms  '
+            f'connects {self.connects:4d}  errors {errors:3d}'
+        )
@@ -0,0 +1,249 @@
+"""
+Load test the public read endpoints: WSGI workers vs ASGI with sync or async views.
+
+Drives the project's WSGI and ASGI applications in-process (no server or
+network needed) with many concurrent simulated clients. Clients can be made
+slow (--client-kbps): each response chunk takes len/bandwidth to "deliver",
+like a phone on a congested mobile network.
+
+Modes:
+  - wsgi:       sync views on a pool of --workers threads; a worker is busy
+                until its client has received the whole response (like
+                gunicorn sync workers)
+  - asgi-sync:  kcet_eduguide.asgi with the DRF views (ASYNC_READ_VIEWS off)
+  - asgi-async: kcet_eduguide.asgi with the async views (ASYNC_READ_VIEWS on)
+
+For each mode it reports throughput, latency percentiles, non-200 responses
+and the peak number of threads.
+
+Usage:
+    python manage.py loadtest_read_views
+    python manage.py loadtest_read_views --requests 400 --concurrency 100 --client-kbps 32 --workers 4
+"""
+import asyncio
+import importlib
+import io
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.urls import clear_url_caches
+
+from colleges.models import Branch, College
+from kcet_eduguide.benchmark import request_host
+from reviews.models import CollegeReview
+
+MODES = ('wsgi', 'asgi-sync', 'asgi-async')
+URLCONF_MODULES = ('colleges.urls', 'reviews.urls')
+
+
+def _route_read_views():
+    """Re-import the URLconfs so they pick up the current ASYNC_READ_VIEWS."""
+    for name in URLCONF_MODULES + (settings.ROOT_URLCONF,):
+        importlib.reload(importlib.import_module(name))
+    clear_url_caches()
+
+
+class ThreadPeak:
+    """Samples threading.active_count() in the background."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(0.01):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class Command(BaseCommand):
+    help = 'Compare read endpoint throughput under WSGI workers and ASGI (sync and async views)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=300, help='Requests per mode')
+        parser.add_argument('--concurrency', type=int, default=100, help='Concurrent clients')
+        parser.add_argument('--workers', type=int, default=4, help='WSGI worker threads')
+        parser.add_argument('--client-kbps', type=float, default=64,
+                            help='Client download speed in KB/s (0 = instant)')
+        parser.add_argument('--mode', choices=MODES, action='append',
+                            help='Mode(s) to run (default: all)')
+
+    def handle(self, *args, **options):
+        self.host = request_host()
+        paths = self._paths()
+        bandwidth = options['client_kbps'] * 1024
+        self.stdout.write(
+            f"{options['requests']} requests per mode, {options['concurrency']} clients at "
+            f"{options['client_kbps'] or 'unlimited'} KB/s, endpoints: {', '.join(paths)}"
+        )
+
+        for mode in options['mode'] or MODES:
+            urls = [paths[i % len(paths)] for i in range(options['requests'])]
+            with override_settings(ASYNC_READ_VIEWS=(mode == 'asgi-async')):
+                _route_read_views()
+                with ThreadPeak() as threads:
+                    start = time.perf_counter()
+                    if mode == 'wsgi':
+                        results = self._run_wsgi(urls, options['workers'], options['concurrency'], bandwidth)
+                    else:
+                        results = asyncio.run(self._run_asgi(urls, options['concurrency'], bandwidth))
+                    elapsed = time.perf_counter() - start
+            self._report(mode, results, elapsed, threads.peak)
+        _route_read_views()
+
+    def _paths(self):
+        college = College.objects.order_by('college_id').first()
+        branch = Branch.objects.order_by('unique_key').first()
+        reviewed = CollegeReview.objects.values_list('unique_key__public_id', flat=True).first()
+        if college is None or branch is None:
+            raise CommandError('Load test needs at least one college and branch')
+        paths = [
+            '/api/colleges/',
+            '/api/search/?query=engineering',
+            f'/api/colleges/{college.public_id}/cutoff/',
+            f'/api/branches/{branch.public_id}/cutoff/',
+        ]
+        if reviewed:
+            paths.append(f'/api/reviews/branches/{reviewed}/')
+        return paths
+
+    def _report(self, mode, results, elapsed, peak_threads):
+        latencies = sorted(latency for _, latency, _ in results)
+        errors = sum(1 for status, _, _ in results if status != 200)
+        size = statistics.mean(size for _, _, size in results)
+        p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+        self.stdout.write(
+            f'{mode:<11} {len(results) / elapsed:8.1f} req/s  '
+            f'p50 {statistics.median(latencies) * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms  '
+            f'avg {size / 1024:6.1f} KB  errors {errors:3d}  peak threads {peak_threads}'
+        )
+
+    # WSGI: each worker thread serves one request at a time, including the
+    # slow delivery of its body
+
+    def _wsgi_environ(self, url):
+        parts = urlsplit(url)
+        return {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': parts.path,
+            'QUERY_STRING': parts.query,
+            'SERVER_NAME': self.host,
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': self.host,
+            'REMOTE_ADDR': '127.0.0.1',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+
+    def _wsgi_request(self, app, url, bandwidth, submitted):
+        status = []
+        response = app(self._wsgi_environ(url), lambda s, headers, exc_info=None: status.append(s))
+        size = 0
+        try:
+            for chunk in response:
+                size += len(chunk)
+                if bandwidth:
+                    time.sleep(len(chunk) / bandwidth)
+        finally:
+            response.close()
+        return int(status[0].split()[0]), time.perf_counter() - submitted, size
+
+    def _run_wsgi(self, urls, workers, concurrency, bandwidth):
+        app = WSGIHandler()
+        # Clients beyond the worker count wait in the accept queue
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self._wsgi_request, app, url, bandwidth, time.perf_counter())
+                for url in urls[:concurrency]
+            ]
+            pending = list(urls[concurrency:])
+            results = []
+            while futures:
+                done = futures.pop(0).result()
+                results.append(done)
+                if pending:
+                    futures.append(
+                        pool.submit(self._wsgi_request, app, pending.pop(0), bandwidth, time.perf_counter())
+                    )
+        return results
+
+    # ASGI: one event loop; slow delivery only suspends the request's task
+
+    def _asgi_scope(self, url):
+        parts = urlsplit(url)
+        return {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': parts.path,
+            'raw_path': parts.path.encode(),
+            'query_string': parts.query.encode(),
+            'root_path': '',
+            'headers': [(b'host', self.host.encode())],
+            'client': ('127.0.0.1', 50000),
+            'server': (self.host, 80),
+        }
+
+    async def _asgi_request(self, app, url, bandwidth):
+        submitted = time.perf_counter()
+        status = None
+        size = 0
+        body_sent = False
+
+        async def receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            # The client stays connected
+            await asyncio.Event().wait()
+
+        async def send(message):
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                chunk = message.get('body', b'')
+                size += len(chunk)
+                if bandwidth and chunk:
+                    await asyncio.sleep(len(chunk) / bandwidth)
+
+        await app(self._asgi_scope(url), receive, send)
+        return status, time.perf_counter() - submitted, size
+
+    async def _run_asgi(self, urls, concurrency, bandwidth):
+        app = ASGIHandler()
+        queue = list(urls)
+        results = []
+
+        async def client():
+            while queue:
+                results.append(await self._asgi_request(app, queue.pop(), bandwidth))
+
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        return results
@@ -1,3 +1,4 @@
+from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import serializers
 from .models import College, Cluster, Branch, Cutoff, Category
 
@@ -23,6 +24,24 @@ class BranchSerializer(serializers.ModelSerializer):
         fields = ['unique_key', 'public_id', 'college', 'cluster', 'branch_id', 'branch_name']
 
 
+class BranchSearchSerializer(BranchSerializer):
+    """Branch with its review rating summary (select_related('rating_summary') to avoid extra queries)."""
+    rating_summary = serializers.SerializerMethodField()
+
+    class Meta(BranchSerializer.Meta):
+        fields = BranchSerializer.Meta.fields + ['rating_summary']
+
+    def get_rating_summary(self, obj):
+        try:
+            summary = obj.rating_summary
+        except ObjectDoesNotExist:
+            return {'total_reviews': 0, 'average_rating': None}
+        return {
+            'total_reviews': summary.review_count,
+            'average_rating': summary.overall_average(),
+        }
+
+
 class CutoffSerializer(serializers.ModelSerializer):
     unique_key = BranchSerializer(read_only=True)
     
@@ -0,0 +1,92 @@
+from contextlib import ExitStack
+
+from django.test import TransactionTestCase, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from counselling.models import CounsellingChoice
+from kcet_eduguide.db_routers import REPLICA_ALIAS
+from reviews.models import CollegeReview, RATING_NAMES
+from students.models import Student
+
+from .models import Branch, Category, Cluster, College, Cutoff
+
+
+@override_settings(ASYNC_READ_VIEWS=False, RATELIMIT_ENABLE=False)
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Catalogue GETs read from the replica; read-after-write endpoints and
+    writes only touch the primary.
+
+    'replica' mirrors the test database (TEST['MIRROR']) through its own
+    connection, which only sees committed rows - hence TransactionTestCase.
+    """
+
+    databases = {'default', REPLICA_ALIAS}
+
+    def setUp(self):
+        cluster = Cluster.objects.create(cluster_code='A', cluster_name='Computer Science')
+        self.college = College.objects.create(
+            college_id='E01', college_code='E001', college_name='Test College', location='Bengaluru'
+        )
+        self.branch = Branch.objects.create(
+            unique_key='E01CS', college=self.college, cluster=cluster, branch_id='CS',
+            branch_name='Computer Science',
+        )
+        self.other_branch = Branch.objects.create(
+            unique_key='E01EC', college=self.college, cluster=cluster, branch_id='EC',
+            branch_name='Electronics',
+        )
+        Category.objects.create(category='2AG', fall_back='2AG,GM')
+        Cutoff.objects.create(unique_key=self.branch, category='GM', cutoff_2025_r1='9000')
+
+        self.studying = Student.objects.create(
+            type_of_student='studying', college_code='E001', unique_key=self.branch,
+            email_id='studying@example.com', phone_number='9000000000', year_of_starting=2022,
+        )
+        CollegeReview.objects.create(
+            student_user_id=self.studying, unique_key=self.branch,
+            **{f'{name}_rating': 4 for name in RATING_NAMES},
+        )
+        self.counselling = Student.objects.create(
+            type_of_student='counselling', category='2AG', kcet_rank=5000,
+            email_id='counselling@example.com', phone_number='9000000000',
+        )
+        CounsellingChoice.objects.create(student_user_id=self.counselling, unique_key=self.branch, order_of_list=1)
+
+    def request(self, method, path, data=None, user=None):
+        headers = {}
+        if user is not None:
+            headers['Authorization'] = f'Bearer {RefreshToken.for_user(user).access_token}'
+        kwargs = {'content_type': 'application/json'} if method == 'post' else {}
+        return getattr(self.client, method)(path, data, headers=headers, **kwargs)
+
+    def assertQueries(self, default, replica, method, path, data=None, user=None, status=200):
+        """Run a request with exactly `default` primary and `replica` replica queries."""
+        with ExitStack() as stack:
+            stack.enter_context(self.assertNumQueries(default, using='default'))
+            stack.enter_context(self.assertNumQueries(replica, using=REPLICA_ALIAS))
+            response = self.request(method, path, data, user)
+        self.assertEqual(response.status_code, status, response.content)
+
+    def assertPrimaryOnly(self, method, path, data=None, user=None, status=200):
+        with self.assertNumQueries(0, using=REPLICA_ALIAS):
+            response = self.request(method, path, data, user)
+        self.assertEqual(response.status_code, status, response.content)
+
+    def test_branch_reviews_read_replica(self):
+        self.assertQueries(0, 2, 'get', f'/api/reviews/branches/{self.branch.public_id}/')
+
+    def test_college_cutoff_reads_replica(self):
+        self.assertQueries(0, 2, 'get', f'/api/colleges/{self.college.public_id}/cutoff/')
+
+    def test_my_review_reads_primary(self):
+        self.assertPrimaryOnly('get', f'/api/reviews/my-review/{self.branch.unique_key}/', user=self.studying)
+
+    def test_choices_list_reads_primary(self):
+        self.assertPrimaryOnly('get', '/api/counselling/choices/', user=self.counselling)
+
+    def test_choice_create_uses_primary(self):
+        self.assertPrimaryOnly(
+            'post', '/api/counselling/choices/create/', {'public_id': str(self.other_branch.public_id)},
+            user=self.counselling, status=201,
+        )
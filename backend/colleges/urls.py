@@ -1,4 +1,5 @@
 from django.urls import path
+from . import async_views
 from .views import (
     college_list,
     college_detail,
@@ -12,15 +13,16 @@ from .views import (
     cluster_list,
     branch_insights,
 )
+from kcet_eduguide.async_api import read_view
 
 urlpatterns = [
-    path('', college_list, name='college-list'),
+    path('', read_view(college_list, async_views.college_list), name='college-list'),
     path('categories/', category_list, name='category-list'),
     path('clusters/', cluster_list, name='cluster-list'),
-    path('search/', search, name='search'),
+    path('search/', read_view(search, async_views.search), name='search'),
     path('locations/', locations_list, name='location-list'),
     path('branch-insights/', branch_insights, name='branch-insights'),
-    path('<uuid:public_id>/cutoff/', college_cutoff, name='college-cutoff'),
+    path('<uuid:public_id>/cutoff/', read_view(college_cutoff, async_views.college_cutoff), name='college-cutoff'),
     path('<uuid:public_id>/', college_detail, name='college-detail'),
 ]
 
@@ -28,6 +30,6 @@ urlpatterns = [
 branch_urlpatterns = [
     path('by-code/<str:college_code>/', branches_by_college_code, name='branches-by-code'),
     path('<uuid:public_id>/', branch_detail, name='branch-detail'),
-    path('<uuid:public_id>/cutoff/', branch_cutoff, name='branch-cutoff'),
+    path('<uuid:public_id>/cutoff/', read_view(branch_cutoff, async_views.branch_cutoff), name='branch-cutoff'),
 ]
 
@@ -9,6 +9,7 @@ from .serializers import (
     CollegeSerializer,
     CollegeDetailSerializer,
     BranchSerializer,
+    BranchSearchSerializer,
     CutoffSerializer,
     CategorySerializer,
     ClusterSerializer,
@@ -60,13 +61,29 @@ def branches_by_college_code(request, college_code):
     return Response(serializer.data)
 
 
+CUTOFF_YEARS = ('2022', '2023', '2024', '2025')
+
+
+def cutoff_rounds(cutoff):
+    """Round-wise cutoff ranks of a Cutoff row: {'2022': {'r1': .., 'r2': .., 'r3': ..}, ...}."""
+    return {
+        year: {
+            f'r{round_no}': getattr(cutoff, f'cutoff_{year}_r{round_no}')
+            for round_no in (1, 2, 3)
+        }
+        for year in CUTOFF_YEARS
+    }
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def college_cutoff(request, public_id):
     try:
         college = College.objects.get(public_id=public_id)
         branches = Branch.objects.filter(college=college)
-        cutoffs = Cutoff.objects.filter(unique_key__in=branches).select_related('unique_key')
+        cutoffs = Cutoff.objects.filter(unique_key__in=branches).select_related(
+            'unique_key__college', 'unique_key__cluster'
+        )
 
         # Structure data for charts
         cutoff_data = {}
@@ -77,30 +94,7 @@ def college_cutoff(request, public_id):
                     'branch': BranchSerializer(cutoff.unique_key).data,
                     'categories': {}
                 }
-
-            category_data = {
-                '2022': {
-                    'r1': cutoff.cutoff_2022_r1,
-                    'r2': cutoff.cutoff_2022_r2,
-                    'r3': cutoff.cutoff_2022_r3,
-                },
-                '2023': {
-                    'r1': cutoff.cutoff_2023_r1,
-                    'r2': cutoff.cutoff_2023_r2,
-                    'r3': cutoff.cutoff_2023_r3,
-                },
-                '2024': {
-                    'r1': cutoff.cutoff_2024_r1,
-                    'r2': cutoff.cutoff_2024_r2,
-                    'r3': cutoff.cutoff_2024_r3,
-                },
-                '2025': {
-                    'r1': cutoff.cutoff_2025_r1,
-                    'r2': cutoff.cutoff_2025_r2,
-                    'r3': cutoff.cutoff_2025_r3,
-                },
-            }
-            cutoff_data[branch_key]['categories'][cutoff.category] = category_data
+            cutoff_data[branch_key]['categories'][cutoff.category] = cutoff_rounds(cutoff)
 
         return Response(cutoff_data)
     except College.DoesNotExist:
@@ -111,7 +105,7 @@ def college_cutoff(request, public_id):
 @permission_classes([AllowAny])
 def branch_cutoff(request, public_id):
     try:
-        branch = Branch.objects.get(public_id=public_id)
+        branch = Branch.objects.select_related('college', 'cluster').get(public_id=public_id)
         cutoffs = Cutoff.objects.filter(unique_key=branch)
 
         # Get category filter from query params (optional)
@@ -137,50 +131,22 @@ def branch_cutoff(request, public_id):
             if category_filter and cutoff.category not in valid_categories:
                 continue
 
-            category_data = {
-                '2022': {
-                    'r1': cutoff.cutoff_2022_r1,
-                    'r2': cutoff.cutoff_2022_r2,
-                    'r3': cutoff.cutoff_2022_r3,
-                },
-                '2023': {
-                    'r1': cutoff.cutoff_2023_r1,
-                    'r2': cutoff.cutoff_2023_r2,
-                    'r3': cutoff.cutoff_2023_r3,
-                },
-                '2024': {
-                    'r1': cutoff.cutoff_2024_r1,
-                    'r2': cutoff.cutoff_2024_r2,
-                    'r3': cutoff.cutoff_2024_r3,
-                },
-                '2025': {
-                    'r1': cutoff.cutoff_2025_r1,
-                    'r2': cutoff.cutoff_2025_r2,
-                    'r3': cutoff.cutoff_2025_r3,
-                },
-            }
-            cutoff_data['categories'][cutoff.category] = category_data
+            cutoff_data['categories'][cutoff.category] = cutoff_rounds(cutoff)
 
         return Response(cutoff_data)
     except Branch.DoesNotExist:
         return Response({'error': 'Branch not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def search(request):
+def search_querysets(query, location):
     """
-    Unified search endpoint for colleges and branches.
-    Returns:
-      - colleges: serialized college objects (filtered by query & location if provided)
-      - branches: serialized branch objects (filtered by query & location if provided)
-      - locations: unique sorted list of locations from College table for dropdown
-    """
-    query = request.GET.get('query', '').strip()
-    location = request.GET.get('location', '').strip()  # NEW: location param
+    Querysets behind the search endpoint: (colleges, branches, locations).
 
+    Branches come with their college, cluster and rating summary selected, so
+    serializing them issues no further queries.
+    """
     colleges_qs = College.objects.all()
-    branches_qs = Branch.objects.select_related('college', 'cluster')
+    branches_qs = Branch.objects.select_related('college', 'cluster', 'rating_summary')
 
     # filter by query (if provided)
     if query:
@@ -205,7 +171,7 @@ def search(request):
         branches_qs = branches_qs.filter(college__location__iexact=location)
 
     # get unique locations for the dropdown (sorted)
-    locations = list(
+    locations_qs = (
         College.objects
                .exclude(location__isnull=True)
                .exclude(location__exact='')
@@ -214,8 +180,28 @@ def search(request):
                .order_by('location')
     )
 
+    return colleges_qs, branches_qs, locations_qs
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def search(request):
+    """
+    Unified search endpoint for colleges and branches.
+    Returns:
+      - colleges: serialized college objects (filtered by query & location if provided)
+      - branches: serialized branch objects with review rating summaries
+                  (filtered by query & location if provided)
+      - locations: unique sorted list of locations from College table for dropdown
+    """
+    query = request.GET.get('query', '').strip()
+    location = request.GET.get('location', '').strip()  # NEW: location param
+
+    colleges_qs, branches_qs, locations_qs = search_querysets(query, location)
+    locations = list(locations_qs)
+
     college_serializer = CollegeSerializer(colleges_qs, many=True)
-    branch_serializer = BranchSerializer(branches_qs, many=True)
+    branch_serializer = BranchSearchSerializer(branches_qs, many=True)
 
     return Response({
         'colleges': college_serializer.data,
@@ -8,6 +8,8 @@ from colleges.models import Cutoff, Category, Branch
 from .models import CounsellingChoice
 from .serializers import CounsellingChoiceSerializer, CounsellingChoiceCreateSerializer
 from .utils import get_recommendations
+from kcet_eduguide.db_routers import primary_reads, replica_reads
+from kcet_eduguide.ratelimit import rate_limit
 
 
 def _get_cutoff_rank(student, branch, year='2025', round_name='r1'):
@@ -46,6 +48,8 @@ def _get_cutoff_rank(student, branch, year='2025', round_name='r1'):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@rate_limit('recommendations', '30/m')
+@replica_reads()  # only reads the catalogue
 def recommendations(request):
     """
     Get rank-based recommendations for counselling students using advanced algorithm.
@@ -138,6 +142,7 @@ def recommendations(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@primary_reads()  # a student's own list, read right after editing it
 def choices_list(request):
     """Get all counselling choices for the logged-in student with cutoff information"""
     student = request.user
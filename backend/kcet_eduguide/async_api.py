@@ -0,0 +1,65 @@
+"""
+Helpers for the async versions of public read endpoints.
+
+DRF views are synchronous, so the async endpoints (colleges.async_views,
+reviews.async_views) are plain Django async views: they load data with the
+async ORM API, serialize the loaded objects with the usual DRF serializers
+(which must not trigger further queries - select everything up front) and
+return JSON. Under ASGI they run on the event loop, so one worker can keep
+many slow clients connected at once.
+
+settings.ASYNC_READ_VIEWS chooses which version the URLconfs route to.
+"""
+import functools
+
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from rest_framework.views import exception_handler
+
+# Same compact encoding as DRF's JSONRenderer
+JSON_DUMPS_PARAMS = {'ensure_ascii': False, 'separators': (',', ':')}
+
+
+def async_read_view(view):
+    """
+    Turn an async function returning JSON-serializable data into a GET-only,
+    unauthenticated JSON view (the async counterpart of
+    @api_view(['GET']) + @permission_classes([AllowAny])).
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return JsonResponse(
+                {'detail': f'Method "{request.method}" not allowed.'},
+                status=405,
+                headers={'Allow': 'GET, HEAD'},
+            )
+        result = await view(request, *args, **kwargs)
+        if isinstance(result, HttpResponse):
+            return result
+        return JsonResponse(result, safe=False, json_dumps_params=JSON_DUMPS_PARAMS)
+    return wrapper
+
+
+def json_error(message, status):
+    return JsonResponse({'error': message}, status=status)
+
+
+def api_exception_response(exc):
+    """
+    The response a DRF view gives for an APIException raised by DRF code the
+    async views reuse (e.g. NotFound for an invalid pagination cursor).
+    """
+    response = exception_handler(exc, {})
+    return JsonResponse(
+        response.data,
+        status=response.status_code,
+        # e.g. Retry-After, WWW-Authenticate
+        headers={name: value for name, value in response.items() if name.lower() != 'content-type'},
+        json_dumps_params=JSON_DUMPS_PARAMS,
+    )
+
+
+def read_view(sync_view, async_view):
+    """The view to route a read endpoint to, per settings.ASYNC_READ_VIEWS."""
+    return async_view if getattr(settings, 'ASYNC_READ_VIEWS', False) else sync_view
@@ -0,0 +1,15 @@
+"""
+Helpers shared by the benchmark and load-test management commands.
+"""
+from django.conf import settings
+
+
+def request_host():
+    """
+    A host the commands' in-process requests can send in the Host header: the
+    first concrete ALLOWED_HOSTS entry, or 'localhost' (allowed while DEBUG).
+    """
+    return next(
+        (host for host in settings.ALLOWED_HOSTS if host != '*' and not host.startswith('.')),
+        'localhost',
+    )
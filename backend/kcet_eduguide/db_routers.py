@@ -0,0 +1,113 @@
+"""
+Read-replica routing for catalogue queries.
+
+When settings.DATABASES has a 'replica' alias (DB_REPLICA_HOST), reads of
+the catalogue models - colleges, branches, cutoffs and published reviews -
+go to the replica during GET/HEAD requests. Everything else reads from the
+primary ('default'):
+  - all writes, and every read in a request that writes (POST, PATCH, ...),
+    so a transaction never mixes databases
+  - per-student data (students, counselling choices, meetings, verification),
+    which is read back right after it is written
+  - code outside a request (management commands, background jobs)
+
+Replication lag means a GET can briefly miss a change just made on the
+primary. Views that read back what the client just wrote use
+@primary_reads() (e.g. a student's own review after submitting it); POST
+views that only read the catalogue can opt in with @replica_reads().
+"""
+import contextvars
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+REPLICA_ALIAS = 'replica'
+
+# Models written only by admins, imports and review submission
+REPLICA_MODELS = {
+    'colleges.cluster',
+    'colleges.college',
+    'colleges.branch',
+    'colleges.cutoff',
+    'colleges.category',
+    'reviews.collegereview',
+    'reviews.branchratingsummary',
+    'reviews.reviewsearchterm',
+}
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads():
+    """Read catalogue models from the replica (as in a GET request)."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Read everything from the primary, e.g. to read back the request's own writes."""
+    token = _replica_reads.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """Sends catalogue reads to the replica when the current request allows it."""
+
+    def db_for_read(self, model, **hints):
+        if (
+            _replica_reads.get()
+            and model._meta.label_lower in REPLICA_MODELS
+            and REPLICA_ALIAS in settings.DATABASES
+        ):
+            return REPLICA_ALIAS
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema through replication
+        return db != REPLICA_ALIAS
+
+
+class ReplicaReadsMiddleware:
+    """Allows replica reads for the duration of GET/HEAD/OPTIONS requests."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _replica_reads.set(request.method in SAFE_METHODS)
+        try:
+            return self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+
+    async def __acall__(self, request):
+        token = _replica_reads.set(request.method in SAFE_METHODS)
+        try:
+            return await self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
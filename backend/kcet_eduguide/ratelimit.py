@@ -0,0 +1,169 @@
+"""
+Cache-backed rate limiting for expensive API endpoints.
+
+Implements a sliding window counter: hits are counted per fixed window with
+an atomic cache.add/cache.incr, and the previous window's count is weighted
+by how much of it still overlaps the sliding window. With a shared cache
+backend (Redis, Memcached) the limit holds across all worker processes;
+with LocMemCache it is per process.
+
+Requests the view rejects as malformed (400) are refunded, so a client's
+budget is only spent on requests that did real work. Client IPs come from
+DRF's get_ident(), which honours REST_FRAMEWORK['NUM_PROXIES'] behind a
+reverse proxy.
+
+Usage (below @permission_classes so authentication has already run):
+
+    @api_view(['POST'])
+    @permission_classes([IsAuthenticated])
+    @rate_limit('check_text', '10/m')
+    def check_text(request):
+        ...
+"""
+import functools
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """Parse '10/m' style rates into (limit, period_seconds)."""
+    count, _, period = rate.partition('/')
+    if period not in PERIODS:
+        raise ValueError(f"Invalid rate period in {rate!r}; use one of {', '.join(PERIODS)}")
+    return int(count), PERIODS[period]
+
+
+def get_client_ip(request):
+    """
+    Client address, taken from X-Forwarded-For as added by the
+    REST_FRAMEWORK['NUM_PROXIES'] trusted proxies in front of the app
+    (REMOTE_ADDR when there are none).
+    """
+    return BaseThrottle().get_ident(request) or 'unknown'
+
+
+def get_rate_limit_ident(request, key):
+    """
+    Identify the caller for rate limiting.
+
+    key='user' uses the authenticated student (falling back to the client IP
+    for anonymous requests); key='ip' always uses the client IP.
+    """
+    if key == 'user':
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user:{user.student_user_id}'
+    return f'ip:{get_client_ip(request)}'
+
+
+def _increment(cache, cache_key, timeout):
+    # add() only creates the counter if it is missing, so concurrent first
+    # hits do not reset each other; incr() is atomic on shared backends.
+    cache.add(cache_key, 0, timeout)
+    try:
+        return cache.incr(cache_key)
+    except ValueError:
+        # Counter expired between add() and incr()
+        cache.add(cache_key, 1, timeout)
+        return 1
+
+
+def _get_cache():
+    return caches[getattr(settings, 'RATELIMIT_CACHE', 'default')]
+
+
+def _counter_key(group, ident, window):
+    return f'ratelimit:{group}:{ident}:{window}'
+
+
+def hit(group, ident, limit, period, now=None):
+    """
+    Record a hit and check it against the limit.
+
+    Args:
+        group (str): Endpoint group name (separate budget per group)
+        ident (str): Caller identity from get_rate_limit_ident()
+        limit (int): Allowed hits per period
+        period (int): Window length in seconds
+        now (float): Time of the hit (defaults to now)
+
+    Returns:
+        tuple: (allowed, retry_after_seconds)
+    """
+    cache = _get_cache()
+
+    if now is None:
+        now = time.time()
+    window = int(now // period)
+    elapsed = (now % period) / period
+    current_key = _counter_key(group, ident, window)
+    previous_key = _counter_key(group, ident, window - 1)
+
+    # Keep each counter alive long enough to serve as the previous window
+    current = _increment(cache, current_key, period * 2)
+    previous = cache.get(previous_key, 0)
+
+    estimated = previous * (1 - elapsed) + current
+    if estimated <= limit:
+        return True, 0
+
+    # Rejected requests do not consume budget, so clients that back off recover
+    try:
+        cache.decr(current_key)
+    except ValueError:
+        pass
+    retry_after = max(1, math.ceil(period * (1 - elapsed)))
+    return False, retry_after
+
+
+def refund(group, ident, period, now):
+    """Take back a hit recorded by hit(..., now=now)."""
+    try:
+        _get_cache().decr(_counter_key(group, ident, int(now // period)))
+    except ValueError:
+        # Counter already expired
+        pass
+
+
+def rate_limit(group, rate, key='user', message='Rate limit exceeded. Please wait before trying again.'):
+    """
+    Decorator for DRF function views that returns 429 once the rate is exceeded.
+
+    Args:
+        group (str): Name of the limited endpoint (budget is per group)
+        rate (str): Allowed rate, e.g. '10/m', '100/h'
+        key (str): 'user' (authenticated student, IP for anonymous) or 'ip'
+        message (str): Error message for the 429 response
+    """
+    limit, period = parse_rate(rate)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not getattr(settings, 'RATELIMIT_ENABLE', True):
+                return view(request, *args, **kwargs)
+
+            ident = get_rate_limit_ident(request, key)
+            now = time.time()
+            allowed, retry_after = hit(group, ident, limit, period, now=now)
+            if not allowed:
+                return Response(
+                    {'error': message},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    headers={'Retry-After': str(retry_after)},
+                )
+            response = view(request, *args, **kwargs)
+            if response.status_code == status.HTTP_400_BAD_REQUEST:
+                # Malformed request: rejected before doing the expensive work
+                refund(group, ident, period, now)
+            return response
+        return wrapped
+    return decorator
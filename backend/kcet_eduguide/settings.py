@@ -4,6 +4,7 @@ Django settings for kcet_eduguide project.
 
 from pathlib import Path
 import os
+import sys
 from datetime import timedelta
 from dotenv import load_dotenv
 import pytesseract
@@ -51,6 +52,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'kcet_eduguide.db_routers.ReplicaReadsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -94,10 +96,38 @@ DATABASES = {
         'PORT': os.getenv('DB_PORT',''),
         'OPTIONS': {
             'ssl_mode': 'REQUIRED'
-        }
+        },
+        # Seconds to reuse a connection (and its TLS session) across requests;
+        # 0 closes it after each request, "None" never expires it. Defaults to
+        # 0, which is safe under both servers. Only raise it under WSGI
+        # (gunicorn), below the server's wait_timeout: under ASGI each request
+        # runs its sync code on a new thread, so persistent connections pile up
+        # instead of being reused.
+        'CONN_MAX_AGE': None if os.getenv('DB_CONN_MAX_AGE') == 'None' else int(os.getenv('DB_CONN_MAX_AGE', '0')),
+        # Ping a reused connection at the start of each request and reconnect
+        # if the server dropped it
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
     }
 }
 
+# Optional read replica: catalogue reads in GET requests go there
+# (kcet_eduguide/db_routers.py). Unset variables fall back to the primary's.
+# `manage.py test` always gets the alias, mirroring the test database, so the
+# routing tests (colleges.tests) run without a replica.
+TESTING = sys.argv[1:2] == ['test']
+if os.getenv('DB_REPLICA_HOST') or TESTING:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST', DATABASES['default']['HOST']),
+        'PORT': os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['kcet_eduguide.db_routers.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -136,6 +166,38 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
+# File storage
+# Student ID card images live in their own storage instead of a LONGBLOB on the
+# student row. The default is a private local directory (no public URL); point
+# ID_CARD_STORAGE_BACKEND at an object store backend (e.g.
+# storages.backends.s3.S3Storage from django-storages) in production.
+ID_CARD_STORAGE_BACKEND = os.getenv('ID_CARD_STORAGE_BACKEND', 'django.core.files.storage.FileSystemStorage')
+ID_CARD_STORAGE_ROOT = os.getenv('ID_CARD_STORAGE_ROOT', os.path.join(BASE_DIR, 'media', 'id_cards'))
+
+# Uploaded ID cards are kept as a downscaled, recompressed copy for audit
+# viewing; the original upload is only stored when verification fails.
+ID_CARD_AUDIT_IMAGE = {
+    'MAX_SIDE': int(os.getenv('ID_CARD_AUDIT_MAX_SIDE', '1600')),
+    'FORMAT': os.getenv('ID_CARD_AUDIT_FORMAT', 'WEBP'),  # or JPEG
+    'QUALITY': int(os.getenv('ID_CARD_AUDIT_QUALITY', '80')),
+}
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+    'id_cards': {
+        'BACKEND': ID_CARD_STORAGE_BACKEND,
+        'OPTIONS': (
+            {'location': ID_CARD_STORAGE_ROOT}
+            if ID_CARD_STORAGE_BACKEND.endswith('FileSystemStorage') else {}
+        ),
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -149,6 +211,109 @@ CACHES = {
     }
 }
 
+# Shared cache across worker processes (uses the `redis` package).
+# Needed for rate limits to hold across workers instead of per process.
+if os.getenv('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+    }
+
+# Rate limiting (kcet_eduguide.ratelimit)
+RATELIMIT_ENABLE = os.getenv('RATELIMIT_ENABLE', 'True') == 'True'
+RATELIMIT_CACHE = 'default'
+
+# Authenticated student lookup cache (students.authentication)
+# Resolved students are cached for this many seconds; saves and deletes of a
+# student invalidate the entry. 0 disables the cache. Only used with a shared
+# cache (REDIS_URL): a per-process cache cannot be invalidated in other workers.
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv('AUTH_USER_CACHE_TIMEOUT', '60'))
+AUTH_USER_CACHE = 'default'
+
+# Review AI-detector model loading
+# The model is loaded lazily on first use unless PRELOAD is set. MMAP loads the
+# numpy arrays of the pickles memory-mapped so worker processes share pages.
+# BACKEND 'numpy' scores with the artifact from `manage.py export_review_model`.
+REVIEW_MODEL = {
+    'BACKEND': os.getenv('REVIEW_MODEL_BACKEND', 'sklearn'),
+    'PRELOAD': os.getenv('REVIEW_MODEL_PRELOAD', 'False') == 'True',
+    'MMAP': os.getenv('REVIEW_MODEL_MMAP', 'False') == 'True',
+}
+
+# Review AI-detector scoring pool (optional)
+# When enabled, review texts are scored in separate worker processes so
+# CPU-bound model inference does not block the web workers. A timeout
+# terminates and restarts the pool's processes, since a text that is already
+# being scored cannot be cancelled. The first call after a (re)start also pays
+# for worker startup and model loading (about 2 s), so keep TIMEOUT above that.
+REVIEW_SCORING_POOL = {
+    'ENABLED': os.getenv('REVIEW_SCORING_POOL_ENABLED', 'False') == 'True',
+    'WORKERS': int(os.getenv('REVIEW_SCORING_POOL_WORKERS', '2')),
+    'MAX_PENDING': int(os.getenv('REVIEW_SCORING_POOL_MAX_PENDING', '32')),
+    'TIMEOUT': float(os.getenv('REVIEW_SCORING_POOL_TIMEOUT', '5')),
+}
+
+# OCR preprocessing (students.verification_utils.preprocess_for_ocr)
+# Crop ID card photos to the card, deskew them and downscale to DPI before
+# running Tesseract. Off by default: it changes the OCR input and its effect
+# on match scores has not been measured on real ID cards yet. Run
+# `python manage.py benchmark_ocr --cards <dir>` on a labelled sample first.
+OCR_PREPROCESS = {
+    'ENABLED': os.getenv('OCR_PREPROCESS_ENABLED', 'False') == 'True',
+    'DPI': int(os.getenv('OCR_PREPROCESS_DPI', '300')),
+}
+
+# Multi-variant OCR verification (students.verification_utils.score_ocr_variants)
+# When enabled, the binarisations in VARIANTS are OCR'd in parallel on WORKERS
+# threads and verification stops at the first variant that passes.
+OCR_VARIANTS = {
+    'ENABLED': os.getenv('OCR_VARIANTS_ENABLED', 'False') == 'True',
+    'WORKERS': int(os.getenv('OCR_VARIANTS_WORKERS', '4')),
+    # Names from students.verification_utils.OCR_VARIANTS; checked when the
+    # variant pool starts
+    'VARIANTS': [
+        name.strip() for name in os.getenv(
+            'OCR_VARIANTS', 'threshold-150,adaptive,otsu,threshold-120,threshold-180,upscale-2x'
+        ).split(',') if name.strip()
+    ],
+}
+
+# Student ID verification jobs (students.verification_jobs)
+# BACKEND 'thread' runs OCR on a bounded in-process thread pool; 'immediate'
+# runs it inline on submit (tests). TIMEOUT is when an unfinished job is
+# reported as failed.
+OCR_JOBS = {
+    'BACKEND': os.getenv('OCR_JOBS_BACKEND', 'thread'),
+    'WORKERS': int(os.getenv('OCR_JOBS_WORKERS', '2')),
+    'MAX_PENDING': int(os.getenv('OCR_JOBS_MAX_PENDING', '16')),
+    'TIMEOUT': int(os.getenv('OCR_JOBS_TIMEOUT', '300')),
+}
+
+# Seconds a verification token from verify_student can be redeemed at
+# registration to skip running OCR a second time
+VERIFICATION_TOKEN_MAX_AGE = int(os.getenv('VERIFICATION_TOKEN_MAX_AGE', '1800'))
+
+# Route the public read endpoints (college list, search, cutoffs, branch
+# reviews) to their async versions; enable when serving kcet_eduguide.asgi.
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False') == 'True'
+
+# Meeting status events over server-sent events (meetings.events)
+# BACKEND 'redis' (default with REDIS_URL) delivers across worker processes;
+# 'memory' only within one process, so streaming is refused when WORKERS
+# (WEB_CONCURRENCY, read by gunicorn and uvicorn) is above 1; 'none' disables
+# publishing. Streams send a keepalive comment every KEEPALIVE seconds and end
+# after MAX_AGE seconds. Browsers open them with a ticket valid for
+# TICKET_MAX_AGE seconds.
+MEETING_EVENTS = {
+    'BACKEND': os.getenv('MEETING_EVENTS_BACKEND', 'redis' if os.getenv('REDIS_URL') else 'memory'),
+    'REDIS_URL': os.getenv('REDIS_URL'),
+    'WORKERS': int(os.getenv('WEB_CONCURRENCY', '1')),
+    'KEEPALIVE': int(os.getenv('MEETING_EVENTS_KEEPALIVE', '15')),
+    'MAX_AGE': int(os.getenv('MEETING_EVENTS_MAX_AGE', '300')),
+    'TICKET_MAX_AGE': int(os.getenv('MEETING_EVENTS_TICKET_MAX_AGE', '30')),
+    'QUEUE_SIZE': 100,
+}
+
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -159,6 +324,9 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # Reverse proxies in front of the app; client IPs (rate limits) are read
+    # from X-Forwarded-For as they append it. 0 = use REMOTE_ADDR.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
 }
 
 # JWT Settings
@@ -5,7 +5,9 @@ from django.contrib import admin
 from django.urls import path, include
 from django.http import HttpResponseRedirect, JsonResponse
 from colleges.urls import branch_urlpatterns
+from colleges import async_views as college_async_views
 from colleges.views import search
+from kcet_eduguide.async_api import read_view
 
 def api_root(request):
     return JsonResponse({
@@ -23,7 +25,7 @@ urlpatterns = [
     path('api/auth/', include('students.urls')),
     path('api/colleges/', include('colleges.urls')),
     path('api/branches/', include(branch_urlpatterns)),
-    path('api/search/', search, name='global-search'),
+    path('api/search/', read_view(search, college_async_views.search), name='global-search'),
     path('api/counselling/', include('counselling.urls')),
     path('api/reviews/', include('reviews.urls')),
     path('api/meetings/', include('meetings.urls')),
@@ -5,3 +5,7 @@ class MeetingsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'meetings'
 
+
+    def ready(self):
+        # Register meeting status event publishing
+        from . import signals  # noqa: F401
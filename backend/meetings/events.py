@@ -0,0 +1,252 @@
+"""
+Server-sent meeting status events.
+
+Every meeting status transition (a request being created, accepted, rejected,
+cancelled or completed) is published to both participants once its
+transaction commits. The meeting_events view streams a student's events as
+server-sent events (text/event-stream), so clients refresh their meeting lists
+when something changes instead of polling them.
+
+Broker backends (settings.MEETING_EVENTS['BACKEND']):
+- 'redis': Redis pub/sub (MEETING_EVENTS['REDIS_URL']); events reach streams
+  in every worker process. Required when more than one worker runs.
+- 'memory': subscriber queues in this process. Events only reach clients
+  connected to the process that saved the meeting, so it is refused when
+  MEETING_EVENTS['WORKERS'] (WEB_CONCURRENCY) is above 1.
+- 'none': publishing is a no-op and streams only send keepalives.
+
+Streaming needs the ASGI application (kcet_eduguide/asgi.py): WSGI servers
+buffer the response and hold a worker for the whole stream. Where streaming
+is unavailable the endpoints answer 503 and clients poll the meeting lists.
+
+EventSource cannot send an Authorization header, so browsers open the stream
+with a ticket: a signed student id valid for MEETING_EVENTS['TICKET_MAX_AGE']
+seconds that is only accepted by the stream (not an access token in the URL).
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+_broker = None
+_broker_lock = threading.Lock()
+
+MEETING_STATUS_EVENT = 'meeting.status'
+
+EVENTS_TICKET_SALT = 'meetings.events.ticket'
+
+
+class InMemoryBroker:
+    """
+    Fan events out to per-student asyncio queues.
+
+    Subscriptions belong to the event loop that created them; publish() may be
+    called from any thread (request threads, sync views under ASGI).
+
+    Args:
+        queue_size (int): Events buffered per subscriber before new ones are dropped
+    """
+
+    def __init__(self, queue_size=100):
+        self._queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, student_user_id):
+        """Register a queue for a student's events. Call from the consuming event loop."""
+        subscription = (asyncio.get_running_loop(), asyncio.Queue(self._queue_size))
+        with self._lock:
+            self._subscribers[student_user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, student_user_id, subscription):
+        with self._lock:
+            subscriptions = self._subscribers.get(student_user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscribers[student_user_id]
+
+    def publish(self, student_user_id, event):
+        with self._lock:
+            subscriptions = list(self._subscribers.get(student_user_id, ()))
+        for loop, queue in subscriptions:
+            try:
+                loop.call_soon_threadsafe(self._put, queue, event)
+            except RuntimeError:
+                # Loop already closed; its stream is gone
+                pass
+
+    @staticmethod
+    def _put(queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client reloads its meeting lists when it reconnects
+            logger.warning('Meeting event queue full, dropping %s', event.get('type'))
+
+
+class NullBroker(InMemoryBroker):
+    """Accepts subscriptions but never delivers events."""
+
+    def publish(self, student_user_id, event):
+        pass
+
+
+class RedisBroker:
+    """
+    Fan events out through Redis pub/sub, one channel per student.
+
+    publish() uses a shared synchronous client; each subscription listens on
+    its own asyncio connection for as long as its stream is open.
+
+    Args:
+        url (str): Redis URL
+        queue_size (int): Events buffered per subscriber before new ones are dropped
+    """
+
+    CHANNEL_PREFIX = 'meetings:events:'
+
+    def __init__(self, url, queue_size=100):
+        import redis
+
+        self._url = url
+        self._queue_size = queue_size
+        self._client = redis.Redis.from_url(url)
+
+    def _channel(self, student_user_id):
+        return f'{self.CHANNEL_PREFIX}{student_user_id}'
+
+    def subscribe(self, student_user_id):
+        """Start listening for a student's events. Call from the consuming event loop."""
+        queue = asyncio.Queue(self._queue_size)
+        listener = asyncio.get_running_loop().create_task(self._listen(student_user_id, queue))
+        return (listener, queue)
+
+    async def _listen(self, student_user_id, queue):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self._url)
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(self._channel(student_user_id))
+            async for message in pubsub.listen():
+                InMemoryBroker._put(queue, json.loads(message['data']))
+        except Exception:
+            # The stream carries on with keepalives; the client reloads on reconnect
+            logger.exception('Meeting event subscription for %s failed', student_user_id)
+        finally:
+            try:
+                await pubsub.unsubscribe()
+            except Exception:
+                # Connection already broken; closing it drops the subscription
+                pass
+            await pubsub.reset()
+            await client.close()
+
+    def unsubscribe(self, student_user_id, subscription):
+        listener, _ = subscription
+        listener.cancel()
+
+    def publish(self, student_user_id, event):
+        try:
+            self._client.publish(self._channel(student_user_id), json.dumps(event, cls=DjangoJSONEncoder))
+        except Exception:
+            # Publishing runs after the meeting was committed; never fail the request
+            logger.exception('Could not publish %s to %s', event.get('type'), student_user_id)
+
+
+def _events_config():
+    return getattr(settings, 'MEETING_EVENTS', {})
+
+
+def shared_broker_missing():
+    """True when several workers run with the per-process 'memory' broker."""
+    config = _events_config()
+    return config.get('BACKEND', 'memory') == 'memory' and config.get('WORKERS', 1) > 1
+
+
+def streaming_unavailable(request):
+    """
+    Why meeting events cannot be streamed for this request, or None.
+
+    Args:
+        request: The Django HttpRequest (not a DRF Request)
+    """
+    if not isinstance(request, ASGIRequest):
+        return 'Meeting events need the ASGI server; poll the meeting lists instead'
+    if shared_broker_missing():
+        return 'Meeting events need a shared broker (MEETING_EVENTS_BACKEND=redis) with several workers; ' \
+               'poll the meeting lists instead'
+    return None
+
+
+def get_broker():
+    global _broker
+
+    with _broker_lock:
+        if _broker is None:
+            config = _events_config()
+            backend = config.get('BACKEND', 'memory')
+            if backend == 'redis':
+                if not config.get('REDIS_URL'):
+                    raise ImproperlyConfigured("MEETING_EVENTS backend 'redis' needs REDIS_URL")
+                _broker = RedisBroker(config['REDIS_URL'], queue_size=config.get('QUEUE_SIZE', 100))
+            elif backend == 'memory':
+                _broker = InMemoryBroker(queue_size=config.get('QUEUE_SIZE', 100))
+            elif backend == 'none':
+                _broker = NullBroker()
+            else:
+                raise ValueError(f"Unknown MEETING_EVENTS backend: {backend}")
+        return _broker
+
+
+def issue_events_ticket(student_user_id):
+    """Signed ticket opening the event stream of a student."""
+    return signing.dumps(student_user_id, salt=EVENTS_TICKET_SALT)
+
+
+def read_events_ticket(ticket):
+    """
+    Student id of an events ticket.
+
+    Raises:
+        signing.BadSignature: Forged, malformed or expired (SignatureExpired) ticket
+    """
+    return signing.loads(ticket, salt=EVENTS_TICKET_SALT, max_age=_events_config().get('TICKET_MAX_AGE', 30))
+
+
+def meeting_status_event(meeting):
+    """Event payload for a meeting's current status."""
+    return {
+        'type': MEETING_STATUS_EVENT,
+        'meeting_id': meeting.meeting_id,
+        'status': meeting.status,
+        'counselling_user_id': meeting.counselling_user_id_id,
+        'studying_user_id': meeting.studying_user_id_id,
+        'scheduled_time': meeting.scheduled_time,
+        'duration_minutes': meeting.duration_minutes,
+        'meet_link': meeting.meet_link,
+        'updated_at': meeting.updated_at,
+    }
+
+
+def publish_event(event):
+    """Send an event to both participants of its meeting."""
+    broker = get_broker()
+    for student_user_id in {event['counselling_user_id'], event['studying_user_id']}:
+        broker.publish(student_user_id, event)
+
+
+def format_sse(event):
+    """Encode an event as a server-sent event message."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, cls=DjangoJSONEncoder)}\n\n"
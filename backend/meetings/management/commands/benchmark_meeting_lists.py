@@ -0,0 +1,129 @@
+"""
+Check query counts and payload size of the meeting list endpoints.
+
+Creates a counselling student with N meeting requests to studying students
+spread over several branches inside a transaction that is rolled back at the
+end, then measures my_requests, my_invitations and meetings_upcoming:
+  - legacy: every meeting with StudentMeetingSerializer (full nested students)
+            and the old select_related of the two students only
+  - lean:   the endpoint itself (first page, MeetingListSerializer)
+
+The endpoints must not issue more than --max-queries queries however many
+meetings there are (page count + page); the command fails otherwise, so it can
+guard against N+1 regressions.
+
+Usage:
+    python manage.py benchmark_meeting_lists --meetings 200
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from colleges.models import Branch
+from kcet_eduguide.benchmark import request_host
+from meetings.models import StudentMeeting
+from meetings.serializers import StudentMeetingSerializer
+from meetings.views import meetings_upcoming, my_invitations, my_requests
+from students.models import Student
+
+
+class Command(BaseCommand):
+    help = 'Check meeting list query counts and payload size (rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--meetings', type=int, default=200, help='Number of meetings to create')
+        parser.add_argument('--branches', type=int, default=10, help='Branches the studying students come from')
+        parser.add_argument('--max-queries', type=int, default=2, help='Allowed queries per lean request')
+
+    def handle(self, *args, **options):
+        branches = list(Branch.objects.select_related('college').order_by('unique_key')[:options['branches']])
+        if not branches:
+            raise CommandError('No branches found to benchmark against')
+
+        with transaction.atomic():
+            counselling, studying = self._populate(branches, options['meetings'])
+            failures = self._run(counselling, studying, options['max_queries'])
+            transaction.set_rollback(True)
+
+        self.stdout.write('Benchmark data rolled back')
+        if failures:
+            raise CommandError(f'Too many queries: {", ".join(failures)}')
+
+    def _student(self, i, type_of_student, branch=None):
+        student = Student(
+            type_of_student=type_of_student,
+            college_code=branch.college.college_code if branch else None,
+            unique_key=branch,
+            name=f'Benchmark Student {type_of_student} {i}',
+            email_id=f'benchmark-{type_of_student}-{i}@example.invalid',
+            phone_number='0000000000',
+            year_of_starting=2023 if branch else None,
+        )
+        student.save()
+        return student
+
+    def _populate(self, branches, count):
+        counselling = self._student(0, 'counselling')
+        studying = [self._student(i, 'studying', branch) for i, branch in enumerate(branches)]
+        StudentMeeting.objects.bulk_create([
+            StudentMeeting(
+                counselling_user_id=counselling,
+                studying_user_id=studying[i % len(studying)],
+                status='requested',
+            )
+            for i in range(count)
+        ])
+        return counselling, studying[0]
+
+    def _measure(self, label, func):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            payload = func()
+            elapsed = time.perf_counter() - start
+        count = len(queries.captured_queries)
+        self.stdout.write(
+            f'{label:<26} {len(payload) / 1024:9.1f} KB {elapsed * 1000:9.1f} ms {count:5d} queries'
+        )
+        return count
+
+    def _run(self, counselling, studying, max_queries):
+        renderer = JSONRenderer()
+        factory = APIRequestFactory()
+        host = request_host()
+
+        def legacy(meetings):
+            meetings = meetings.select_related('counselling_user_id', 'studying_user_id')
+            return renderer.render(StudentMeetingSerializer(meetings, many=True).data)
+
+        def lean(view, path, user):
+            request = factory.get(path, HTTP_HOST=host)
+            force_authenticate(request, user=user)
+            response = view(request)
+            response.render()
+            return response.content
+
+        cases = [
+            ('my_requests', my_requests, '/api/meetings/my-requests/', counselling,
+             StudentMeeting.objects.filter(counselling_user_id=counselling)),
+            ('my_invitations', my_invitations, '/api/meetings/my-invitations/', studying,
+             StudentMeeting.objects.filter(studying_user_id=studying)),
+            ('meetings_upcoming', meetings_upcoming, '/api/meetings/upcoming/', counselling,
+             StudentMeeting.objects.filter(
+                 Q(counselling_user_id=counselling) | Q(studying_user_id=counselling),
+                 status__in=['requested', 'accepted'],
+             )),
+        ]
+
+        failures = []
+        for name, view, path, user, meetings in cases:
+            self.stdout.write(f'{name}: {meetings.count()} meetings')
+            self._measure('  legacy (all rows)', lambda: legacy(meetings))
+            queries = self._measure('  lean (first page)', lambda: lean(view, path, user))
+            if queries > max_queries:
+                failures.append(f'{name} ({queries} > {max_queries})')
+        return failures
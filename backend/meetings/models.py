@@ -34,6 +34,17 @@ class StudentMeeting(models.Model):
     class Meta:
         db_table = 'student_meetings'
         managed = True
+        indexes = [
+            # Accepted meetings of a participant by time (meetings.scheduling)
+            models.Index(
+                fields=['studying_user_id', 'status', 'scheduled_time'],
+                name='meeting_studying_time_idx'
+            ),
+            models.Index(
+                fields=['counselling_user_id', 'status', 'scheduled_time'],
+                name='meeting_counselling_time_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"Meeting {self.meeting_id}: {self.counselling_user_id} -> {self.studying_user_id} ({self.status})"
@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class BranchStudentCursorPagination(CursorPagination):
+    """Students in primary key order, which the branch index already returns them in."""
+    ordering = 'student_user_id'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class MeetingPagination(PageNumberPagination):
+    """Pages of a student's meeting list."""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
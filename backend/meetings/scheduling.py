@@ -0,0 +1,130 @@
+"""
+Meeting scheduling: conflict checks and free slots.
+
+A participant is busy during each of their accepted meetings, from
+scheduled_time for duration_minutes. Accepted meetings are looked up through
+the (participant, status, scheduled_time) indexes on StudentMeeting: since no
+meeting is longer than MAX_DURATION_MINUTES, every meeting overlapping
+[start, end) starts in [start - MAX_DURATION_MINUTES, end), so one index range
+scan per participant finds all candidates.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+
+from students.models import Student
+
+from .models import StudentMeeting
+
+MIN_DURATION_MINUTES = 5
+MAX_DURATION_MINUTES = 120
+# Longest range free_slots() will compute
+MAX_WINDOW_DAYS = 31
+
+
+class MeetingConflict(Exception):
+    """The requested time overlaps another accepted meeting of a participant."""
+
+    def __init__(self, meeting):
+        self.meeting = meeting
+        super().__init__(f"Overlaps meeting {meeting.meeting_id}")
+
+
+class MeetingNotRequested(Exception):
+    """The meeting was answered or cancelled before it could be accepted."""
+
+    def __init__(self, meeting):
+        self.meeting = meeting
+        super().__init__(f"Meeting {meeting.meeting_id} is {meeting.status}")
+
+
+def meeting_end(meeting):
+    return meeting.scheduled_time + timedelta(minutes=meeting.duration_minutes)
+
+
+def accepted_meetings(students, start, end):
+    """
+    Accepted meetings of any of `students` overlapping [start, end), by start time.
+
+    Args:
+        students (list): Student instances or student_user_ids
+        start (datetime): Range start (aware)
+        end (datetime): Range end (aware)
+    """
+    candidates = StudentMeeting.objects.filter(
+        Q(studying_user_id__in=students) | Q(counselling_user_id__in=students),
+        status='accepted',
+        scheduled_time__gte=start - timedelta(minutes=MAX_DURATION_MINUTES),
+        scheduled_time__lt=end,
+    ).only('meeting_id', 'scheduled_time', 'duration_minutes').order_by('scheduled_time')
+    return [meeting for meeting in candidates if meeting_end(meeting) > start]
+
+
+def busy_intervals(student, start, end):
+    """Merged, sorted (start, end) intervals in which a student has accepted meetings."""
+    merged = []
+    for meeting in accepted_meetings([student], start, end):
+        interval_start, interval_end = meeting.scheduled_time, meeting_end(meeting)
+        if merged and interval_start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], interval_end))
+        else:
+            merged.append((interval_start, interval_end))
+    return merged
+
+
+def free_slots(student, start, end, duration_minutes=30):
+    """
+    Free periods of at least duration_minutes in [start, end).
+
+    Sweeps the student's merged busy intervals in start order and returns the
+    gaps between them as (start, end) tuples.
+    """
+    duration = timedelta(minutes=duration_minutes)
+    slots = []
+    cursor = start
+    for busy_start, busy_end in busy_intervals(student, start, end):
+        if busy_start - cursor >= duration:
+            slots.append((cursor, busy_start))
+        cursor = max(cursor, busy_end)
+    if end - cursor >= duration:
+        slots.append((cursor, end))
+    return slots
+
+
+def schedule_meeting(meeting, scheduled_time, duration_minutes, meet_link):
+    """
+    Accept a meeting at scheduled_time unless a participant is busy then.
+
+    The meeting row is locked and its status checked first, so a meeting
+    cancelled or accepted concurrently is not accepted (again). Both
+    participants' rows are then locked (in primary key order) for the
+    conflict check and save, so concurrent accepts involving the same student
+    are serialised.
+
+    Raises:
+        MeetingNotRequested: If the meeting's status is no longer 'requested'
+        MeetingConflict: If the time overlaps another accepted meeting
+    """
+    end = scheduled_time + timedelta(minutes=duration_minutes)
+    participants = sorted({meeting.studying_user_id_id, meeting.counselling_user_id_id})
+
+    with transaction.atomic():
+        locked = StudentMeeting.objects.select_for_update().only('meeting_id', 'status').get(pk=meeting.pk)
+        if locked.status != 'requested':
+            raise MeetingNotRequested(locked)
+
+        list(Student.objects.select_for_update().filter(pk__in=participants).order_by('pk'))
+        conflicts = [
+            other for other in accepted_meetings(participants, scheduled_time, end)
+            if other.meeting_id != meeting.meeting_id
+        ]
+        if conflicts:
+            raise MeetingConflict(conflicts[0])
+
+        meeting.scheduled_time = scheduled_time
+        meeting.duration_minutes = duration_minutes
+        meeting.meet_link = meet_link
+        meeting.status = 'accepted'
+        meeting.save()
+    return meeting
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import StudentMeeting
+from students.models import Student
 from students.serializers import StudentSerializer
 
 
@@ -18,6 +19,36 @@ class StudentMeetingSerializer(serializers.ModelSerializer):
         read_only_fields = ['meeting_id', 'created_at', 'updated_at']
 
 
+class MeetingParticipantSerializer(serializers.ModelSerializer):
+    """Participant as shown in meeting lists: branch and college names instead of nested objects."""
+    branch_name = serializers.CharField(source='unique_key.branch_name', read_only=True, default=None)
+    college_name = serializers.CharField(source='unique_key.college.college_name', read_only=True, default=None)
+    
+    class Meta:
+        model = Student
+        fields = [
+            'student_user_id', 'type_of_student', 'name', 'email_id', 'year_of_starting',
+            'unique_key', 'branch_name', 'college_name',
+        ]
+
+
+class MeetingListSerializer(StudentMeetingSerializer):
+    """
+    Lean meeting representation for meeting lists.
+    
+    Select MEETING_LIST_RELATED so participants, branches and colleges come
+    from the same query.
+    """
+    counselling_user_id_data = MeetingParticipantSerializer(source='counselling_user_id', read_only=True)
+    studying_user_id_data = MeetingParticipantSerializer(source='studying_user_id', read_only=True)
+
+
+MEETING_LIST_RELATED = (
+    'counselling_user_id__unique_key__college',
+    'studying_user_id__unique_key__college',
+)
+
+
 class MeetingRequestSerializer(serializers.Serializer):
     studying_user_id = serializers.CharField(required=True)
     counselling_user_id = serializers.CharField(required=False)
@@ -0,0 +1,28 @@
+"""
+Publish meeting status transitions (see meetings.events).
+
+The status a meeting was loaded with is remembered on the instance; a save
+that creates the meeting or changes its status publishes an event after the
+transaction commits, so clients never see a transition that was rolled back.
+"""
+from django.db import transaction
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from .events import meeting_status_event, publish_event
+from .models import StudentMeeting
+
+
+@receiver(post_init, sender=StudentMeeting, dispatch_uid='meetings_remember_status')
+def remember_status(sender, instance, **kwargs):
+    instance._published_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=StudentMeeting, dispatch_uid='meetings_publish_status')
+def publish_status_change(sender, instance, created, **kwargs):
+    if not created and instance.status == instance._published_status:
+        return
+    instance._published_status = instance.status
+    # Snapshot now; the instance may change again before the commit
+    event = meeting_status_event(instance)
+    transaction.on_commit(lambda: publish_event(event))
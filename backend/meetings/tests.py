@@ -0,0 +1,119 @@
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from colleges.models import Branch, Cluster, College
+from students.models import Student
+
+from .models import StudentMeeting
+from .scheduling import MeetingNotRequested, schedule_meeting
+from .views import meeting_accept, meetings_upcoming, my_invitations
+
+
+class MeetingListQueryTests(TestCase):
+    """Meeting lists cost a count and a page query however many meetings and branches there are."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cluster = Cluster.objects.create(cluster_code='A', cluster_name='Computer Science')
+        cls.counselling = Student.objects.create(
+            type_of_student='counselling', email_id='counselling@example.com', phone_number='9000000000',
+        )
+        studying = []
+        for i in range(5):
+            college = College.objects.create(
+                college_id=f'E{i:02d}', college_code=f'E{i:03d}', college_name=f'College {i}', location='Bengaluru'
+            )
+            branch = Branch.objects.create(
+                unique_key=f'E{i:02d}CS', college=college, cluster=cluster, branch_id='CS',
+                branch_name='Computer Science',
+            )
+            studying.append(Student.objects.create(
+                type_of_student='studying', college_code=college.college_code, unique_key=branch,
+                email_id=f'studying{i}@example.com', phone_number='9000000000', year_of_starting=2022,
+            ))
+        cls.studying = studying[0]
+        StudentMeeting.objects.bulk_create([
+            StudentMeeting(
+                counselling_user_id=cls.counselling,
+                studying_user_id=studying[i % len(studying)],
+                status='accepted' if i % 3 else 'requested',
+            )
+            for i in range(30)
+        ])
+
+    def get(self, view, path, user, params=None):
+        request = APIRequestFactory().get(path, params)
+        force_authenticate(request, user=user)
+        response = view(request)
+        response.render()
+        return response
+
+    def test_my_invitations_queries(self):
+        with self.assertNumQueries(2):
+            response = self.get(my_invitations, '/api/meetings/my-invitations/', self.studying)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 6)
+
+    def test_meetings_upcoming_queries(self):
+        with self.assertNumQueries(2):
+            response = self.get(meetings_upcoming, '/api/meetings/upcoming/', self.counselling)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 30)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIsNotNone(response.data['results'][0]['studying_user_id_data']['college_name'])
+
+    def test_status_filter(self):
+        response = self.get(my_invitations, '/api/meetings/my-invitations/', self.studying, {'status': 'requested'})
+        self.assertEqual(response.data['count'], 2)
+        self.assertTrue(all(meeting['status'] == 'requested' for meeting in response.data['results']))
+
+        response = self.get(my_invitations, '/api/meetings/my-invitations/', self.studying, {'status': 'pending'})
+        self.assertEqual(response.status_code, 400)
+
+
+class MeetingAcceptTests(TestCase):
+    """Accepting checks the meeting's status on the locked row, not on the caller's copy."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.counselling = Student.objects.create(
+            type_of_student='counselling', email_id='counselling@example.com', phone_number='9000000000',
+        )
+        cluster = Cluster.objects.create(cluster_code='A', cluster_name='Computer Science')
+        college = College.objects.create(
+            college_id='E01', college_code='E001', college_name='Test College', location='Bengaluru'
+        )
+        branch = Branch.objects.create(
+            unique_key='E01CS', college=college, cluster=cluster, branch_id='CS', branch_name='Computer Science',
+        )
+        cls.studying = Student.objects.create(
+            type_of_student='studying', college_code='E001', unique_key=branch,
+            email_id='studying@example.com', phone_number='9000000000', year_of_starting=2022,
+        )
+
+    def setUp(self):
+        self.meeting = StudentMeeting.objects.create(
+            counselling_user_id=self.counselling, studying_user_id=self.studying, status='requested',
+        )
+
+    def test_stale_requested_copy_is_not_accepted(self):
+        # Cancelled after the accepting request loaded it
+        StudentMeeting.objects.filter(pk=self.meeting.pk).update(status='cancelled')
+
+        with self.assertRaises(MeetingNotRequested):
+            schedule_meeting(self.meeting, timezone.now(), 30, 'https://meet.jit.si/test')
+        self.meeting.refresh_from_db()
+        self.assertEqual(self.meeting.status, 'cancelled')
+        self.assertIsNone(self.meeting.scheduled_time)
+
+    def test_accept_twice(self):
+        request = APIRequestFactory().post(f'/api/meetings/{self.meeting.pk}/accept/', {}, format='json')
+        force_authenticate(request, user=self.studying)
+        self.assertEqual(meeting_accept(request, id=self.meeting.pk).status_code, 200)
+
+        request = APIRequestFactory().post(f'/api/meetings/{self.meeting.pk}/accept/', {}, format='json')
+        force_authenticate(request, user=self.studying)
+        response = meeting_accept(request, id=self.meeting.pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': 'Only requested meetings can be accepted'})
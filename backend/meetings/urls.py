@@ -2,7 +2,8 @@ from django.urls import path
 from .views import (
     meeting_request, meeting_accept, meeting_reject,
     meeting_cancel, meeting_complete, meetings_upcoming,
-    my_requests, my_invitations, meeting_status_update, branch_students
+    my_requests, my_invitations, meeting_status_update, branch_students,
+    student_free_slots, meeting_events, meeting_events_ticket
 )
 
 urlpatterns = [
@@ -15,5 +16,8 @@ urlpatterns = [
     path('<int:id>/complete/', meeting_complete, name='meeting-complete'),
     path('<int:id>/status/', meeting_status_update, name='meeting-status-update'),
     path('upcoming/', meetings_upcoming, name='meetings-upcoming'),
+    path('events/', meeting_events, name='meeting-events'),
+    path('events/ticket/', meeting_events_ticket, name='meeting-events-ticket'),
     path('branches/<uuid:public_id>/students/', branch_students, name='branch-students'),
+    path('students/<str:student_user_id>/free-slots/', student_free_slots, name='student-free-slots'),
 ]
@@ -2,12 +2,37 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
 from datetime import timedelta, datetime
+import asyncio
 from .models import StudentMeeting
-from .serializers import StudentMeetingSerializer, MeetingRequestSerializer
+from .pagination import BranchStudentCursorPagination, MeetingPagination
+from .serializers import (
+    StudentMeetingSerializer,
+    MeetingListSerializer,
+    MeetingRequestSerializer,
+    MEETING_LIST_RELATED,
+)
 from .services import generate_jitsi_meeting_link
+from .events import (
+    format_sse, get_broker, issue_events_ticket, read_events_ticket, streaming_unavailable
+)
+from .scheduling import (
+    MeetingConflict,
+    MeetingNotRequested,
+    schedule_meeting,
+    free_slots,
+    MIN_DURATION_MINUTES,
+    MAX_DURATION_MINUTES,
+    MAX_WINDOW_DAYS,
+)
 from students.models import Student
 
 
@@ -52,6 +77,68 @@ def meeting_request(request):
     )
 
 
+def _parse_time(value):
+    """Aware datetime from an ISO 8601 string (or datetime), None if invalid."""
+    try:
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value)
+    except (TypeError, ValueError, AttributeError):
+        return None
+    return value
+
+
+def _accept_meeting(request, meeting):
+    """
+    Schedule a requested meeting from the request data, rejecting overlaps (409).
+    
+    The status is checked by schedule_meeting() on the locked row, so two
+    concurrent accepts (or an accept racing a cancel) cannot both succeed.
+    """
+    scheduled_time = None
+    if request.data.get('scheduled_time'):
+        scheduled_time = _parse_time(request.data.get('scheduled_time'))
+    if scheduled_time is None:
+        scheduled_time = timezone.now() + timedelta(days=1)
+    
+    try:
+        duration_minutes = int(request.data.get('duration_minutes', 30))
+    except (TypeError, ValueError):
+        duration_minutes = None
+    if duration_minutes is None or not MIN_DURATION_MINUTES <= duration_minutes <= MAX_DURATION_MINUTES:
+        return Response(
+            {'error': f'duration_minutes must be between {MIN_DURATION_MINUTES} and {MAX_DURATION_MINUTES}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    meet_link = generate_jitsi_meeting_link(
+        meeting.studying_user_id.student_user_id,
+        meeting.counselling_user_id.student_user_id
+    )
+    
+    try:
+        schedule_meeting(meeting, scheduled_time, duration_minutes, meet_link)
+    except MeetingNotRequested:
+        return Response(
+            {'error': 'Only requested meetings can be accepted'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except MeetingConflict as e:
+        return Response(
+            {
+                'error': 'Meeting time conflicts with another accepted meeting',
+                'conflicting_meeting': {
+                    'scheduled_time': e.meeting.scheduled_time,
+                    'duration_minutes': e.meeting.duration_minutes,
+                },
+            },
+            status=status.HTTP_409_CONFLICT
+        )
+    
+    return Response(StudentMeetingSerializer(meeting).data)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def meeting_accept(request, id):
@@ -71,46 +158,17 @@ def meeting_accept(request, id):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    if meeting.status != 'requested':
-        return Response(
-            {'error': 'Only requested meetings can be accepted'},
-            status=status.HTTP_400_BAD_REQUEST
-        )
-    
-    scheduled_time = request.data.get('scheduled_time')
-    if scheduled_time:
-        try:
-            if isinstance(scheduled_time, str):
-                scheduled_time = scheduled_time.replace('Z', '+00:00')
-                scheduled_time = datetime.fromisoformat(scheduled_time)
-            if timezone.is_naive(scheduled_time):
-                scheduled_time = timezone.make_aware(scheduled_time)
-        except Exception:
-            scheduled_time = timezone.now() + timedelta(days=1)
-    else:
-        scheduled_time = timezone.now() + timedelta(days=1)
-    
-    meet_link = generate_jitsi_meeting_link(
-        meeting.studying_user_id.student_user_id,
-        meeting.counselling_user_id.student_user_id
-    )
-    
-    meeting.scheduled_time = scheduled_time
-    meeting.duration_minutes = request.data.get('duration_minutes', 30)
-    meeting.meet_link = meet_link
-    meeting.status = 'accepted'
-    meeting.save()
-    
-    return Response(StudentMeetingSerializer(meeting).data)
+    return _accept_meeting(request, meeting)
 
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@transaction.atomic
 def meeting_reject(request, id):
     student = request.user
     
     try:
-        meeting = StudentMeeting.objects.get(meeting_id=id)
+        meeting = StudentMeeting.objects.select_for_update().get(meeting_id=id)
     except StudentMeeting.DoesNotExist:
         return Response(
             {'error': 'Meeting not found'},
@@ -131,11 +189,13 @@ def meeting_reject(request, id):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@transaction.atomic
 def meeting_cancel(request, id):
     student = request.user
     
     try:
-        meeting = StudentMeeting.objects.get(meeting_id=id)
+        # Locked so the status check and save cannot race another transition
+        meeting = StudentMeeting.objects.select_for_update().get(meeting_id=id)
     except StudentMeeting.DoesNotExist:
         return Response(
             {'error': 'Meeting not found'},
@@ -162,11 +222,12 @@ def meeting_cancel(request, id):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@transaction.atomic
 def meeting_complete(request, id):
     student = request.user
     
     try:
-        meeting = StudentMeeting.objects.get(meeting_id=id)
+        meeting = StudentMeeting.objects.select_for_update().get(meeting_id=id)
     except StudentMeeting.DoesNotExist:
         return Response(
             {'error': 'Meeting not found'},
@@ -185,6 +246,27 @@ def meeting_complete(request, id):
     return Response(StudentMeetingSerializer(meeting).data)
 
 
+def _meeting_list_response(request, meetings):
+    """
+    One page of meetings with lean participants (count + page query).
+    
+    ?status=<status> narrows the list to meetings in that status.
+    """
+    status_filter = request.GET.get('status')
+    if status_filter:
+        if status_filter not in dict(StudentMeeting.STATUS_CHOICES):
+            return Response(
+                {'error': f'Unknown meeting status: {status_filter}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        meetings = meetings.filter(status=status_filter)
+    
+    paginator = MeetingPagination()
+    page = paginator.paginate_queryset(meetings, request)
+    serializer = MeetingListSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def meetings_upcoming(request):
@@ -194,10 +276,9 @@ def meetings_upcoming(request):
         status__in=['requested', 'accepted']
     ).filter(
         Q(counselling_user_id=student) | Q(studying_user_id=student)
-    ).select_related('counselling_user_id', 'studying_user_id').order_by('scheduled_time', 'created_at')
+    ).select_related(*MEETING_LIST_RELATED).order_by('scheduled_time', 'created_at', 'meeting_id')
     
-    serializer = StudentMeetingSerializer(meetings, many=True)
-    return Response(serializer.data)
+    return _meeting_list_response(request, meetings)
 
 
 @api_view(['GET'])
@@ -213,10 +294,9 @@ def my_requests(request):
     
     meetings = StudentMeeting.objects.filter(
         counselling_user_id=student
-    ).select_related('studying_user_id', 'counselling_user_id').order_by('-created_at')
+    ).select_related(*MEETING_LIST_RELATED).order_by('-created_at', '-meeting_id')
     
-    serializer = StudentMeetingSerializer(meetings, many=True)
-    return Response(serializer.data)
+    return _meeting_list_response(request, meetings)
 
 
 @api_view(['GET'])
@@ -232,21 +312,19 @@ def my_invitations(request):
     
     meetings = StudentMeeting.objects.filter(
         studying_user_id=student
-    ).select_related('counselling_user_id', 'studying_user_id').order_by('-created_at')
+    ).select_related(*MEETING_LIST_RELATED).order_by('-created_at', '-meeting_id')
     
-    serializer = StudentMeetingSerializer(meetings, many=True)
-    return Response(serializer.data)
+    return _meeting_list_response(request, meetings)
 
 
 @api_view(['PATCH'])
 @permission_classes([IsAuthenticated])
+@transaction.atomic
 def meeting_status_update(request, id):
     student = request.user
     
     try:
-        meeting = StudentMeeting.objects.select_related(
-            'counselling_user_id', 'studying_user_id'
-        ).get(meeting_id=id)
+        meeting = StudentMeeting.objects.select_for_update().get(meeting_id=id)
     except StudentMeeting.DoesNotExist:
         return Response(
             {'error': 'Meeting not found'},
@@ -267,37 +345,7 @@ def meeting_status_update(request, id):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        if meeting.status != 'requested':
-            return Response(
-                {'error': 'Only requested meetings can be accepted'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        scheduled_time = request.data.get('scheduled_time')
-        if scheduled_time:
-            try:
-                if isinstance(scheduled_time, str):
-                    scheduled_time = scheduled_time.replace('Z', '+00:00')
-                    scheduled_time = datetime.fromisoformat(scheduled_time)
-                if timezone.is_naive(scheduled_time):
-                    scheduled_time = timezone.make_aware(scheduled_time)
-            except Exception:
-                scheduled_time = timezone.now() + timedelta(days=1)
-        else:
-            scheduled_time = timezone.now() + timedelta(days=1)
-        
-        meet_link = generate_jitsi_meeting_link(
-            meeting.studying_user_id.student_user_id,
-            meeting.counselling_user_id.student_user_id
-        )
-        
-        meeting.scheduled_time = scheduled_time
-        meeting.duration_minutes = request.data.get('duration_minutes', 30)
-        meeting.meet_link = meet_link
-        meeting.status = 'accepted'
-        meeting.save()
-        
-        return Response(StudentMeetingSerializer(meeting).data)
+        return _accept_meeting(request, meeting)
     
     elif new_status == 'rejected':
         if student != meeting.studying_user_id:
@@ -339,7 +387,9 @@ def branch_students(request, public_id):
     from colleges.models import Branch
     
     try:
-        branch = Branch.objects.get(public_id=public_id)
+        branch = Branch.objects.select_related('college').only(
+            'public_id', 'branch_name', 'college__college_name'
+        ).get(public_id=public_id)
     except Branch.DoesNotExist:
         return Response(
             {'error': 'Branch not found'},
@@ -348,16 +398,25 @@ def branch_students(request, public_id):
     
     from reviews.models import CollegeReview
     
+    # EXISTS on college_reviews(unique_key, student_user_id) instead of a join
+    # plus DISTINCT; students come off the student(unique_key, ...) index
+    has_review = CollegeReview.objects.filter(
+        unique_key=branch,
+        student_user_id=OuterRef('pk')
+    )
     students_with_reviews = Student.objects.filter(
         type_of_student='studying',
         unique_key=branch,
         is_active=True
     ).filter(
-        college_reviews__unique_key=branch
-    ).distinct()
+        Exists(has_review)
+    ).only('student_user_id', 'year_of_starting')
+    
+    paginator = BranchStudentCursorPagination()
+    page = paginator.paginate_queryset(students_with_reviews, request)
     
     students_data = []
-    for student in students_with_reviews:
+    for student in page:
         students_data.append({
             'student_user_id': student.student_user_id,
             'year_of_starting': student.year_of_starting,
@@ -371,5 +430,166 @@ def branch_students(request, public_id):
             'college_name': branch.college.college_name,
         },
         'students': students_data,
-        'count': len(students_data),
+        # Students on this page; cursor pagination never counts the whole branch
+        'page_count': len(students_data),
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
     })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def student_free_slots(request, student_user_id):
+    """
+    Free periods of a studying student, for picking a meeting time.
+    
+    Query params: start and end (ISO 8601, default now and 7 days later,
+    at most MAX_WINDOW_DAYS apart) and duration (minutes, default 30).
+    """
+    try:
+        studying_student = Student.objects.only('student_user_id').get(
+            student_user_id=student_user_id,
+            type_of_student='studying',
+            is_active=True
+        )
+    except Student.DoesNotExist:
+        return Response(
+            {'error': 'Studying student not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    start = _parse_time(request.query_params['start']) if 'start' in request.query_params else timezone.now()
+    end = _parse_time(request.query_params['end']) if 'end' in request.query_params else None
+    if start is None or ('end' in request.query_params and end is None):
+        return Response(
+            {'error': 'start and end must be ISO 8601 datetimes'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if end is None:
+        end = start + timedelta(days=7)
+    if not start < end <= start + timedelta(days=MAX_WINDOW_DAYS):
+        return Response(
+            {'error': f'end must be after start and at most {MAX_WINDOW_DAYS} days later'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        duration_minutes = int(request.query_params.get('duration', 30))
+    except ValueError:
+        duration_minutes = None
+    if duration_minutes is None or not MIN_DURATION_MINUTES <= duration_minutes <= MAX_DURATION_MINUTES:
+        return Response(
+            {'error': f'duration must be between {MIN_DURATION_MINUTES} and {MAX_DURATION_MINUTES} minutes'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    slots = free_slots(studying_student, start, end, duration_minutes)
+    return Response({
+        'student_user_id': studying_student.student_user_id,
+        'start': start,
+        'end': end,
+        'duration_minutes': duration_minutes,
+        'free_slots': [{'start': slot_start, 'end': slot_end} for slot_start, slot_end in slots],
+    })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def meeting_events_ticket(request):
+    """
+    Short-lived ticket for opening the meeting event stream from a browser.
+    
+    EventSource cannot send an Authorization header; the ticket goes in the
+    stream URL instead of the access token. 503 when the server cannot stream
+    (clients poll the meeting lists).
+    """
+    reason = streaming_unavailable(request._request)
+    if reason:
+        return Response({'error': reason}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    
+    return Response({
+        'ticket': issue_events_ticket(request.user.student_user_id),
+        'expires_in': settings.MEETING_EVENTS['TICKET_MAX_AGE'],
+    })
+
+
+def _stream_user(request):
+    """
+    Student authenticated by a JWT access token in the Authorization header or,
+    since EventSource cannot send headers, a `ticket` query parameter from
+    meeting_events_ticket.
+    """
+    from students.authentication import StudentJWTAuthentication, get_active_student
+    
+    authentication = StudentJWTAuthentication()
+    header = authentication.get_header(request)
+    if header:
+        raw_token = authentication.get_raw_token(header)
+        if not raw_token:
+            return None
+        try:
+            return authentication.get_user(authentication.get_validated_token(raw_token))
+        except (InvalidToken, TokenError):
+            return None
+    
+    ticket = request.GET.get('ticket')
+    if not ticket:
+        return None
+    try:
+        return get_active_student(read_events_ticket(ticket))
+    except (signing.BadSignature, Student.DoesNotExist):
+        return None
+
+
+async def meeting_events(request):
+    """
+    Server-sent events with the authenticated student's meeting status changes.
+    
+    Plain async Django view (DRF views are synchronous): each event is a
+    `meeting.status` message carrying the meeting's new status. Served only
+    through the ASGI application; 503 otherwise (clients poll instead).
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    reason = streaming_unavailable(request)
+    if reason:
+        return JsonResponse({'error': reason}, status=503)
+    
+    student = await sync_to_async(_stream_user)(request)
+    if student is None:
+        return JsonResponse(
+            {'error': 'Authentication credentials were not provided or are invalid'},
+            status=401
+        )
+    
+    config = getattr(settings, 'MEETING_EVENTS', {})
+    keepalive = config.get('KEEPALIVE', 15)
+    max_age = config.get('MAX_AGE', 300)
+    
+    async def stream():
+        broker = get_broker()
+        subscription = broker.subscribe(student.student_user_id)
+        _, queue = subscription
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_age
+        try:
+            # Reconnect after 5s if the stream drops or ends
+            yield 'retry: 5000\n\n'
+            while loop.time() < deadline:
+                try:
+                    event = await asyncio.wait_for(
+                        queue.get(), timeout=min(keepalive, deadline - loop.time())
+                    )
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                yield format_sse(event)
+        finally:
+            broker.unsubscribe(student.student_user_id, subscription)
+    
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CollegeReview
+from .models import CollegeReview, BranchRatingSummary
 
 
 @admin.register(CollegeReview)
@@ -9,3 +9,9 @@ class CollegeReviewAdmin(admin.ModelAdmin):
     list_filter = ('review_date',)
     readonly_fields = ('review_id', 'created_at', 'updated_at')
 
+
+@admin.register(BranchRatingSummary)
+class BranchRatingSummaryAdmin(admin.ModelAdmin):
+    list_display = ('branch', 'review_count', 'updated_at')
+    search_fields = ('branch__unique_key', 'branch__branch_name')
+    readonly_fields = ('updated_at',)
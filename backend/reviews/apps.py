@@ -9,7 +9,20 @@ class ReviewsConfig(AppConfig):
     name = 'reviews'
     
     def ready(self):
-        """Load ML model when Django app is ready."""
+        """
+        Connect the review signal handlers and optionally preload the ML model.
+        
+        By default the model is loaded lazily on first use, so processes that
+        never score reviews (manage.py commands, idle workers) skip it.
+        Set REVIEW_MODEL_PRELOAD=True to load at startup, e.g. with
+        gunicorn --preload so forked workers share the loaded model.
+        """
+        from . import signals  # noqa: F401
+
+        from django.conf import settings
+        if not getattr(settings, 'REVIEW_MODEL', {}).get('PRELOAD', False):
+            return
+        
         try:
             from .review_checker import load_model
             success = load_model()
@@ -0,0 +1,48 @@
+"""
+Async version of the public branch review listing (see kcet_eduguide.async_api).
+
+The response matches reviews.views.branch_reviews.
+"""
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from .models import CollegeReview
+from .pagination import BranchReviewCursorPagination
+from .serializers import BranchReviewSerializer
+from .views import _get_rating_summary
+from colleges.models import Branch
+from colleges.serializers import BranchSerializer
+from kcet_eduguide.async_api import api_exception_response, async_read_view, json_error
+
+
+@async_read_view
+async def branch_reviews(request, public_id):
+    try:
+        branch = await Branch.objects.select_related(
+            'college', 'cluster', 'rating_summary'
+        ).aget(public_id=public_id)
+    except Branch.DoesNotExist:
+        return json_error('Branch not found', 404)
+
+    reviews = CollegeReview.objects.filter(
+        unique_key=branch
+    ).select_related('student_user_id')
+
+    # Cursor pagination evaluates the queryset itself, so it runs off the loop
+    paginator = BranchReviewCursorPagination()
+    try:
+        page = await sync_to_async(paginator.paginate_queryset)(reviews, Request(request))
+    except APIException as exc:
+        # Invalid cursor (NotFound): answer like the sync view
+        return api_exception_response(exc)
+
+    summary = _get_rating_summary(branch)
+    return {
+        'branch': BranchSerializer(branch).data,
+        'reviews': BranchReviewSerializer(page, many=True).data,
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+        'average_ratings': summary.average_ratings(),
+        'total_reviews': summary.review_count,
+    }
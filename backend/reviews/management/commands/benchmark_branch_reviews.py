@@ -0,0 +1,116 @@
+"""
+Compare payload size and response time of branch review listings.
+
+Creates N throwaway studying students + reviews for one branch inside a
+transaction that is rolled back at the end, then measures:
+  - legacy:  every review with the full CollegeReviewSerializer
+             (nested StudentSerializer -> BranchSerializer, plus unique_key_data)
+  - lean:    the branch_reviews endpoint (first page, BranchReviewSerializer)
+  - lean-all: walking every cursor page of the endpoint
+
+Usage:
+    python manage.py benchmark_branch_reviews --reviews 500
+    python manage.py benchmark_branch_reviews --branch E001CS --reviews 500
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from colleges.models import Branch
+from kcet_eduguide.benchmark import request_host
+from reviews.models import CollegeReview, RATING_NAMES
+from reviews.serializers import CollegeReviewSerializer
+from reviews.services import rebuild_rating_summaries
+from reviews.views import branch_reviews
+from students.models import Student
+
+
+class Command(BaseCommand):
+    help = 'Benchmark branch review listing payload size and response time (rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reviews', type=int, default=500, help='Number of reviews to create')
+        parser.add_argument('--branch', help='Branch unique_key (defaults to the first branch)')
+
+    def handle(self, *args, **options):
+        branch = (
+            Branch.objects.filter(unique_key=options['branch']).first()
+            if options['branch'] else Branch.objects.order_by('unique_key').first()
+        )
+        if branch is None:
+            raise CommandError('No branch found to benchmark against')
+
+        with transaction.atomic():
+            self._populate(branch, options['reviews'])
+            self._run(branch)
+            transaction.set_rollback(True)
+
+        self.stdout.write('Benchmark data rolled back')
+
+    def _populate(self, branch, count):
+        college_code = branch.college.college_code
+        text = 'Faculty are helpful and labs are well equipped. ' * 4
+        for i in range(count):
+            student = Student(
+                type_of_student='studying',
+                college_code=college_code,
+                unique_key=branch,
+                name=f'Benchmark Student {i}',
+                email_id=f'benchmark-{i}@example.invalid',
+                phone_number='0000000000',
+                year_of_starting=2023,
+            )
+            student.save()
+            CollegeReview.objects.create(
+                student_user_id=student,
+                unique_key=branch,
+                **{f'{name}_rating': (i % 5) + 1 for name in RATING_NAMES},
+                **{f'{name}_review': text for name in RATING_NAMES},
+            )
+        rebuild_rating_summaries(Branch.objects.filter(pk=branch.pk))
+
+    def _measure(self, label, func):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            payload = func()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f'{label:<9} {len(payload) / 1024:9.1f} KB {elapsed * 1000:9.1f} ms {len(queries.captured_queries):5d} queries'
+        )
+
+    def _run(self, branch):
+        renderer = JSONRenderer()
+        factory = APIRequestFactory()
+        host = request_host()
+
+        def legacy():
+            reviews = CollegeReview.objects.filter(unique_key=branch).select_related(
+                'student_user_id', 'unique_key__college', 'unique_key__cluster'
+            )
+            return renderer.render({'reviews': CollegeReviewSerializer(reviews, many=True).data})
+
+        def fetch(path):
+            response = branch_reviews(factory.get(path, HTTP_HOST=host), public_id=branch.public_id)
+            response.render()
+            return response
+
+        def lean_first_page():
+            return fetch(f'/api/reviews/branches/{branch.public_id}/').content
+
+        def lean_all_pages():
+            path = f'/api/reviews/branches/{branch.public_id}/?page_size=100'
+            total = b''
+            while path:
+                response = fetch(path)
+                total += response.content
+                path = response.data['next']
+            return total
+
+        self.stdout.write(f'Branch {branch.unique_key} with {CollegeReview.objects.filter(unique_key=branch).count()} reviews')
+        self._measure('legacy', legacy)
+        self._measure('lean', lean_first_page)
+        self._measure('lean-all', lean_all_pages)
@@ -0,0 +1,76 @@
+"""
+Check that clean_text_fast matches clean_text and compare their speed.
+
+Usage:
+    python manage.py benchmark_clean_text
+    python manage.py benchmark_clean_text --samples 5000 --length 1000
+"""
+import random
+import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.review_checker import clean_text, clean_text_fast
+
+
+WORDS = [
+    'teaching', 'faculty', 'placement', 'Library', 'LABS', 'hostel', 'campus',
+    'good', 'average', 'excellent', 'poor', 'the', 'is', 'and', 'very', 'RVCE',
+    'café', 'naïve', 'İstanbul', 'ß', 'http', 'https', 'www', '<', '>', '<b>',
+    '</p>', '<br/>', 'a<b', 'x>y', '&amp;',
+    '2024', '9.5/10', '₹1,20,000', '٣', '²', "don't", '!!!', '...', '—', '(ok)', 'labs,', '#1',
+]
+URLS = [
+    'http://example.com', 'https://rvce.edu.in/placements?year=2024',
+    'HTTP://UPPER.CASE/Path', 'http', 'xhttp://inline', 'http://a<b>c',
+]
+SEPARATORS = [
+    ' ', '  ', '\t', '\n', '\r\n', '\x0b', '\x0c', '\x1c', '\x85', '\xa0',
+    ' ', ' ', '　', '',
+]
+TAGS = ['<p>', '</p>', '<a href="x">', '<div\nclass="y">', '<<>>', '<>', '< >']
+
+
+def random_text(rng, length):
+    parts = []
+    size = 0
+    while size < length:
+        choice = rng.random()
+        if choice < 0.1:
+            part = rng.choice(URLS)
+        elif choice < 0.2:
+            part = rng.choice(TAGS)
+        else:
+            part = rng.choice(WORDS)
+        part += rng.choice(SEPARATORS)
+        parts.append(part)
+        size += len(part)
+    return ''.join(parts)[:length]
+
+
+class Command(BaseCommand):
+    help = 'Verify clean_text_fast against clean_text over a random corpus and benchmark both'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=2000, help='Number of random texts to compare')
+        parser.add_argument('--length', type=int, default=1000, help='Characters per text')
+        parser.add_argument('--seed', type=int, default=2024, help='Random seed for the corpus')
+        parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        corpus = [random_text(rng, options['length']) for _ in range(options['samples'])]
+
+        for text in corpus:
+            expected = clean_text(text)
+            actual = clean_text_fast(text)
+            if expected != actual:
+                raise CommandError(
+                    f'Mismatch for input {text!r}:\n  clean_text:      {expected!r}\n  clean_text_fast: {actual!r}'
+                )
+        self.stdout.write(self.style.SUCCESS(f'{len(corpus)} texts produce identical output'))
+
+        for name, func in [('clean_text', clean_text), ('clean_text_fast', clean_text_fast)]:
+            best = min(timeit.repeat(lambda: [func(t) for t in corpus], number=1, repeat=options['repeat']))
+            per_call_us = best / len(corpus) * 1_000_000
+            self.stdout.write(f'{name:<16} {per_call_us:8.2f} us/call ({options["length"]} chars)')
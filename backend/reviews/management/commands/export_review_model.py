@@ -0,0 +1,98 @@
+"""
+Export the pickled TF-IDF vectorizer + AI-detector as a NumPy artifact.
+
+Usage:
+    python manage.py export_review_model
+    python manage.py export_review_model --samples 5000 --output /tmp/review_ai_detector.npz
+
+After exporting, the artifact is checked against sklearn's predict_proba on a
+random corpus built from the model vocabulary and the command fails if any
+probability differs by more than --tolerance.
+Set REVIEW_MODEL_BACKEND=numpy to score reviews with it.
+"""
+import os
+import random
+import timeit
+
+import joblib
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.numpy_scorer import NumpyReviewScorer, export_artifact, file_sha256
+from reviews.review_checker import (
+    MODEL_PATH,
+    NUMPY_ARTIFACT_PATH,
+    VECTORIZER_PATH,
+    clean_text_fast,
+)
+
+
+def sample_texts(rng, terms, count):
+    """Review-like texts made of vocabulary terms, noise words and punctuation."""
+    noise = ['the', 'and', 'was', 'campus', 'xyzzy', 'labs!', 'faculty,', '2024', 'ok.']
+    texts = ['', 'a', '!!!', 'the and of']
+    for _ in range(count):
+        words = [rng.choice(terms) if rng.random() < 0.7 else rng.choice(noise)
+                 for _ in range(rng.randint(1, 80))]
+        texts.append(' '.join(words))
+    return texts
+
+
+class Command(BaseCommand):
+    help = 'Export the AI-detector pickles to a NumPy artifact and verify it against sklearn'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=NUMPY_ARTIFACT_PATH, help='Artifact path (.npz)')
+        parser.add_argument('--samples', type=int, default=2000, help='Random texts used for verification')
+        parser.add_argument('--tolerance', type=float, default=1e-9, help='Maximum allowed probability difference')
+        parser.add_argument('--seed', type=int, default=2024, help='Random seed for the verification corpus')
+
+    def handle(self, *args, **options):
+        for path in (VECTORIZER_PATH, MODEL_PATH):
+            if not os.path.exists(path):
+                raise CommandError(f'Model file not found: {path}')
+
+        vectorizer = joblib.load(VECTORIZER_PATH)
+        model = joblib.load(MODEL_PATH)
+
+        output = options['output']
+        try:
+            export_artifact(
+                vectorizer,
+                model,
+                output,
+                source_hashes={
+                    'vectorizer': file_sha256(VECTORIZER_PATH),
+                    'model': file_sha256(MODEL_PATH),
+                },
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(f'Wrote {output} ({os.path.getsize(output) / 1024:.0f} KB)')
+
+        scorer = NumpyReviewScorer(output)
+        rng = random.Random(options['seed'])
+        texts = [clean_text_fast(t) for t in sample_texts(rng, list(vectorizer.vocabulary_), options['samples'])]
+
+        expected = model.predict_proba(vectorizer.transform(texts))[:, 1]
+        max_diff = max(abs(scorer.predict_proba_ai(t) - p) for t, p in zip(texts, expected))
+        if max_diff > options['tolerance']:
+            os.remove(output)
+            raise CommandError(
+                f'NumPy scorer differs from predict_proba by {max_diff:.3e} '
+                f'(tolerance {options["tolerance"]:.0e}); artifact removed'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(texts)} texts match predict_proba (max difference {max_diff:.3e})'
+        ))
+
+        timing_texts = texts[:200]
+        sklearn_time = min(timeit.repeat(
+            lambda: [model.predict_proba(vectorizer.transform([t]))[0][1] for t in timing_texts],
+            number=1, repeat=3,
+        ))
+        numpy_time = min(timeit.repeat(
+            lambda: [scorer.predict_proba_ai(t) for t in timing_texts],
+            number=1, repeat=3,
+        ))
+        self.stdout.write(f'sklearn {sklearn_time / len(timing_texts) * 1e6:8.1f} us/call')
+        self.stdout.write(f'numpy   {numpy_time / len(timing_texts) * 1e6:8.1f} us/call')
@@ -0,0 +1,19 @@
+"""
+Recompute BranchRatingSummary rows from the college_reviews table.
+
+Usage:
+    python manage.py rebuild_rating_summaries
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.services import rebuild_rating_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-branch review rating summaries from existing reviews'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_rating_summaries()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rating summaries for {count} branches'))
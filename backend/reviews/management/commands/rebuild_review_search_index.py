@@ -0,0 +1,19 @@
+"""
+Recompute the review_search_terms index from the college_reviews table.
+
+Usage:
+    python manage.py rebuild_review_search_index
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.services import rebuild_review_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the review text search index from existing reviews'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_review_search_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} reviews for text search'))
@@ -1,6 +1,12 @@
 from django.db import models
 from students.models import Student
-from colleges.models import Branch
+from colleges.models import Branch, College
+
+# Rating dimensions (<name>_rating fields on CollegeReview)
+RATING_NAMES = [
+    'teaching', 'courses', 'library', 'research', 'internship',
+    'infrastructure', 'administration', 'extracurricular', 'safety', 'placement',
+]
 
 
 class CollegeReview(models.Model):
@@ -51,7 +57,100 @@ class CollegeReview(models.Model):
         db_table = 'college_reviews'
         unique_together = [['student_user_id', 'unique_key']]
         managed = True
+        indexes = [
+            # unique_together leads with the student; lookups by branch
+            # (reviewers of a branch) need the branch first
+            models.Index(fields=['unique_key', 'student_user_id'], name='review_branch_student_idx'),
+        ]
 
     def __str__(self):
         return f"Review {self.review_id} by {self.student_user_id} for {self.unique_key}"
 
+
+class BranchRatingSummary(models.Model):
+    """
+    Running review count and rating sums per branch.
+    
+    Kept incrementally up to date by the CollegeReview signal handlers
+    (reviews.signals) so average ratings are read from a single row instead of
+    aggregating every review. Rebuild with
+    `python manage.py rebuild_rating_summaries` after bulk writes to reviews.
+    """
+    branch = models.OneToOneField(
+        Branch,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rating_summary',
+        db_column='unique_key'
+    )
+    review_count = models.IntegerField(default=0)
+    
+    teaching_sum = models.IntegerField(default=0)
+    courses_sum = models.IntegerField(default=0)
+    library_sum = models.IntegerField(default=0)
+    research_sum = models.IntegerField(default=0)
+    internship_sum = models.IntegerField(default=0)
+    infrastructure_sum = models.IntegerField(default=0)
+    administration_sum = models.IntegerField(default=0)
+    extracurricular_sum = models.IntegerField(default=0)
+    safety_sum = models.IntegerField(default=0)
+    placement_sum = models.IntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'branch_rating_summary'
+        managed = True
+
+    def __str__(self):
+        return f"Rating summary for {self.branch_id} ({self.review_count} reviews)"
+
+    def rating_sums(self):
+        return {name: getattr(self, f'{name}_sum') for name in RATING_NAMES}
+
+    def average_ratings(self):
+        """Same shape as the avg_<name> aggregates returned by the review endpoints."""
+        return {
+            f'avg_{name}': (total / self.review_count) if self.review_count else None
+            for name, total in self.rating_sums().items()
+        }
+
+    def overall_average(self):
+        """Mean over all rating dimensions, or None without reviews."""
+        if not self.review_count:
+            return None
+        return sum(self.rating_sums().values()) / (self.review_count * len(RATING_NAMES))
+
+
+class ReviewSearchTerm(models.Model):
+    """
+    Inverted index over the *_review text fields of CollegeReview.
+    
+    One row per (review, field, term) with the term frequency. Branch and
+    college are copied onto each row so a term lookup scoped to either is a
+    single index range scan instead of a scan of every review's text.
+    Maintained by the CollegeReview signal handlers (reviews.signals); rebuild
+    with `python manage.py rebuild_review_search_index` after bulk writes.
+    """
+    review = models.ForeignKey(
+        CollegeReview,
+        on_delete=models.CASCADE,
+        related_name='search_terms',
+        db_column='review_id'
+    )
+    branch = models.ForeignKey(Branch, on_delete=models.CASCADE, db_column='unique_key')
+    college = models.ForeignKey(College, on_delete=models.CASCADE, db_column='college_id')
+    field = models.CharField(max_length=20)
+    term = models.CharField(max_length=64)
+    frequency = models.SmallIntegerField(default=1)
+
+    class Meta:
+        db_table = 'review_search_terms'
+        managed = True
+        indexes = [
+            models.Index(fields=['term', 'college'], name='review_term_college_idx'),
+            models.Index(fields=['term', 'branch'], name='review_term_branch_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} in review {self.review_id} ({self.field})"
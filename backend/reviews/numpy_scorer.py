@@ -0,0 +1,171 @@
+"""
+Lightweight NumPy scorer for the AI-detector.
+
+The AI-detector is a logistic regression over TF-IDF features, so scoring a
+text is a sparse dot product followed by a sigmoid. This module replays the
+vectorizer's word analyzer and that arithmetic from a compact artifact
+(review_ai_detector.npz) written by `manage.py export_review_model`, without
+sklearn's input validation layers. It matches predict_proba to within 1e-9.
+"""
+import hashlib
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+ARTIFACT_VERSION = 1
+
+
+def file_sha256(path):
+    """SHA-256 of a file, used to tie the artifact to the pickles it came from."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _pack_terms(terms):
+    # Terms never contain newlines (they are made of token_pattern matches
+    # joined by spaces), so a newline-joined UTF-8 buffer is a compact encoding.
+    return np.frombuffer('\n'.join(terms).encode('utf-8'), dtype=np.uint8)
+
+
+def _unpack_terms(array):
+    data = array.tobytes().decode('utf-8')
+    return data.split('\n') if data else []
+
+
+def export_artifact(vectorizer, model, path, source_hashes):
+    """
+    Write the vectorizer + model as a NumPy artifact.
+
+    Args:
+        vectorizer: Fitted sklearn TfidfVectorizer
+        model: Fitted binary sklearn LogisticRegression
+        path (str): Destination .npz path
+        source_hashes (dict): {'vectorizer': sha256, 'model': sha256} of the pickles
+
+    Raises:
+        ValueError: If the vectorizer/model use features this scorer does not replay
+    """
+    if vectorizer.analyzer != 'word' or vectorizer.tokenizer is not None or vectorizer.preprocessor is not None:
+        raise ValueError("Only the built-in word analyzer is supported")
+    if vectorizer.strip_accents:
+        raise ValueError("strip_accents is not supported")
+    if vectorizer.norm not in ('l2', None):
+        raise ValueError(f"Unsupported norm: {vectorizer.norm}")
+    if re.compile(vectorizer.token_pattern).groups > 1:
+        raise ValueError("token_pattern must have at most one capturing group")
+    if type(model).__name__ != 'LogisticRegression' or len(model.classes_) != 2:
+        raise ValueError("Only binary LogisticRegression models are supported")
+
+    n_features = len(vectorizer.vocabulary_)
+    terms = [None] * n_features
+    for term, index in vectorizer.vocabulary_.items():
+        terms[index] = term
+
+    if vectorizer.use_idf:
+        idf = np.asarray(vectorizer.idf_, dtype=np.float64)
+    else:
+        idf = np.ones(n_features, dtype=np.float64)
+
+    stop_words = vectorizer.get_stop_words() or []
+    min_n, max_n = vectorizer.ngram_range
+
+    np.savez_compressed(
+        path,
+        version=np.array(ARTIFACT_VERSION),
+        vocabulary=_pack_terms(terms),
+        stop_words=_pack_terms(sorted(stop_words)),
+        idf=idf,
+        coef=np.asarray(model.coef_[0], dtype=np.float64),
+        intercept=np.array(float(model.intercept_[0])),
+        token_pattern=np.array(vectorizer.token_pattern),
+        ngram_range=np.array([min_n, max_n]),
+        lowercase=np.array(bool(vectorizer.lowercase)),
+        binary=np.array(bool(vectorizer.binary)),
+        sublinear_tf=np.array(bool(vectorizer.sublinear_tf)),
+        l2_norm=np.array(vectorizer.norm == 'l2'),
+        vectorizer_sha256=np.array(source_hashes['vectorizer']),
+        model_sha256=np.array(source_hashes['model']),
+    )
+
+
+class NumpyReviewScorer:
+    """
+    Score texts from a review_ai_detector.npz artifact.
+
+    Args:
+        path (str): Path to the .npz artifact
+    """
+
+    def __init__(self, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != ARTIFACT_VERSION:
+                raise ValueError(f"Unsupported artifact version: {int(data['version'])}")
+            terms = _unpack_terms(data['vocabulary'])
+            self.stop_words = frozenset(_unpack_terms(data['stop_words']))
+            self.idf = data['idf']
+            self.coef = data['coef']
+            self.intercept = float(data['intercept'])
+            self.token_re = re.compile(str(data['token_pattern']))
+            self.min_n, self.max_n = (int(n) for n in data['ngram_range'])
+            self.lowercase = bool(data['lowercase'])
+            self.binary = bool(data['binary'])
+            self.sublinear_tf = bool(data['sublinear_tf'])
+            self.l2_norm = bool(data['l2_norm'])
+            self.source_hashes = {
+                'vectorizer': str(data['vectorizer_sha256']),
+                'model': str(data['model_sha256']),
+            }
+
+        self.vocabulary = {term: index for index, term in enumerate(terms)}
+
+    def analyze(self, text):
+        """Same tokens as TfidfVectorizer.build_analyzer() for the exported settings."""
+        if self.lowercase:
+            text = text.lower()
+        tokens = self.token_re.findall(text)
+        if self.stop_words:
+            tokens = [w for w in tokens if w not in self.stop_words]
+
+        if self.max_n == 1:
+            return tokens
+
+        ngrams = list(tokens) if self.min_n == 1 else []
+        n_tokens = len(tokens)
+        for n in range(max(self.min_n, 2), min(self.max_n, n_tokens) + 1):
+            for i in range(n_tokens - n + 1):
+                ngrams.append(" ".join(tokens[i:i + n]))
+        return ngrams
+
+    def decision_function(self, text):
+        vocabulary = self.vocabulary
+        counts = Counter(vocabulary[t] for t in self.analyze(text) if t in vocabulary)
+        if not counts:
+            return self.intercept
+
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self.binary:
+            tf[:] = 1.0
+        elif self.sublinear_tf:
+            tf = np.log(tf) + 1.0
+
+        values = tf * self.idf[indices]
+        score = float(np.dot(values, self.coef[indices]))
+        if self.l2_norm:
+            norm = math.sqrt(float(np.dot(values, values)))
+            if norm > 0:
+                score /= norm
+        return score + self.intercept
+
+    def predict_proba_ai(self, text):
+        """Probability of the positive (AI-generated) class."""
+        z = self.decision_function(text)
+        if z >= 0:
+            return 1.0 / (1.0 + math.exp(-z))
+        e = math.exp(z)
+        return e / (1.0 + e)
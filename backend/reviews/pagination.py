@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class BranchReviewCursorPagination(CursorPagination):
+    """Newest reviews first; review_id is unique and increasing, so cursors stay stable."""
+    ordering = '-review_id'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -8,39 +8,98 @@ import joblib
 import re
 import os
 import logging
-from sklearn.utils.validation import check_is_fitted
+import threading
+from django.conf import settings
+from .numpy_scorer import NumpyReviewScorer, file_sha256
 
 logger = logging.getLogger(__name__)
 
+# Model files live in backend/reviews/ml_models/
+MODELS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ml_models')
+VECTORIZER_PATH = os.path.join(MODELS_DIR, 'tfidf_vectorizer.pkl')
+MODEL_PATH = os.path.join(MODELS_DIR, 'review_ai_detector.pkl')
+NUMPY_ARTIFACT_PATH = os.path.join(MODELS_DIR, 'review_ai_detector.npz')
+
 # Global variables to store loaded model and vectorizer
 _vectorizer = None
 _model = None
+_numpy_scorer = None
 _model_loaded = False
+_load_attempted = False
+_load_lock = threading.Lock()
 
 
 def load_model():
     """
-    Load saved model & vectorizer (load ONCE at startup).
+    Load saved model & vectorizer (load ONCE per process, on first use).
     
     Expected files:
     - tfidf_vectorizer.pkl: The TF-IDF vectorizer
     - review_ai_detector.pkl: The trained classification model
     
-    These files should be placed in backend/reviews/ml_models/ directory
+    These files should be placed in backend/reviews/ml_models/ directory.
+    With REVIEW_MODEL['MMAP'] enabled the numpy arrays inside the pickles are
+    memory-mapped read-only, so worker processes share the same pages.
+    
+    With REVIEW_MODEL['BACKEND'] = 'numpy' the exported review_ai_detector.npz
+    artifact is used instead (see `manage.py export_review_model`), falling
+    back to the pickles if it is missing or out of date.
     """
-    global _vectorizer, _model, _model_loaded
+    global _load_attempted
     
     if _model_loaded:
-        logger.info("Model already loaded, skipping reload")
+        logger.debug("Model already loaded, skipping reload")
         return True
     
+    with _load_lock:
+        if _model_loaded:
+            return True
+        _load_attempted = True
+        if getattr(settings, 'REVIEW_MODEL', {}).get('BACKEND', 'sklearn') == 'numpy':
+            if _load_numpy_scorer():
+                return True
+            logger.warning("Falling back to the sklearn model files")
+        return _load_model_files()
+
+
+def _load_numpy_scorer():
+    """Load the NumPy artifact. Returns False if it is missing or stale."""
+    global _numpy_scorer, _model_loaded
+    
+    if not os.path.exists(NUMPY_ARTIFACT_PATH):
+        logger.warning(f"NumPy model artifact not found at: {NUMPY_ARTIFACT_PATH}")
+        logger.warning("Run `python manage.py export_review_model` to create it.")
+        return False
+    
     try:
-        # Get the base directory (backend/)
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        models_dir = os.path.join(base_dir, 'reviews', 'ml_models')
+        scorer = NumpyReviewScorer(NUMPY_ARTIFACT_PATH)
         
-        vectorizer_path = os.path.join(models_dir, 'tfidf_vectorizer.pkl')
-        model_path = os.path.join(models_dir, 'review_ai_detector.pkl')
+        # Refuse an artifact exported from different pickles
+        for name, path in [('vectorizer', VECTORIZER_PATH), ('model', MODEL_PATH)]:
+            if os.path.exists(path) and file_sha256(path) != scorer.source_hashes[name]:
+                logger.warning(f"NumPy model artifact is stale ({name} pickle changed). Re-run export_review_model.")
+                return False
+    except Exception as e:
+        logger.error(f"Error loading NumPy model artifact: {str(e)}", exc_info=True)
+        return False
+    
+    _numpy_scorer = scorer
+    _model_loaded = True
+    logger.info("NumPy AI-detector artifact loaded successfully")
+    return True
+
+
+def _load_model_files():
+    global _vectorizer, _model, _model_loaded
+    
+    # Imported here so the NumPy backend never pays for importing sklearn
+    from sklearn.utils.validation import check_is_fitted
+    
+    mmap_mode = 'r' if getattr(settings, 'REVIEW_MODEL', {}).get('MMAP', False) else None
+    
+    try:
+        vectorizer_path = VECTORIZER_PATH
+        model_path = MODEL_PATH
         
         # Check if files exist
         if not os.path.exists(vectorizer_path):
@@ -55,7 +114,7 @@ def load_model():
         
         # Load vectorizer and model
         logger.info(f"Loading vectorizer from: {vectorizer_path}")
-        _vectorizer = joblib.load(vectorizer_path)
+        _vectorizer = joblib.load(vectorizer_path, mmap_mode=mmap_mode)
         
         # Verify vectorizer is properly fitted
         try:
@@ -70,7 +129,7 @@ def load_model():
             return False
         
         logger.info(f"Loading model from: {model_path}")
-        _model = joblib.load(model_path)
+        _model = joblib.load(model_path, mmap_mode=mmap_mode)
         
         # Verify model is properly fitted
         try:
@@ -105,6 +164,30 @@ def clean_text(text):
     return text.strip()
 
 
+# Precompiled versions of the clean_text patterns
+_URL_RE = re.compile(r"http\S+")
+_TAG_RE = re.compile(r"<.*?>")
+
+
+def clean_text_fast(text):
+    """
+    Precompiled equivalent of clean_text - produces IDENTICAL output.
+    
+    The URL and tag passes run in the same order with the same patterns but
+    are skipped when the text cannot contain a match. Whitespace is collapsed
+    with str.split(), which uses the same whitespace definition as \\s for
+    str patterns (Py_UNICODE_ISSPACE), so no third regex pass is needed.
+    
+    Equivalence and speed are checked by `manage.py benchmark_clean_text`.
+    """
+    text = str(text).lower()
+    if "http" in text:
+        text = _URL_RE.sub("", text)
+    if "<" in text:
+        text = _TAG_RE.sub("", text)
+    return " ".join(text.split())
+
+
 def check_review(review_text):
     """
     Check if review text is AI-generated or Human-written.
@@ -124,8 +207,8 @@ def check_review(review_text):
     """
     global _vectorizer, _model, _model_loaded
     
-    if not _model_loaded or _vectorizer is None or _model is None:
-        raise RuntimeError("ML model not loaded. Call load_model() first.")
+    if not ensure_model_loaded():
+        raise RuntimeError("ML model not loaded. Check the model files in reviews/ml_models/.")
     
     # Limit text length (prevent abuse)
     max_length = 1000
@@ -138,19 +221,25 @@ def check_review(review_text):
         # Empty text is considered human (no AI detection needed)
         return "HUMAN-WRITTEN", 0.0
     
-    # Use EXACT cleaning logic
-    review_text = clean_text(review_text)
+    # Use EXACT cleaning logic (precompiled, identical output to clean_text)
+    review_text = clean_text_fast(review_text)
     
-    # Verify vectorizer is still fitted before use (safety check)
-    try:
-        check_is_fitted(_vectorizer, attributes=["idf_"], msg="idf vector is not fitted")
-    except Exception as e:
-        logger.error(f"Vectorizer not properly fitted during use: {str(e)}")
-        raise RuntimeError("ML model vectorizer is not properly fitted. Please restart the server.")
-    
-    # Transform and predict
-    vector = _vectorizer.transform([review_text])
-    probability_ai = _model.predict_proba(vector)[0][1]
+    if _numpy_scorer is not None:
+        # Same TF-IDF + logistic regression arithmetic, without sklearn's validation layers
+        probability_ai = _numpy_scorer.predict_proba_ai(review_text)
+    else:
+        from sklearn.utils.validation import check_is_fitted
+        
+        # Verify vectorizer is still fitted before use (safety check)
+        try:
+            check_is_fitted(_vectorizer, attributes=["idf_"], msg="idf vector is not fitted")
+        except Exception as e:
+            logger.error(f"Vectorizer not properly fitted during use: {str(e)}")
+            raise RuntimeError("ML model vectorizer is not properly fitted. Please restart the server.")
+        
+        # Transform and predict
+        vector = _vectorizer.transform([review_text])
+        probability_ai = _model.predict_proba(vector)[0][1]
     
     # Use EXACT threshold (0.7) - DO NOT MODIFY
     if probability_ai > 0.7:
@@ -163,5 +252,20 @@ def check_review(review_text):
 
 def is_model_loaded():
     """Check if the model is loaded and ready to use."""
+    if _numpy_scorer is not None:
+        return _model_loaded
     return _model_loaded and _vectorizer is not None and _model is not None
 
+
+def ensure_model_loaded():
+    """
+    Load the model lazily on first use.
+    
+    A failed load is not retried on every call (that would hit the disk and
+    flood the logs per request); call load_model() explicitly to retry.
+    """
+    if is_model_loaded():
+        return True
+    if _load_attempted:
+        return False
+    return load_model()
@@ -0,0 +1,199 @@
+"""
+Optional process pool for AI-detector scoring.
+
+Scoring a review is CPU-bound sklearn work. When the pool is enabled the
+request worker only submits texts and waits (with a timeout) for the result,
+so a burst of review submissions does not tie up every WSGI worker.
+
+The pool is started lazily from a request thread, so its processes are
+started with ``forkserver`` (or ``spawn``) rather than forked from the
+multi-threaded web process. Each pool process loads the model once in the
+worker initializer; REVIEW_MODEL_MMAP lets them share the NumPy arrays.
+
+A text that is still being scored when the timeout expires cannot be
+interrupted, so after a timeout the whole pool is recycled: its processes are
+terminated and a fresh pool is started on next use.
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from .review_checker import check_review, ensure_model_loaded, load_model
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class ScoringUnavailable(RuntimeError):
+    """Raised when the scoring queue is full or a scoring call times out."""
+
+
+def _init_worker():
+    """Pool initializer - make sure the model is available in the worker."""
+    if not load_model():
+        logger.error("Scoring worker could not load the ML model")
+
+
+def _score_in_worker(text):
+    label, probability_ai = check_review(text)
+    return label, float(probability_ai)
+
+
+class ScoringPool:
+    """
+    Bounded process pool that scores review texts off the request thread.
+
+    Args:
+        workers (int): Number of scoring processes
+        max_pending (int): Maximum texts queued or running at once (per web process)
+        timeout (float): Seconds to wait for a batch of results
+    """
+
+    def __init__(self, workers=2, max_pending=32, timeout=5.0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Never fork the threaded web process
+                method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(method),
+                    initializer=_init_worker,
+                )
+                logger.info(f"Started review scoring pool with {self.workers} {method} workers")
+            return self._executor
+
+    def _reset_executor(self, executor=None):
+        """
+        Drop the current executor so the next call starts a fresh one.
+
+        Args:
+            executor: Only reset if this is still the current executor, so
+                concurrent failures do not discard a pool another request
+                has already restarted
+        """
+        with self._lock:
+            if self._executor is None or (executor is not None and self._executor is not executor):
+                return
+            executor, self._executor = self._executor, None
+
+        # shutdown() cannot stop a running task; terminate the processes so a
+        # stuck text does not keep a worker busy after its caller gave up
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def score_many(self, texts):
+        """
+        Score several texts in the pool.
+
+        Args:
+            texts (list[str]): Texts to check
+
+        Returns:
+            list[tuple]: (label, probability_ai) for each text, in order
+
+        Raises:
+            ScoringUnavailable: If the queue is full or results time out
+        """
+        acquired = 0
+        executor = None
+        futures = []
+        try:
+            # Fail fast instead of blocking the request worker when saturated
+            for _ in texts:
+                if not self._slots.acquire(blocking=False):
+                    raise ScoringUnavailable("Scoring queue is full")
+                acquired += 1
+
+            executor = self._get_executor()
+            futures = [executor.submit(_score_in_worker, text) for text in texts]
+
+            deadline = time.monotonic() + self.timeout
+            return [
+                future.result(timeout=max(0.0, deadline - time.monotonic()))
+                for future in futures
+            ]
+        except FutureTimeoutError:
+            logger.warning(f"Review scoring timed out after {self.timeout}s, recycling the pool")
+            self._reset_executor(executor)
+            raise ScoringUnavailable("Scoring timed out")
+        except CancelledError:
+            # Another request's timeout recycled the pool under these texts
+            raise ScoringUnavailable("Scoring pool was restarted")
+        except BrokenProcessPool:
+            logger.error("Review scoring pool broke, restarting on next use", exc_info=True)
+            self._reset_executor(executor)
+            raise ScoringUnavailable("Scoring workers are unavailable")
+        finally:
+            for _ in range(acquired):
+                self._slots.release()
+
+    def shutdown(self):
+        self._reset_executor()
+
+
+def get_scoring_pool():
+    """Return the shared ScoringPool, or None when the pool is disabled."""
+    global _pool
+
+    config = getattr(settings, 'REVIEW_SCORING_POOL', {})
+    if not config.get('ENABLED', False):
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ScoringPool(
+                workers=config.get('WORKERS', 2),
+                max_pending=config.get('MAX_PENDING', 32),
+                timeout=config.get('TIMEOUT', 5.0),
+            )
+        return _pool
+
+
+def scoring_available():
+    """
+    Whether review texts can be scored right now.
+
+    When scoring inline this loads the model lazily; with the pool enabled the
+    workers load it themselves, so the web process never holds a copy.
+    """
+    if get_scoring_pool() is not None:
+        return True
+    return ensure_model_loaded()
+
+
+def score_reviews(texts):
+    """
+    Score texts through the pool when enabled, otherwise inline.
+
+    Args:
+        texts (list[str]): Texts to check
+
+    Returns:
+        list[tuple]: (label, probability_ai) for each text, in order
+
+    Raises:
+        ScoringUnavailable: If the pool is saturated or times out
+        RuntimeError: If the model is not loaded (inline mode)
+    """
+    pool = get_scoring_pool()
+    if pool is None:
+        return [check_review(text) for text in texts]
+    return pool.score_many(texts)
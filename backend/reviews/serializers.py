@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from colleges.models import Branch
 from .models import CollegeReview
+from students.models import Student
 from students.serializers import StudentSerializer
 from colleges.serializers import BranchSerializer
 
@@ -30,6 +31,44 @@ class CollegeReviewSerializer(serializers.ModelSerializer):
         read_only_fields = ['review_id', 'student_user_id', 'review_date', 'created_at', 'updated_at']
 
 
+class ReviewerSerializer(serializers.ModelSerializer):
+    """Minimal public view of the reviewing student."""
+
+    class Meta:
+        model = Student
+        fields = ['student_user_id', 'name', 'year_of_starting']
+
+
+class BranchReviewSerializer(serializers.ModelSerializer):
+    """
+    Lean review representation for branch review listings.
+    
+    The branch is sent once at the top level of the response instead of being
+    nested (twice) in every review.
+    """
+    student_user_id_data = ReviewerSerializer(source='student_user_id', read_only=True)
+    
+    class Meta:
+        model = CollegeReview
+        fields = [
+            'review_id', 'student_user_id', 'student_user_id_data',
+            'unique_key', 'review_date',
+            'teaching_rating', 'teaching_review',
+            'courses_rating', 'courses_review',
+            'library_rating', 'library_review',
+            'research_rating', 'research_review',
+            'internship_rating', 'internship_review',
+            'infrastructure_rating', 'infrastructure_review',
+            'administration_rating', 'administration_review',
+            'extracurricular_rating', 'extracurricular_review',
+            'safety_rating', 'safety_review',
+            'placement_rating', 'placement_review',
+            'preferred_day', 'preferred_time',
+            'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+
 class CollegeReviewCreateSerializer(serializers.ModelSerializer):
     # Accept the unique_key in payload for backward compatibility, but the
     # server will ultimately rely on the authenticated studying student's
@@ -0,0 +1,232 @@
+import re
+from collections import Counter
+
+from django.db.models import Count, F, Sum
+
+from .models import BranchRatingSummary, CollegeReview, ReviewSearchTerm, RATING_NAMES
+
+SEARCH_TERM_RE = re.compile(r"[a-z0-9]+")
+SEARCH_TERM_MAX_LENGTH = 64
+SNIPPET_RADIUS = 80
+
+# Words too common in reviews to be worth indexing or ranking on
+SEARCH_STOP_WORDS = frozenset("""
+a about after all also am an and any are as at be because been but by can could
+did do does for from had has have he her his how i if in into is it its just me
+more most my no not of on or our out she so some than that the their them then
+there these they this to too very was we were what when which who will with would
+you your
+""".split())
+
+
+def review_ratings(review):
+    """Rating values of a review as {name: rating}."""
+    return {name: getattr(review, f'{name}_rating') for name in RATING_NAMES}
+
+
+def update_rating_summary(branch, added=None, removed=None):
+    """
+    Incrementally apply a review change to the branch's rating summary.
+
+    Called by the CollegeReview signal handlers (reviews.signals) inside the
+    transaction of the review write:
+    - create: added=<new ratings>
+    - update: added=<new ratings>, removed=<old ratings>
+    - delete: removed=<old ratings>
+
+    Args:
+        branch: Branch instance or primary key
+    """
+    added = added or {}
+    removed = removed or {}
+    branch_id = getattr(branch, 'pk', branch)
+
+    if added:
+        # A pure removal never creates a summary (e.g. while the branch
+        # itself is being deleted)
+        BranchRatingSummary.objects.get_or_create(branch_id=branch_id)
+
+    updates = {
+        'review_count': F('review_count') + (1 if added else 0) - (1 if removed else 0),
+    }
+    for name in RATING_NAMES:
+        updates[f'{name}_sum'] = F(f'{name}_sum') + added.get(name, 0) - removed.get(name, 0)
+
+    # F() expressions make the increment atomic in the database
+    BranchRatingSummary.objects.filter(branch_id=branch_id).update(**updates)
+
+
+def rebuild_rating_summaries(branches=None):
+    """
+    Recompute summaries from the reviews table (backfill / repair).
+
+    Args:
+        branches: Optional Branch queryset to limit the rebuild
+
+    Returns:
+        int: Number of summaries written
+    """
+    reviews = CollegeReview.objects.all()
+    summaries = BranchRatingSummary.objects.all()
+    if branches is not None:
+        reviews = reviews.filter(unique_key__in=branches)
+        summaries = summaries.filter(branch__in=branches)
+
+    rows = reviews.values('unique_key').annotate(
+        review_count=Count('review_id'),
+        **{f'{name}_sum': Sum(f'{name}_rating') for name in RATING_NAMES}
+    ).order_by('unique_key')
+
+    summaries.delete()
+    BranchRatingSummary.objects.bulk_create([
+        BranchRatingSummary(
+            branch_id=row['unique_key'],
+            review_count=row['review_count'],
+            **{f'{name}_sum': row[f'{name}_sum'] for name in RATING_NAMES}
+        )
+        for row in rows
+    ])
+    return len(rows)
+
+
+def search_terms(text):
+    """Lowercased index terms of a text (stop words and single characters dropped)."""
+    return [
+        term for term in SEARCH_TERM_RE.findall(text.lower())
+        if len(term) > 1 and len(term) <= SEARCH_TERM_MAX_LENGTH and term not in SEARCH_STOP_WORDS
+    ]
+
+
+def _search_term_rows(review, college_id):
+    rows = []
+    for name in RATING_NAMES:
+        counts = Counter(search_terms(getattr(review, f'{name}_review') or ''))
+        rows.extend(
+            ReviewSearchTerm(
+                review_id=review.review_id,
+                branch_id=review.unique_key_id,
+                college_id=college_id,
+                field=name,
+                term=term,
+                frequency=min(frequency, 32767),
+            )
+            for term, frequency in counts.items()
+        )
+    return rows
+
+
+def index_review_text(review, college_id=None):
+    """
+    Replace the search index rows of a review after it was created or edited.
+
+    Called by the CollegeReview post_save handler (reviews.signals). Deleting
+    a review removes its rows through the foreign key cascade.
+    """
+    if college_id is None:
+        college_id = review.unique_key.college_id
+    ReviewSearchTerm.objects.filter(review_id=review.review_id).delete()
+    ReviewSearchTerm.objects.bulk_create(_search_term_rows(review, college_id))
+
+
+def rebuild_review_search_index(batch_size=500):
+    """
+    Rebuild the review text search index from the reviews table.
+
+    Returns:
+        int: Number of reviews indexed
+    """
+    ReviewSearchTerm.objects.all().delete()
+    reviews = CollegeReview.objects.only(
+        'review_id', 'unique_key', *[f'{name}_review' for name in RATING_NAMES]
+    ).annotate(branch_college_id=F('unique_key__college')).order_by('review_id')
+
+    count = 0
+    rows = []
+    for review in reviews.iterator(chunk_size=batch_size):
+        rows.extend(_search_term_rows(review, review.branch_college_id))
+        count += 1
+        if len(rows) >= batch_size * 20:
+            ReviewSearchTerm.objects.bulk_create(rows, batch_size=batch_size)
+            rows = []
+    ReviewSearchTerm.objects.bulk_create(rows, batch_size=batch_size)
+    return count
+
+
+def search_reviews(query, college=None, branch=None, limit=20):
+    """
+    Rank reviews whose text contains the query terms.
+
+    Reviews are ordered by how many distinct query terms they contain, then by
+    total term frequency, newest first on ties. Only the index is scanned; the
+    review rows are loaded for the returned page alone.
+
+    Args:
+        query (str): Free text search query
+        college: Optional College to scope the search to
+        branch: Optional Branch to scope the search to
+        limit (int): Maximum number of reviews returned
+
+    Returns:
+        tuple: (terms, [{'review', 'score', 'matched_terms', 'fields'}])
+    """
+    terms = list(dict.fromkeys(search_terms(query)))
+    if not terms:
+        return terms, []
+
+    hits = ReviewSearchTerm.objects.filter(term__in=terms)
+    if branch is not None:
+        hits = hits.filter(branch=branch)
+    elif college is not None:
+        hits = hits.filter(college=college)
+
+    ranked = list(
+        hits.values('review_id').annotate(
+            matched_terms=Count('term', distinct=True),
+            score=Sum('frequency'),
+        ).order_by('-matched_terms', '-score', '-review_id')[:limit]
+    )
+    if not ranked:
+        return terms, []
+
+    review_ids = [row['review_id'] for row in ranked]
+    fields = {}
+    for review_id, field in hits.filter(review_id__in=review_ids).values_list('review_id', 'field').distinct():
+        fields.setdefault(review_id, set()).add(field)
+
+    reviews = CollegeReview.objects.select_related('unique_key__college').in_bulk(review_ids)
+    return terms, [
+        {
+            'review': reviews[row['review_id']],
+            'score': row['score'],
+            'matched_terms': row['matched_terms'],
+            # Keep the RATING_NAMES order for stable output
+            'fields': [name for name in RATING_NAMES if name in fields.get(row['review_id'], ())],
+        }
+        for row in ranked
+        if row['review_id'] in reviews
+    ]
+
+
+def review_snippet(text, terms, radius=SNIPPET_RADIUS):
+    """Excerpt of text around the first whole-word occurrence of any term."""
+    pattern = re.compile(r'\b(?:' + '|'.join(re.escape(t) for t in terms) + r')\b', re.IGNORECASE)
+    match = pattern.search(text)
+    if match is None:
+        return text[:radius * 2]
+
+    start = max(0, match.start() - radius)
+    end = min(len(text), match.end() + radius)
+    # Widen to word boundaries so the excerpt does not cut words in half
+    if start > 0:
+        space = text.rfind(' ', 0, start)
+        start = space + 1 if space != -1 else 0
+    if end < len(text):
+        space = text.find(' ', end)
+        end = space if space != -1 else len(text)
+
+    snippet = text[start:end].strip()
+    if start > 0:
+        snippet = '...' + snippet
+    if end < len(text):
+        snippet += '...'
+    return snippet
@@ -0,0 +1,61 @@
+"""
+Keep the branch rating summaries and the review search index in step with
+CollegeReview, whichever way a review is written: the API views, the admin,
+or cascade deletes of its student or branch.
+
+The branch and ratings a review was loaded with are remembered on the
+instance, so an edit moves exactly the old values out of the summary and the
+new ones in. Bulk writes (QuerySet.update(), bulk_create()) send no signals;
+run rebuild_rating_summaries and rebuild_review_search_index after those.
+"""
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from colleges.models import Branch
+
+from .models import CollegeReview, RATING_NAMES
+from .services import index_review_text, rebuild_rating_summaries, review_ratings, update_rating_summary
+
+RATING_FIELDS = [f'{name}_rating' for name in RATING_NAMES]
+
+
+@receiver(post_init, sender=CollegeReview, dispatch_uid='reviews_remember_ratings')
+def remember_ratings(sender, instance, **kwargs):
+    values = instance.__dict__
+    if any(field not in values for field in RATING_FIELDS + ['unique_key_id']):
+        # Loaded with deferred fields: nothing reliable to subtract
+        instance._summary_state = None
+    else:
+        instance._summary_state = (values['unique_key_id'], review_ratings(instance))
+
+
+@receiver(post_save, sender=CollegeReview, dispatch_uid='reviews_update_summary')
+def update_summary_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+
+    new_state = (instance.unique_key_id, review_ratings(instance))
+    if created:
+        update_rating_summary(instance.unique_key_id, added=new_state[1])
+    elif instance._summary_state is None:
+        rebuild_rating_summaries(Branch.objects.filter(pk=instance.unique_key_id))
+    else:
+        old_branch, old_ratings = instance._summary_state
+        if old_branch == instance.unique_key_id:
+            update_rating_summary(old_branch, added=new_state[1], removed=old_ratings)
+        else:
+            update_rating_summary(old_branch, removed=old_ratings)
+            update_rating_summary(instance.unique_key_id, added=new_state[1])
+    instance._summary_state = new_state
+
+    index_review_text(instance)
+
+
+@receiver(post_delete, sender=CollegeReview, dispatch_uid='reviews_update_summary_on_delete')
+def update_summary_on_delete(sender, instance, **kwargs):
+    # Search index rows go with the review through their foreign key
+    if instance._summary_state is None:
+        rebuild_rating_summaries(Branch.objects.filter(pk=instance.unique_key_id))
+    else:
+        branch, ratings = instance._summary_state
+        update_rating_summary(branch, removed=ratings)
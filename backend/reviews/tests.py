@@ -0,0 +1,122 @@
+import json
+import random
+
+import joblib
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from colleges.models import Branch, Cluster, College
+from students.models import Student
+
+from . import async_views, views
+from .management.commands.benchmark_clean_text import random_text
+from .management.commands.export_review_model import sample_texts
+from .models import CollegeReview, RATING_NAMES
+from .numpy_scorer import NumpyReviewScorer, file_sha256
+from .review_checker import MODEL_PATH, NUMPY_ARTIFACT_PATH, VECTORIZER_PATH, clean_text, clean_text_fast
+
+
+class BranchReviewsAsyncParityTests(TestCase):
+    """The async branch review listing answers exactly like the sync one."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cluster = Cluster.objects.create(cluster_code='A', cluster_name='Computer Science')
+        college = College.objects.create(
+            college_id='E01', college_code='E001', college_name='Test College', location='Bengaluru'
+        )
+        cls.branch = Branch.objects.create(
+            unique_key='E01CS', college=college, cluster=cluster, branch_id='CS', branch_name='Computer Science'
+        )
+        for i in range(3):
+            student = Student.objects.create(
+                type_of_student='studying', college_code='E001', email_id=f'student{i}@example.com',
+                phone_number='9000000000', unique_key=cls.branch, name=f'Student {i}', year_of_starting=2022,
+            )
+            CollegeReview.objects.create(
+                student_user_id=student, unique_key=cls.branch,
+                **{f'{name}_rating': 4 for name in RATING_NAMES},
+            )
+
+    def get_both(self, params):
+        path = f'/api/reviews/branches/{self.branch.public_id}/'
+        sync_response = views.branch_reviews(RequestFactory().get(path, params), public_id=self.branch.public_id)
+        sync_response.render()
+        async_response = async_to_sync(async_views.branch_reviews)(
+            RequestFactory().get(path, params), public_id=self.branch.public_id
+        )
+        return sync_response, async_response
+
+    def assertSameResponse(self, sync_response, async_response):
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(json.loads(async_response.content), json.loads(sync_response.content))
+
+    def test_first_page(self):
+        sync_response, async_response = self.get_both({'page_size': 2})
+        self.assertEqual(sync_response.status_code, 200)
+        self.assertSameResponse(sync_response, async_response)
+
+    def test_invalid_cursor(self):
+        sync_response, async_response = self.get_both({'cursor': 'garbage'})
+        self.assertEqual(sync_response.status_code, 404)
+        self.assertEqual(json.loads(sync_response.content), {'detail': 'Invalid cursor'})
+        self.assertSameResponse(sync_response, async_response)
+
+
+class CleanTextTests(SimpleTestCase):
+    """clean_text_fast gives exactly clean_text's output."""
+
+    CASES = [
+        '',
+        '   ',
+        'Great PLACEMENTS in 2024!!! 9.5/10, would recommend.',
+        'Fees: ₹1,20,000 per year (approx.) — hostel extra; labs #1?',
+        'Café food is naïve-level; İstanbul-style ß \u00a0nbsp\u2003em\u3000ideographic',
+        'Arabic ٣ and superscript ² digits',
+        'see https://rvce.edu.in/placements?year=2024 and HTTP://UPPER.CASE/Path.',
+        'xhttp://inline, http alone, <b>bold</b> a<b x>y <div\nclass="y">text</div>',
+        'tabs\tnew\nlines\r\nvertical\x0bform\x0cseparators\x1c\x85',
+    ]
+
+    def test_fixed_cases(self):
+        for text in self.CASES:
+            with self.subTest(text=text):
+                self.assertEqual(clean_text_fast(text), clean_text(text))
+
+    def test_random_corpus(self):
+        rng = random.Random(2024)
+        for _ in range(500):
+            text = random_text(rng, rng.randint(0, 400))
+            self.assertEqual(clean_text_fast(text), clean_text(text), repr(text))
+
+    def test_non_string_input(self):
+        for value in (None, 42, 3.5):
+            self.assertEqual(clean_text_fast(value), clean_text(value))
+
+
+class NumpyScorerTests(SimpleTestCase):
+    """The committed NumPy artifact scores like the sklearn pickles it was exported from."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.vectorizer = joblib.load(VECTORIZER_PATH)
+        cls.model = joblib.load(MODEL_PATH)
+        cls.scorer = NumpyReviewScorer(NUMPY_ARTIFACT_PATH)
+
+    def test_artifact_matches_pickles(self):
+        # Re-run export_review_model after changing the pickles
+        self.assertEqual(self.scorer.source_hashes, {
+            'vectorizer': file_sha256(VECTORIZER_PATH),
+            'model': file_sha256(MODEL_PATH),
+        })
+
+    def test_probabilities_match_sklearn(self):
+        rng = random.Random(2024)
+        texts = [clean_text_fast(text) for text in sample_texts(rng, list(self.vectorizer.vocabulary_), 300)]
+        texts += [clean_text_fast(text) for text in CleanTextTests.CASES]
+
+        expected = self.model.predict_proba(self.vectorizer.transform(texts))[:, 1]
+        actual = np.array([self.scorer.predict_proba_ai(text) for text in texts])
+        self.assertTrue(np.allclose(actual, expected, rtol=0, atol=1e-9), np.abs(actual - expected).max())
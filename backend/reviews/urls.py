@@ -1,4 +1,5 @@
 from django.urls import path
+from . import async_views
 from .views import (
     review_create, 
     branch_reviews, 
@@ -6,16 +7,19 @@ from .views import (
     my_review, 
     delete_my_review,
     check_text,
-    validate_all
+    validate_all,
+    review_search
 )
+from kcet_eduguide.async_api import read_view
 
 urlpatterns = [
     path('', review_create, name='review-create'),
+    path('search/', review_search, name='review-search'),
     path('check-text/', check_text, name='check-text'),
     path('validate-all/', validate_all, name='validate-all'),
     path('my-review/<str:unique_key>/', my_review, name='my-review'),
     path('my-review/<str:unique_key>/delete/', delete_my_review, name='delete-my-review'),
-    path('branches/<uuid:public_id>/', branch_reviews, name='branch-reviews'),
+    path('branches/<uuid:public_id>/', read_view(branch_reviews, async_views.branch_reviews), name='branch-reviews'),
     path('colleges/<uuid:public_id>/', college_reviews, name='college-reviews'),
 ]
 
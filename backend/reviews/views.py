@@ -2,12 +2,20 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from django.db.models import Avg
-from django.core.cache import cache
-from .models import CollegeReview
-from .serializers import CollegeReviewSerializer, CollegeReviewCreateSerializer
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from .models import CollegeReview, BranchRatingSummary, RATING_NAMES
+from .serializers import CollegeReviewSerializer, CollegeReviewCreateSerializer, BranchReviewSerializer
+from .pagination import BranchReviewCursorPagination
 from colleges.models import Branch
-from .review_checker import check_review, is_model_loaded
+from colleges.serializers import BranchSerializer
+from kcet_eduguide.db_routers import primary_reads
+from kcet_eduguide.ratelimit import rate_limit
+from .scoring_pool import score_reviews, scoring_available, ScoringUnavailable
+from .services import (
+    search_reviews,
+    review_snippet,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,6 +35,22 @@ REVIEW_FIELDS = {
 }
 
 
+def _average_ratings(sums, count):
+    """Build the avg_<name> dict from per-dimension rating sums and a review count."""
+    return {
+        f'avg_{name}': (sums[name] / count) if count else None
+        for name in RATING_NAMES
+    }
+
+
+def _get_rating_summary(branch):
+    """Branch rating summary (select_related-friendly); an empty one if none exists yet."""
+    try:
+        return branch.rating_summary
+    except BranchRatingSummary.DoesNotExist:
+        return BranchRatingSummary(branch=branch)
+
+
 def validate_review_texts(review_data):
     """
     Validate all review text fields using ML model.
@@ -41,7 +65,7 @@ def validate_review_texts(review_data):
             'ai_fields': [field_name, ...]  # Fields detected as AI
         }
     """
-    if not is_model_loaded():
+    if not scoring_available():
         logger.error("ML model not loaded, cannot validate reviews")
         # If model not loaded, fail closed - don't allow submission
         return {
@@ -53,8 +77,10 @@ def validate_review_texts(review_data):
     
     results = {}
     ai_fields = []
+    pending_fields = []
+    pending_texts = []
     
-    # Check each review text field
+    # Collect non-empty review text fields
     for field_name, display_name in REVIEW_FIELDS.items():
         text = review_data.get(field_name, '').strip()
         
@@ -63,18 +89,26 @@ def validate_review_texts(review_data):
             results[field_name] = 'HUMAN-WRITTEN'
             continue
         
-        try:
-            label, probability_ai = check_review(text)
-            results[field_name] = label
-            
-            if label == 'AI-GENERATED':
-                ai_fields.append(field_name)
-                logger.warning(f"AI-generated text detected in {field_name} (probability: {probability_ai:.3f})")
-        except Exception as e:
-            logger.error(f"Error validating {field_name}: {str(e)}", exc_info=True)
-            # On error, fail closed - don't allow submission
+        pending_fields.append(field_name)
+        pending_texts.append(text)
+    
+    # Score all fields in one batch (off the request thread when the pool is enabled)
+    try:
+        scores = score_reviews(pending_texts)
+    except Exception as e:
+        logger.error(f"Error validating review fields: {str(e)}", exc_info=True)
+        # On error, fail closed - don't allow submission
+        for field_name in pending_fields:
             results[field_name] = 'AI-GENERATED'
             ai_fields.append(field_name)
+        scores = []
+    
+    for field_name, (label, probability_ai) in zip(pending_fields, scores):
+        results[field_name] = label
+        
+        if label == 'AI-GENERATED':
+            ai_fields.append(field_name)
+            logger.warning(f"AI-generated text detected in {field_name} (probability: {probability_ai:.3f})")
     
     return {
         'results': results,
@@ -85,6 +119,7 @@ def validate_review_texts(review_data):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@rate_limit('check_text', '10/m', message='Rate limit exceeded. Please wait before checking again.')
 def check_text(request):
     """
     Check if a single text field is AI-generated or Human-written.
@@ -102,7 +137,7 @@ def check_text(request):
         "ai_probability": 0.23
     }
     """
-    if not is_model_loaded():
+    if not scoring_available():
         return Response(
             {'error': 'AI detection model not available'},
             status=status.HTTP_503_SERVICE_UNAVAILABLE
@@ -125,27 +160,20 @@ def check_text(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    # Rate limiting: 10 requests per minute per user
-    user_id = str(request.user.student_user_id)
-    cache_key = f'text_check_rate_limit_{user_id}'
-    request_count = cache.get(cache_key, 0)
-    
-    if request_count >= 10:
-        return Response(
-            {'error': 'Rate limit exceeded. Please wait before checking again.'},
-            status=status.HTTP_429_TOO_MANY_REQUESTS
-        )
-    
-    cache.set(cache_key, request_count + 1, 60)  # 60 seconds
-    
     try:
-        label, probability_ai = check_review(text)
+        label, probability_ai = score_reviews([text])[0]
         
         return Response({
             'field': field,
             'label': label,
             'ai_probability': round(probability_ai, 3)
         })
+    except ScoringUnavailable as e:
+        logger.warning(f"Text check unavailable: {str(e)}")
+        return Response(
+            {'error': 'AI detection is busy. Please try again shortly.'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
     except Exception as e:
         logger.error(f"Error checking text: {str(e)}", exc_info=True)
         return Response(
@@ -181,7 +209,7 @@ def validate_all(request):
         "can_submit": false
     }
     """
-    if not is_model_loaded():
+    if not scoring_available():
         return Response(
             {'error': 'AI detection model not available'},
             status=status.HTTP_503_SERVICE_UNAVAILABLE
@@ -274,31 +302,33 @@ def review_create(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    # Check if student already reviewed this branch
-    existing = CollegeReview.objects.filter(
-        student_user_id=student,
-        unique_key=branch
-    ).first()
-
-    if existing:
-        # Update existing review
-        for key, value in serializer.validated_data.items():
-            if key != 'unique_key':  # Don't update unique_key
-                setattr(existing, key, value)
-        existing.save()
+    with transaction.atomic():
+        # Check if student already reviewed this branch
+        existing = CollegeReview.objects.select_for_update().filter(
+            student_user_id=student,
+            unique_key=branch
+        ).first()
+
+        if existing:
+            # Update existing review (reviews.signals updates the rating
+            # summary and search index)
+            for key, value in serializer.validated_data.items():
+                if key != 'unique_key':  # Don't update unique_key
+                    setattr(existing, key, value)
+            existing.save()
+
+            return Response(
+                CollegeReviewSerializer(existing).data,
+                status=status.HTTP_200_OK
+            )
 
-        return Response(
-            CollegeReviewSerializer(existing).data,
-            status=status.HTTP_200_OK
+        # Create new review
+        review = CollegeReview.objects.create(
+            student_user_id=student,
+            unique_key=branch,
+            **{k: v for k, v in serializer.validated_data.items() if k != 'unique_key'}
         )
 
-    # Create new review
-    review = CollegeReview.objects.create(
-        student_user_id=student,
-        unique_key=branch,
-        **{k: v for k, v in serializer.validated_data.items() if k != 'unique_key'}
-    )
-
     return Response(
         CollegeReviewSerializer(review).data,
         status=status.HTTP_201_CREATED
@@ -307,6 +337,7 @@ def review_create(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@primary_reads()  # read back right after review_create
 def my_review(request, unique_key):
     """Get current user's review for a specific branch"""
     student = request.user
@@ -373,24 +404,34 @@ def delete_my_review(request, unique_key):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-    try:
-        review = CollegeReview.objects.get(
-            student_user_id=student,
-            unique_key=branch
-        )
-    except CollegeReview.DoesNotExist:
-        return Response({'error': 'Review not found'}, status=status.HTTP_404_NOT_FOUND)
+    with transaction.atomic():
+        try:
+            review = CollegeReview.objects.select_for_update().get(
+                student_user_id=student,
+                unique_key=branch
+            )
+        except CollegeReview.DoesNotExist:
+            return Response({'error': 'Review not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        review.delete()
 
-    review.delete()
     return Response(status=status.HTTP_204_NO_CONTENT)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def branch_reviews(request, public_id):
-    """Get all reviews for a specific branch"""
+    """
+    Get reviews for a specific branch, newest first, cursor paginated.
+    
+    GET /api/reviews/branches/<public_id>/?cursor=<cursor>&page_size=<n>
+    
+    The branch is returned once at the top level; follow `next` for more reviews.
+    """
     try:
-        branch = Branch.objects.get(public_id=public_id)
+        branch = Branch.objects.select_related(
+            'college', 'cluster', 'rating_summary'
+        ).get(public_id=public_id)
     except Branch.DoesNotExist:
         return Response(
             {'error': 'Branch not found'},
@@ -399,28 +440,22 @@ def branch_reviews(request, public_id):
     
     reviews = CollegeReview.objects.filter(
         unique_key=branch
-    ).select_related('student_user_id', 'unique_key__college', 'unique_key__cluster')
-    
-    serializer = CollegeReviewSerializer(reviews, many=True)
-    
-    # Calculate average ratings
-    avg_ratings = reviews.aggregate(
-        avg_teaching=Avg('teaching_rating'),
-        avg_courses=Avg('courses_rating'),
-        avg_library=Avg('library_rating'),
-        avg_research=Avg('research_rating'),
-        avg_internship=Avg('internship_rating'),
-        avg_infrastructure=Avg('infrastructure_rating'),
-        avg_administration=Avg('administration_rating'),
-        avg_extracurricular=Avg('extracurricular_rating'),
-        avg_safety=Avg('safety_rating'),
-        avg_placement=Avg('placement_rating'),
-    )
+    ).select_related('student_user_id')
+    
+    paginator = BranchReviewCursorPagination()
+    page = paginator.paginate_queryset(reviews, request)
+    serializer = BranchReviewSerializer(page, many=True)
+    
+    # Average ratings come from the materialized summary (no aggregate query)
+    summary = _get_rating_summary(branch)
     
     return Response({
+        'branch': BranchSerializer(branch).data,
         'reviews': serializer.data,
-        'average_ratings': avg_ratings,
-        'total_reviews': reviews.count(),
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
+        'average_ratings': summary.average_ratings(),
+        'total_reviews': summary.review_count,
     })
 
 
@@ -438,53 +473,116 @@ def college_reviews(request, public_id):
             status=status.HTTP_404_NOT_FOUND
         )
     
-    branches = Branch.objects.filter(college=college)
-    reviews = CollegeReview.objects.filter(
-        unique_key__in=branches
-    ).select_related('student_user_id', 'unique_key')
+    # One query over the materialized per-branch summaries.
+    # Sums (not averages) so the overall college average can be derived exactly.
+    summaries = BranchRatingSummary.objects.filter(
+        branch__college=college,
+        review_count__gt=0
+    ).select_related('branch').order_by('branch_id')
     
-    # Aggregate by branch
     branch_reviews = {}
-    for branch in branches:
-        branch_review_list = reviews.filter(unique_key=branch)
-        if branch_review_list.exists():
-            avg_ratings = branch_review_list.aggregate(
-                avg_teaching=Avg('teaching_rating'),
-                avg_courses=Avg('courses_rating'),
-                avg_library=Avg('library_rating'),
-                avg_research=Avg('research_rating'),
-                avg_internship=Avg('internship_rating'),
-                avg_infrastructure=Avg('infrastructure_rating'),
-                avg_administration=Avg('administration_rating'),
-                avg_extracurricular=Avg('extracurricular_rating'),
-                avg_safety=Avg('safety_rating'),
-                avg_placement=Avg('placement_rating'),
-            )
-            branch_reviews[branch.unique_key] = {
-                'branch_name': branch.branch_name,
-                'average_ratings': avg_ratings,
-                'total_reviews': branch_review_list.count(),
-            }
-    
-    # Overall college averages
-    overall_avg = reviews.aggregate(
-        avg_teaching=Avg('teaching_rating'),
-        avg_courses=Avg('courses_rating'),
-        avg_library=Avg('library_rating'),
-        avg_research=Avg('research_rating'),
-        avg_internship=Avg('internship_rating'),
-        avg_infrastructure=Avg('infrastructure_rating'),
-        avg_administration=Avg('administration_rating'),
-        avg_extracurricular=Avg('extracurricular_rating'),
-        avg_safety=Avg('safety_rating'),
-        avg_placement=Avg('placement_rating'),
-    )
+    overall_count = 0
+    overall_sums = dict.fromkeys(RATING_NAMES, 0)
+    for summary in summaries:
+        branch_reviews[summary.branch_id] = {
+            'branch_name': summary.branch.branch_name,
+            'average_ratings': summary.average_ratings(),
+            'total_reviews': summary.review_count,
+        }
+        overall_count += summary.review_count
+        for name, total in summary.rating_sums().items():
+            overall_sums[name] += total
     
     return Response({
         'college_id': str(college.public_id),
         'college_name': college.college_name,
         'branch_reviews': branch_reviews,
-        'overall_average_ratings': overall_avg,
-        'total_reviews': reviews.count(),
+        'overall_average_ratings': _average_ratings(overall_sums, overall_count),
+        'total_reviews': overall_count,
     })
 
+
+REVIEW_SEARCH_MAX_RESULTS = 50
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@rate_limit('review_search', '60/m', key='ip')
+def review_search(request):
+    """
+    Full-text search over review texts, ranked, with snippets.
+    
+    GET /api/reviews/search/?q=<terms>&college=<public_id>&branch=<public_id>&limit=<n>
+    
+    Uses the review_search_terms index, so only matching index rows are read.
+    """
+    from colleges.models import College
+    
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return Response(
+            {'error': 'Query parameter q is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        limit = min(int(request.query_params.get('limit', 20)), REVIEW_SEARCH_MAX_RESULTS)
+    except ValueError:
+        return Response(
+            {'error': 'limit must be an integer'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if limit < 1:
+        limit = 20
+    
+    college = branch = None
+    try:
+        if request.query_params.get('branch'):
+            branch = Branch.objects.get(public_id=request.query_params['branch'])
+        elif request.query_params.get('college'):
+            college = College.objects.get(public_id=request.query_params['college'])
+    except (Branch.DoesNotExist, College.DoesNotExist):
+        return Response(
+            {'error': 'College or branch not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except DjangoValidationError:
+        return Response(
+            {'error': 'Invalid college or branch id'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    terms, matches = search_reviews(query, college=college, branch=branch, limit=limit)
+    
+    results = []
+    for match in matches:
+        review = match['review']
+        results.append({
+            'review_id': review.review_id,
+            'review_date': review.review_date,
+            'branch': {
+                'public_id': review.unique_key.public_id,
+                'branch_name': review.unique_key.branch_name,
+            },
+            'college': {
+                'public_id': review.unique_key.college.public_id,
+                'college_name': review.unique_key.college.college_name,
+            },
+            'score': match['score'],
+            'matched_terms': match['matched_terms'],
+            'snippets': [
+                {
+                    'field': f'{name}_review',
+                    'label': REVIEW_FIELDS[f'{name}_review'],
+                    'rating': getattr(review, f'{name}_rating'),
+                    'text': review_snippet(getattr(review, f'{name}_review'), terms),
+                }
+                for name in match['fields']
+            ],
+        })
+    
+    return Response({
+        'query': query,
+        'terms': terms,
+        'results': results,
+    })
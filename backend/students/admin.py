@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Student, StudentCounter
+from .models import Student, StudentCounter, StudentVerification
 
 
 @admin.register(Student)
@@ -14,3 +14,11 @@ class StudentAdmin(admin.ModelAdmin):
 class StudentCounterAdmin(admin.ModelAdmin):
     list_display = ('id',)
 
+
+
+@admin.register(StudentVerification)
+class StudentVerificationAdmin(admin.ModelAdmin):
+    list_display = ('verification_id', 'usn', 'student_name', 'college_name', 'verified', 'created_at')
+    search_fields = ('usn', 'student_name', 'college_name')
+    list_filter = ('verified', 'created_at')
+    readonly_fields = ('verification_id', 'id_image_file', 'original_image_file', 'created_at')
@@ -5,3 +5,6 @@ class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'students'
 
+    def ready(self):
+        # Register cache invalidation receivers
+        from . import signals  # noqa: F401
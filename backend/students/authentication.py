@@ -4,12 +4,61 @@ Custom JWT authentication for Student model
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
 from rest_framework import exceptions
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
 from .models import Student
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _student_cache():
+    return caches[getattr(settings, 'AUTH_USER_CACHE', 'default')]
+
+
+def student_cache_key(student_user_id):
+    return f'auth:student:{student_user_id}'
+
+
+def invalidate_student_cache(student_user_id):
+    """Drop a cached student so the next request reloads it from the database."""
+    if student_user_id:
+        _student_cache().delete(student_cache_key(student_user_id))
+
+
+def _cache_is_shared(cache):
+    # Per-process caches would let other workers keep serving a student after
+    # the invalidation signal cleared this process's copy
+    return not isinstance(cache, (LocMemCache, DummyCache))
+
+
+def get_active_student(student_user_id):
+    """
+    Active student for an authenticated request, cached for AUTH_USER_CACHE_TIMEOUT.
+    
+    The branch is loaded alongside, so a cache miss is one small query. Raises Student.DoesNotExist for unknown or
+    inactive students (misses are not cached). Caching only happens with a shared cache backend (REDIS_URL), where
+    invalidation reaches every worker.
+    """
+    cache = _student_cache()
+    timeout = getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 0) if _cache_is_shared(cache) else 0
+    key = student_cache_key(student_user_id)
+    
+    if timeout:
+        user = cache.get(key)
+        if user is not None:
+            return user
+    
+    user = Student.objects.select_related('unique_key').get(
+        student_user_id=student_user_id, is_active=True
+    )
+    if timeout:
+        cache.set(key, user, timeout)
+    return user
+
+
 class StudentJWTAuthentication(JWTAuthentication):
     def get_user(self, validated_token):
         """
@@ -24,7 +73,7 @@ class StudentJWTAuthentication(JWTAuthentication):
             
             # Look up student using student_user_id as primary key
             try:
-                user = Student.objects.get(student_user_id=user_id, is_active=True)
+                user = get_active_student(user_id)
                 logger.debug('Successfully authenticated student: %s', user_id)
                 return user
             except Student.DoesNotExist:
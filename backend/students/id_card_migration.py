@@ -0,0 +1,91 @@
+"""
+Migrating legacy ID card blobs into the id_cards storage.
+
+ID card images used to be stored in LONGBLOB columns (student.id_card_image
+and student_verification.id_image). Dropping those columns in the same
+migration that adds the path columns would lose every image, so databases
+that still have them are upgraded in three migrations, written by
+`python manage.py make_id_card_migrations` on top of the local students
+migrations (migration files are not versioned in this repository):
+
+  1. add the path columns next to the blob columns
+  2. copy each blob into the storage and set its path (copy_legacy_id_card_images)
+  3. remove the blob columns
+
+Images are stored under their SHA-256 (students.storage.store_image), so
+duplicates across rows and tables are stored once and the copy is safe to
+re-run; rows that already have a path are skipped.
+"""
+from django.apps import apps
+from django.db import migrations
+
+from .storage import store_image
+
+# (model name, table, primary key, legacy blob field/column, path field, path column)
+LEGACY_IMAGE_FIELDS = [
+    ('student', 'student', 'student_user_id', 'id_card_image', 'id_card_file', 'id_card_path'),
+    ('studentverification', 'student_verification', 'verification_id', 'id_image', 'id_image_file', 'id_image_path'),
+]
+
+
+def add_path_field(model_name, file_field):
+    """
+    Migration 1 operation adding a path field as the model defines it.
+
+    Existing rows get an empty path (NULL where the field allows it) until
+    migration 2 fills it in.
+    """
+    field = apps.get_model('students', model_name)._meta.get_field(file_field).clone()
+    if field.null:
+        return migrations.AddField(model_name=model_name, name=file_field, field=field)
+    field.default = ''
+    return migrations.AddField(model_name=model_name, name=file_field, field=field, preserve_default=False)
+
+
+def table_columns(connection, table):
+    with connection.cursor() as cursor:
+        return {
+            column.name
+            for column in connection.introspection.get_table_description(cursor, table)
+        }
+
+
+def move_legacy_images(connection, log=None):
+    """
+    Store the legacy blobs of rows without a path and link them.
+
+    Tables that lack either column are skipped.
+
+    Returns:
+        dict: {table: rows linked}
+    """
+    moved = {}
+    for _, table, pk, blob_column, _, path_column in LEGACY_IMAGE_FIELDS:
+        columns = table_columns(connection, table)
+        if blob_column not in columns or path_column not in columns:
+            if log:
+                log(f'{table}: no {blob_column} and {path_column} columns to move between')
+            continue
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT {pk} FROM {table} WHERE {blob_column} IS NOT NULL '
+                f"AND ({path_column} IS NULL OR {path_column} = '')"
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+
+        for row_id in ids:
+            # One blob in memory at a time
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT {blob_column} FROM {table} WHERE {pk} = %s', [row_id])
+                name = store_image(bytes(cursor.fetchone()[0]))
+                cursor.execute(f'UPDATE {table} SET {path_column} = %s WHERE {pk} = %s', [name, row_id])
+        moved[table] = len(ids)
+        if log:
+            log(f'{table}: moved {len(ids)} images')
+    return moved
+
+
+def copy_legacy_id_card_images(apps, schema_editor):
+    """RunPython operation of migration 2."""
+    move_legacy_images(schema_editor.connection)
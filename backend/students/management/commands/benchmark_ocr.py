@@ -0,0 +1,192 @@
+"""
+Benchmark ID card OCR with and without preprocessing on synthetic card photos.
+
+Generates a seeded corpus of phone-photo-like images (a white ID card with the
+college, student name and USN printed on it, tilted and placed on a noisy
+background) and for each OCR mode reports the time spent preparing the image,
+the Tesseract time, the size of the image handed to Tesseract and the fuzzy
+match scores used by verify_student_id. A third 'variants' mode runs the
+parallel multi-variant OCR (score_ocr_variants) and reports which variant won.
+
+Real ID card photos can be used instead with --cards DIR, where DIR holds
+the images and a labels.csv with columns file,college,name,usn. Run that on
+a sample of real cards before turning on OCR_PREPROCESS in production.
+
+Usage:
+    python manage.py benchmark_ocr
+    python manage.py benchmark_ocr --images 20 --width 4000 --height 3000 --max-tilt 8
+    python manage.py benchmark_ocr --cards /path/to/id-cards
+
+If Tesseract is not installed only the preprocessing side is measured.
+"""
+import csv
+import io
+import os
+import random
+import statistics
+import time
+
+import cv2
+import numpy as np
+import pytesseract
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from students.verification_utils import (
+    extract_text, fuzzy, preprocess_for_ocr, score_ocr_variants,
+)
+
+SAMPLES = [
+    ('RV College of Engineering', 'Ananya Sharma', '1RV21CS001'),
+    ('BMS College of Engineering', 'Rahul Gowda', '1BM22EC045'),
+    ('PES University', 'Meera Nair', 'PES1UG21CS312'),
+    ('Dayananda Sagar College of Engineering', 'Karthik Rao', '1DS20ME017'),
+    ('MS Ramaiah Institute of Technology', 'Divya Hegde', '1MS21IS088'),
+]
+
+
+def synthetic_card_photo(rng, college, name, usn, width, height, max_tilt):
+    """BGR photo of a tilted ID card on a noisy background."""
+    photo = np.empty((height, width, 3), np.uint8)
+    photo[:] = rng.integers(60, 120)
+    noise = rng.normal(0, 10, (height, width, 1)).astype(np.int16)
+    photo = np.clip(photo.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+    card_w = int(width * rng.uniform(0.55, 0.7))
+    card_h = int(card_w / 1.586)  # ID-1 aspect ratio
+    card = np.full((card_h, card_w, 3), 235, np.uint8)
+    font_scale = card_w / 900
+    thickness = max(2, int(font_scale * 2))
+    for i, line in enumerate([college, f'Name: {name}', f'USN: {usn}', 'Valid upto 2026']):
+        y = int(card_h * (0.2 + i * 0.2))
+        cv2.putText(card, line, (int(card_w * 0.06), y), cv2.FONT_HERSHEY_SIMPLEX,
+                    font_scale, (20, 20, 20), thickness, cv2.LINE_AA)
+
+    # Paste the card, then tilt it about its centre
+    cx = int(width / 2 + rng.uniform(-0.1, 0.1) * width)
+    cy = int(height / 2 + rng.uniform(-0.1, 0.1) * height)
+    mask = np.zeros((height, width), np.uint8)
+    x0, y0 = cx - card_w // 2, cy - card_h // 2
+    layer = np.zeros_like(photo)
+    layer[y0:y0 + card_h, x0:x0 + card_w] = card
+    mask[y0:y0 + card_h, x0:x0 + card_w] = 255
+
+    matrix = cv2.getRotationMatrix2D((cx, cy), rng.uniform(-max_tilt, max_tilt), 1.0)
+    layer = cv2.warpAffine(layer, matrix, (width, height))
+    mask = cv2.warpAffine(mask, matrix, (width, height))
+    photo[mask > 127] = layer[mask > 127]
+    return photo
+
+
+class Command(BaseCommand):
+    help = 'Benchmark OCR time and match scores with and without ID card preprocessing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--images', type=int, default=10, help='Number of synthetic photos')
+        parser.add_argument('--width', type=int, default=4000, help='Photo width (4000x3000 = 12MP)')
+        parser.add_argument('--height', type=int, default=3000, help='Photo height')
+        parser.add_argument('--max-tilt', type=float, default=8.0, help='Maximum card tilt in degrees')
+        parser.add_argument('--seed', type=int, default=2024, help='Random seed')
+        parser.add_argument('--cards', help='Directory of real ID card photos with a labels.csv')
+
+    def handle(self, *args, **options):
+        if options['cards']:
+            corpus = self._load_cards(options['cards'])
+            description = f"{len(corpus)} ID card photos from {options['cards']}"
+        else:
+            corpus = self._synthetic_corpus(options)
+            description = f"{len(corpus)} photos {options['width']}x{options['height']}"
+
+        try:
+            pytesseract.get_tesseract_version()
+            ocr_available = True
+        except (pytesseract.TesseractNotFoundError, OSError):
+            ocr_available = False
+            self.stdout.write(self.style.WARNING(
+                'Tesseract not found; measuring preprocessing only'
+            ))
+
+        self.stdout.write(f"{description}, DPI {settings.OCR_PREPROCESS['DPI']}")
+        for label, preprocess in (('full-res', False), ('preprocessed', True)):
+            self._run(label, preprocess, corpus, ocr_available)
+        if ocr_available:
+            self._run_variants(corpus)
+
+    def _synthetic_corpus(self, options):
+        rng = np.random.default_rng(options['seed'])
+        picker = random.Random(options['seed'])
+        corpus = []
+        for _ in range(options['images']):
+            college, name, usn = picker.choice(SAMPLES)
+            photo = synthetic_card_photo(
+                rng, college, name, usn, options['width'], options['height'], options['max_tilt']
+            )
+            encoded = cv2.imencode('.jpg', photo, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+            corpus.append((encoded, college, name, usn))
+        return corpus
+
+    def _load_cards(self, directory):
+        labels = os.path.join(directory, 'labels.csv')
+        if not os.path.exists(labels):
+            raise CommandError(f'{labels} not found (columns: file,college,name,usn)')
+        corpus = []
+        with open(labels, newline='', encoding='utf-8') as fh:
+            for row in csv.DictReader(fh):
+                with open(os.path.join(directory, row['file']), 'rb') as image:
+                    corpus.append((image.read(), row['college'], row['name'], row['usn']))
+        if not corpus:
+            raise CommandError(f'{labels} lists no images')
+        return corpus
+
+    def _prepare(self, data, preprocess):
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        if preprocess:
+            gray = preprocess_for_ocr(gray, dpi=settings.OCR_PREPROCESS['DPI'])
+        return cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)[1]
+
+    def _run(self, label, preprocess, corpus, ocr_available):
+        prepare_times, ocr_times, pixels, scores, verified = [], [], [], [], 0
+        for data, college, name, usn in corpus:
+            start = time.perf_counter()
+            prepared = self._prepare(data, preprocess)
+            prepare_times.append(time.perf_counter() - start)
+            pixels.append(prepared.size)
+
+            if not ocr_available:
+                continue
+            start = time.perf_counter()
+            text = extract_text(io.BytesIO(data), preprocess=preprocess)
+            ocr_times.append(time.perf_counter() - start)
+            result = (fuzzy(college, text), fuzzy(name, text), fuzzy(usn, text))
+            scores.append(result)
+            verified += result[0] >= 75 and result[1] >= 75 and result[2] >= 90
+
+        line = (
+            f'{label:<13} prepare {statistics.mean(prepare_times) * 1000:7.1f} ms  '
+            f'OCR input {statistics.mean(pixels) / 1e6:5.2f} MP'
+        )
+        if ocr_available:
+            line += (
+                f'  extract_text {statistics.mean(ocr_times) * 1000:7.1f} ms  '
+                f'scores college/name/usn '
+                + '/'.join(f'{statistics.mean(s[i] for s in scores):.0f}' for i in range(3))
+                + f'  verified {verified}/{len(corpus)}'
+            )
+        self.stdout.write(line)
+
+    def _run_variants(self, corpus):
+        times, winners, verified = [], {}, 0
+        for data, college, name, usn in corpus:
+            start = time.perf_counter()
+            result = score_ocr_variants(data, college, name, usn)
+            times.append(time.perf_counter() - start)
+            winners[result['ocr_variant']] = winners.get(result['ocr_variant'], 0) + 1
+            verified += result['verified']
+
+        self.stdout.write(
+            f"{'variants':<13} total {statistics.mean(times) * 1000:7.1f} ms  "
+            f"verified {verified}/{len(corpus)}  "
+            f"winners {', '.join(f'{k}={v}' for k, v in sorted(winners.items()))}  "
+            f"(workers {settings.OCR_VARIANTS['WORKERS']})"
+        )
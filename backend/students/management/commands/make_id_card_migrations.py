@@ -0,0 +1,95 @@
+"""
+Write the migrations that move legacy ID card blobs into the id_cards storage.
+
+Migration files are generated locally (they are not versioned), so on a
+database created before ID card images moved out of the student and
+student_verification tables, a plain makemigrations would drop the blob
+columns in the same step that adds the path columns and lose every image.
+Run this first; it adds three migrations after the latest local students
+migration (see students.id_card_migration):
+
+    python manage.py make_id_card_migrations
+    python manage.py makemigrations
+    python manage.py migrate
+
+Does nothing when the local migrations have no blob fields (new installs,
+or already migrated).
+"""
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, migrations
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.writer import MigrationWriter
+
+from students.id_card_migration import LEGACY_IMAGE_FIELDS, add_path_field, copy_legacy_id_card_images
+
+APP_LABEL = 'students'
+
+
+class Command(BaseCommand):
+    help = 'Write add-path / copy-blobs / remove-blobs migrations for legacy ID card images'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Show the migrations without writing them')
+
+    def handle(self, *args, **options):
+        loader = MigrationLoader(connection, ignore_no_migrations=True)
+        leaves = loader.graph.leaf_nodes(APP_LABEL)
+        if not leaves:
+            self.stdout.write('No students migrations yet; makemigrations creates the current schema')
+            return
+        if len(leaves) > 1:
+            raise CommandError(f'Conflicting students migrations {leaves}; run makemigrations --merge first')
+
+        state = loader.project_state(leaves[0])
+        legacy = [
+            (model_name, blob_field, file_field)
+            for model_name, _, _, blob_field, file_field, _ in LEGACY_IMAGE_FIELDS
+            if blob_field in state.models[APP_LABEL, model_name].fields
+        ]
+        if not legacy:
+            self.stdout.write('Local migrations have no legacy ID card blob fields; nothing to do')
+            return
+
+        add = [
+            add_path_field(model_name, file_field)
+            for model_name, _, file_field in legacy
+            if file_field not in state.models[APP_LABEL, model_name].fields
+        ]
+        steps = [
+            ('id_card_paths', add),
+            ('id_card_copy_images', [
+                migrations.RunPython(copy_legacy_id_card_images, migrations.RunPython.noop),
+            ]),
+            ('id_card_remove_blobs', [
+                migrations.RemoveField(model_name=model_name, name=blob_field)
+                for model_name, blob_field, _ in legacy
+            ]),
+        ]
+
+        number = max(
+            MigrationAutodetector.parse_number(name) or 0
+            for app_label, name in loader.disk_migrations if app_label == APP_LABEL
+        )
+        dependency = leaves[0]
+        for suffix, operations in steps:
+            if not operations:
+                continue
+            number += 1
+            name = f'{number:04d}_{suffix}'
+            migration = migrations.Migration(name, APP_LABEL)
+            migration.dependencies = [dependency]
+            migration.operations = operations
+            dependency = (APP_LABEL, name)
+
+            writer = MigrationWriter(migration)
+            if options['dry_run']:
+                self.stdout.write(writer.as_string())
+                continue
+            if os.path.exists(writer.path):
+                raise CommandError(f'{writer.path} already exists')
+            with open(writer.path, 'w', encoding='utf-8') as fh:
+                fh.write(writer.as_string())
+            self.stdout.write(self.style.SUCCESS(f'Wrote {writer.path}'))
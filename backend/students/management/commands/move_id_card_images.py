@@ -0,0 +1,24 @@
+"""
+Re-run the copy of legacy ID card blobs into the id_cards storage.
+
+The copy normally happens in the data migration written by
+make_id_card_migrations. This command repeats it while a table still has
+both its blob and path columns, e.g. after an interrupted migration or when
+checking a database before the blob columns are removed:
+
+    python manage.py move_id_card_images
+
+Images are stored under their SHA-256, so re-running is safe; rows that
+already have a path are skipped.
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from students.id_card_migration import move_legacy_images
+
+
+class Command(BaseCommand):
+    help = 'Copy legacy ID card image blobs into the id_cards storage (optional re-run of the data migration)'
+
+    def handle(self, *args, **options):
+        move_legacy_images(connection, log=self.stdout.write)
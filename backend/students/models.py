@@ -1,8 +1,11 @@
+import uuid
+
 from django.db import models
 from django.db.models import Max
 from django.utils import timezone
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from colleges.models import Branch
+from .storage import id_card_storage
 
 
 class StudentCounter(models.Model):
@@ -43,7 +46,15 @@ class Student(AbstractBaseUser, PermissionsMixin):
     profile_completed = models.BooleanField(default=False)
     usn = models.CharField(max_length=50, null=True, blank=True, unique=True)
     is_verified_student = models.BooleanField(default=False)
-    id_card_image = models.BinaryField(null=True, blank=True)  # Store image as binary data in MySQL LONGBLOB
+    # Content-addressed path of the ID card audit copy in the 'id_cards'
+    # storage (see students.storage); never loaded with the row
+    id_card_file = models.FileField(
+        storage=id_card_storage,
+        max_length=255,
+        null=True,
+        blank=True,
+        db_column='id_card_path'
+    )
 
     USERNAME_FIELD = 'email_id'
     REQUIRED_FIELDS = ['phone_number', 'type_of_student']
@@ -51,6 +62,13 @@ class Student(AbstractBaseUser, PermissionsMixin):
     class Meta:
         db_table = 'student'
         managed = True
+        indexes = [
+            # Seniors of a branch (meetings.views.branch_students)
+            models.Index(
+                fields=['unique_key', 'type_of_student', 'is_active'],
+                name='student_branch_type_idx'
+            ),
+        ]
     
     # Add id property for compatibility with JWT and other Django features
     @property
@@ -111,13 +129,75 @@ class StudentVerification(models.Model):
     college_name = models.CharField(max_length=255)
     student_name = models.CharField(max_length=255)
     usn = models.CharField(max_length=50)
-    id_image = models.BinaryField()  # Store image as binary data in MySQL
+    # Downscaled audit copy, in the same content-addressed storage as
+    # Student.id_card_file so a verified registration shares one file
+    id_image_file = models.FileField(
+        storage=id_card_storage,
+        max_length=255,
+        db_column='id_image_path'
+    )
+    # Original upload, only kept when verification failed
+    original_image_file = models.FileField(
+        storage=id_card_storage,
+        max_length=255,
+        null=True,
+        blank=True,
+        db_column='original_image_path'
+    )
+    # SHA-256 of the uploaded image, so a registration can prove it uploads
+    # the same image this record verified
+    image_sha256 = models.CharField(max_length=64, blank=True)
     college_score = models.FloatField()
     name_score = models.FloatField()
     usn_score = models.FloatField()
     verified = models.BooleanField(default=False)
+    # Set when a registration used this record instead of running OCR again
+    redeemed_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         db_table = 'student_verification'
         managed = True
+
+
+class VerificationJob(models.Model):
+    """
+    Asynchronous ID verification request (see students.verification_jobs).
+    
+    Created when an ID image is submitted; a worker runs the OCR and links the
+    resulting StudentVerification record.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    job_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    college_name = models.CharField(max_length=255)
+    student_name = models.CharField(max_length=255)
+    usn = models.CharField(max_length=50)
+    email = models.EmailField(max_length=100, blank=True)
+    verification = models.ForeignKey(
+        StudentVerification,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='verification_id'
+    )
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'verification_job'
+        managed = True
+
+    def __str__(self):
+        return f"Verification job {self.job_id} ({self.status})"
@@ -57,6 +57,13 @@ class StudentSerializer(serializers.ModelSerializer):
                     })
         return super().validate(attrs)
 
+    def update(self, instance, validated_data):
+        """Write only the submitted columns, so concurrent changes to others are kept."""
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
 
 class StudentRegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=8)
@@ -336,13 +343,15 @@ class StudyingStudentRegisterSerializer(serializers.ModelSerializer):
         required=True
     )
     id_card_image = serializers.ImageField(required=True, write_only=True)
+    # Optional token from verify_student; skips re-running OCR on the same image
+    verification_token = serializers.CharField(required=False, write_only=True, allow_blank=True)
 
     class Meta:
         model = Student
         fields = [
             'name', 'email_id', 'phone_number', 'password', 'password_confirm',
             'college_code', 'unique_key', 'year_of_starting', 'usn', 'category',
-            'id_card_image'
+            'id_card_image', 'verification_token'
         ]
 
     def validate_email_id(self, value):
@@ -0,0 +1,22 @@
+"""
+Keep the authenticated-student cache consistent with the student table.
+
+Any save (profile update, password change, deactivation, verification) or
+delete of a Student drops its cached copy. The entry is dropped again once the
+transaction commits, so a request that re-cached the old row mid-transaction
+does not keep serving it.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_student_cache
+from .models import Student
+
+
+@receiver(post_save, sender=Student, dispatch_uid='students_invalidate_cache_on_save')
+@receiver(post_delete, sender=Student, dispatch_uid='students_invalidate_cache_on_delete')
+def invalidate_cached_student(sender, instance, **kwargs):
+    student_user_id = instance.student_user_id
+    invalidate_student_cache(student_user_id)
+    transaction.on_commit(lambda: invalidate_student_cache(student_user_id))
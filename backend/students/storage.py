@@ -0,0 +1,162 @@
+"""
+Content-addressed storage for student ID card images.
+
+Images are kept out of the database: models store only a path in the
+'id_cards' storage (settings.STORAGES), which is a private local directory by
+default and can be swapped for an object store without code changes.
+
+Paths are derived from the SHA-256 of the image bytes, so the same upload
+referenced by a verification record and a student (or verified twice) is
+stored once. Stored images are never rewritten or deleted through a model,
+since other rows may reference the same content.
+
+Uploads are kept as a downscaled, recompressed audit copy
+(settings.ID_CARD_AUDIT_IMAGE); the original upload is only kept when
+verification fails, for manual review.
+"""
+import hashlib
+import io
+import logging
+import math
+import mmap
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+
+def id_card_storage():
+    return storages['id_cards']
+
+
+@contextmanager
+def upload_buffer(uploaded_file):
+    """
+    Read-only buffer over an uploaded file's content, without copying it.
+
+    Uploads Django spooled to disk (TemporaryUploadedFile, above
+    FILE_UPLOAD_MAX_MEMORY_SIZE) are memory-mapped; in-memory uploads expose
+    their BytesIO buffer. Anything else is read into bytes. The buffer is only
+    valid inside the with block - copy it (bytes(...)) to keep it longer.
+    """
+    file = getattr(uploaded_file, 'file', uploaded_file)
+    buffer = None
+    try:
+        if hasattr(uploaded_file, 'temporary_file_path') and uploaded_file.size:
+            file.flush()
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        elif isinstance(file, io.BytesIO):
+            buffer = file.getbuffer()
+        else:
+            uploaded_file.seek(0)
+            yield uploaded_file.read()
+            return
+        yield buffer
+    finally:
+        if buffer is not None:
+            try:
+                if isinstance(buffer, mmap.mmap):
+                    buffer.close()
+                else:
+                    buffer.release()
+            except BufferError:
+                # Still exported (e.g. an array kept alive by a traceback);
+                # released with its last reference instead
+                pass
+
+
+def guess_extension(data):
+    """File extension from the image magic bytes ('' if unrecognised)."""
+    if data[:3] == b'\xff\xd8\xff':
+        return '.jpg'
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return '.png'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return '.webp'
+    return ''
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def image_name(data):
+    """Storage path for image bytes: sha256/<first two hex digits>/<digest><ext>."""
+    digest = content_hash(data)
+    return f'sha256/{digest[:2]}/{digest}{guess_extension(data)}'
+
+
+def store_image(data):
+    """
+    Store image bytes once and return their storage path.
+
+    Args:
+        data (bytes): Image content
+
+    Returns:
+        str: Path to assign to an id_cards FileField
+    """
+    storage = id_card_storage()
+    name = image_name(data)
+    if not storage.exists(name):
+        saved = storage.save(name, ContentFile(data))
+        if saved != name:
+            # A concurrent request stored the same content first and the
+            # storage picked an alternative name; keep the canonical copy.
+            storage.delete(saved)
+    return name
+
+
+def audit_image(data):
+    """
+    Downscaled, recompressed copy of an uploaded image for audit viewing.
+
+    The longest side is limited to ID_CARD_AUDIT_IMAGE['MAX_SIDE'] and the image
+    is re-encoded as WEBP or JPEG. Encoding is deterministic, so the same upload
+    always produces the same copy (and the same content address).
+
+    Returns:
+        bytes: Encoded copy, or the original bytes if it cannot be decoded or
+        the copy would not be smaller
+    """
+    options = settings.ID_CARD_AUDIT_IMAGE
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            max_side = options['MAX_SIDE']
+            scale = min(1.0, max_side / max(img.size))
+            # Let the JPEG decoder downscale by a power of two while decoding
+            img.draft('RGB', (math.ceil(img.width * scale), math.ceil(img.height * scale)))
+            img = ImageOps.exif_transpose(img)
+            if img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+            img.thumbnail((max_side, max_side), Image.LANCZOS, reducing_gap=2.0)
+
+            output = io.BytesIO()
+            # method=2 encodes WEBP ~3x faster than the default for ~the same size
+            img.save(output, format=options['FORMAT'], quality=options['QUALITY'], method=2)
+    except (OSError, ValueError) as e:
+        logger.warning('Could not build audit copy of ID image, keeping original: %s', e)
+        return data
+
+    encoded = output.getvalue()
+    return encoded if len(encoded) < len(data) else data
+
+
+def store_verification_images(data, verified):
+    """
+    Store the images kept for a verification attempt.
+
+    Args:
+        data (bytes): Uploaded image
+        verified (bool): Whether verification passed
+
+    Returns:
+        tuple: (audit copy path, original path or None when verified)
+    """
+    audit_path = store_image(audit_image(data))
+    original_path = None if verified else store_image(data)
+    return audit_path, original_path
@@ -0,0 +1,174 @@
+import mmap
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import cv2
+import numpy as np
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from . import verification_jobs, verification_utils
+from .models import StudentVerification, VerificationJob
+
+
+def _card_png():
+    image = np.full((200, 320), 255, np.uint8)
+    cv2.putText(image, 'RVCE', (20, 100), cv2.FONT_HERSHEY_SIMPLEX, 2, 0, 3)
+    return cv2.imencode('.png', image)[1].tobytes()
+
+
+@override_settings(OCR_PREPROCESS={'ENABLED': False, 'DPI': 300})
+class ImageBufferTests(SimpleTestCase):
+    """Uploaded images reach the decoder without being copied."""
+
+    def decoded_buffers(self, image):
+        seen = []
+        frombuffer = np.frombuffer
+
+        def spy(buffer, *args, **kwargs):
+            seen.append(buffer)
+            return frombuffer(buffer, *args, **kwargs)
+
+        with mock.patch.object(verification_utils.np, 'frombuffer', spy), \
+                mock.patch.object(verification_utils.pytesseract, 'image_to_string', return_value=''):
+            verification_utils.extract_text(verification_utils._image_data(image))
+        return seen
+
+    def assertDecodedInPlace(self, buffer):
+        seen = self.decoded_buffers(buffer)
+        self.assertEqual(len(seen), 1)
+        self.assertIs(seen[0], buffer)
+
+    def test_mmap_is_not_copied(self):
+        with tempfile.TemporaryFile() as fh:
+            fh.write(_card_png())
+            fh.flush()
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                self.assertIs(verification_utils._image_data(buffer), buffer)
+                self.assertDecodedInPlace(buffer)
+
+    def test_memoryview_is_not_copied(self):
+        self.assertDecodedInPlace(memoryview(_card_png()))
+
+
+class PreprocessTiltTests(SimpleTestCase):
+    """Tilted cards come out of preprocess_for_ocr upright, whatever OpenCV's angle convention."""
+
+    def tilted_card(self, tilt):
+        # 640x400 light card with a dark stripe along its top, on a dark background
+        photo = np.full((900, 1200), 40, np.uint8)
+        cv2.rectangle(photo, (280, 250), (920, 650), 230, -1)
+        cv2.rectangle(photo, (340, 300), (860, 330), 0, -1)
+        matrix = cv2.getRotationMatrix2D((600, 450), tilt, 1.0)
+        return cv2.warpAffine(photo, matrix, (1200, 900), borderValue=40)
+
+    def assertUpright(self, tilt):
+        region = verification_utils._card_region(self.tilted_card(tilt))
+        self.assertIsNotNone(region)
+        (_, _), (width, height), angle = region
+        self.assertGreater(width, height)
+        self.assertAlmostEqual(abs(angle), abs(tilt), delta=1)
+
+        card = verification_utils.preprocess_for_ocr(self.tilted_card(tilt))
+        height, width = card.shape
+        self.assertGreater(width, height)
+        # Inside the card (the detected outline runs a few pixels past its
+        # edge) the stripe is a thin horizontal band in the top quarter
+        margin = height // 20
+        inside = card[margin:height - margin, width // 4:3 * width // 4]
+        rows = margin + np.nonzero((inside < 100).any(axis=1))[0]
+        self.assertLess(rows.max() - rows.min(), 45)
+        self.assertLess(rows.max(), height / 4)
+
+    def test_positive_tilt(self):
+        self.assertUpright(10)
+
+    def test_negative_tilt(self):
+        self.assertUpright(-10)
+
+
+class OcrVariantStopTests(SimpleTestCase):
+    """Variants still queued or binarising when verification finishes never reach Tesseract."""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(self.executor.shutdown, wait=True)
+
+    def blocked(self, gray):
+        self.release.wait(5)
+        return gray
+
+    def test_pass_stops_remaining_variants(self):
+        variants = {'pass': lambda gray: gray, 'slow-1': self.blocked, 'slow-2': self.blocked}
+        scores = {'verified': True, 'college_score': 100, 'name_score': 100, 'usn_score': 100, 'domain_score': 0}
+
+        with mock.patch.dict(verification_utils.OCR_VARIANTS, variants), \
+                mock.patch.object(verification_utils, '_get_variant_executor', return_value=self.executor), \
+                mock.patch.object(verification_utils, 'score_ocr_text', return_value=dict(scores)), \
+                mock.patch.object(verification_utils.pytesseract, 'image_to_string', return_value='') as ocr, \
+                override_settings(OCR_VARIANTS={'ENABLED': True, 'WORKERS': 2, 'VARIANTS': list(variants)}):
+            result = verification_utils.score_ocr_variants(_card_png(), 'RVCE', 'Asha', '1RV22CS001')
+            self.release.set()
+            self.executor.shutdown(wait=True)
+
+        self.assertEqual(result['ocr_variant'], 'pass')
+        self.assertEqual(ocr.call_count, 1)
+
+
+@override_settings(OCR_JOBS={'BACKEND': 'immediate', 'TIMEOUT': 300})
+class VerificationJobExpiryTests(TestCase):
+    """A worker and expire_stale_job() never overwrite each other's outcome."""
+
+    def setUp(self):
+        self.job = VerificationJob.objects.create(college_name='RVCE', student_name='Asha', usn='1RV22CS001')
+        # Old enough to be expired by the next status poll
+        VerificationJob.objects.filter(pk=self.job.pk).update(created_at=timezone.now() - timedelta(minutes=10))
+        self.job.refresh_from_db()
+
+    def record(self, *args, **kwargs):
+        verification = StudentVerification.objects.create(
+            college_name='RVCE', student_name='Asha', usn='1RV22CS001', id_image_file='audit.webp',
+            image_sha256='0' * 64, college_score=100, name_score=100, usn_score=100, verified=True,
+        )
+        return {'verified': True}, verification
+
+    def run_job(self, record):
+        with mock.patch.object(verification_jobs, 'record_verification', side_effect=record) as recorded:
+            verification_jobs.run_verification_job(self.job.job_id, b'image')
+        self.job.refresh_from_db()
+        return recorded
+
+    def assertExpired(self):
+        self.assertEqual(self.job.status, VerificationJob.STATUS_FAILED)
+        self.assertEqual(self.job.error, 'Verification timed out')
+        self.assertIsNone(self.job.verification_id)
+
+    def test_expired_job_is_not_run(self):
+        verification_jobs.expire_stale_job(self.job)
+        recorded = self.run_job(self.record)
+        recorded.assert_not_called()
+        self.assertExpired()
+
+    def test_expiry_during_ocr_wins(self):
+        def record_after_expiry(*args, **kwargs):
+            verification_jobs.expire_stale_job(VerificationJob.objects.get(pk=self.job.pk))
+            return self.record()
+
+        self.run_job(record_after_expiry)
+        self.assertExpired()
+
+    def test_stale_copy_does_not_expire_finished_job(self):
+        stale = VerificationJob.objects.get(pk=self.job.pk)
+        self.run_job(self.record)
+        self.assertEqual(self.job.status, VerificationJob.STATUS_DONE)
+
+        job = verification_jobs.expire_stale_job(stale)
+        self.assertEqual(job.status, VerificationJob.STATUS_DONE)
+        self.assertEqual(job.verification_id, self.job.verification_id)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, VerificationJob.STATUS_DONE)
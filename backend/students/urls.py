@@ -1,7 +1,8 @@
 from django.urls import path
 from .views import (
     register, login, me, update_profile, StudentTokenRefreshView, verify_student,
-    register_counselling_student, register_studying_student
+    register_counselling_student, register_studying_student,
+    submit_verification, verification_job_status, verification_image
 )
 
 urlpatterns = [
@@ -15,5 +16,8 @@ urlpatterns = [
     path('me/', me, name='me'),
     path('profile/', update_profile, name='update-profile'),
     path('student/verify/', verify_student, name='verify-student'),
+    path('student/verify/jobs/', submit_verification, name='submit-verification'),
+    path('student/verify/jobs/<uuid:job_id>/', verification_job_status, name='verification-job-status'),
+    path('student/verify/images/<str:token>/', verification_image, name='verification-image'),
 ]
 
@@ -0,0 +1,327 @@
+"""
+Job-based student ID verification.
+
+OCR takes seconds of CPU per upload. Instead of running it inside the request,
+verification is submitted as a VerificationJob and a worker runs the OCR; the
+client polls the job for its result.
+
+Queue backends (settings.OCR_JOBS['BACKEND']):
+- 'thread': bounded in-process thread pool. Tesseract runs as a subprocess,
+  so OCR on worker threads does not hold the GIL.
+- 'immediate': runs the job inline during submit (tests, management commands).
+
+The image bytes are handed to the worker in memory and are never stored
+before OCR; jobs whose worker died (process restart) are reported as failed
+once they are older than OCR_JOBS['TIMEOUT'].
+
+A successful verification hands out a short-lived signed token. Registration
+redeems it (once) to reuse the verification instead of running OCR again,
+provided the same image and details are submitted.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core import signing
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import StudentVerification, VerificationJob
+from .storage import content_hash, store_verification_images
+from .verification_utils import verify_student_id
+
+logger = logging.getLogger(__name__)
+
+_queue = None
+_queue_lock = threading.Lock()
+
+VERIFICATION_TOKEN_SALT = 'students.verification'
+VERIFICATION_IMAGE_SALT = 'students.verification.image'
+
+
+class VerificationQueueFull(RuntimeError):
+    """Raised when too many verification jobs are already pending."""
+
+
+def record_verification(image_data, college_name, student_name, usn, email=None):
+    """
+    Run OCR verification on an image and store the verification record.
+
+    Args:
+        image_data (bytes-like): Uploaded ID card image (bytes, or a buffer
+            from storage.upload_buffer)
+        college_name (str): Expected college name
+        student_name (str): Expected student name
+        usn (str): Expected USN
+        email (str): Optional email, its domain can stand in for the USN
+
+    Returns:
+        tuple: (verify_student_id result dict, StudentVerification)
+    """
+    result = verify_student_id(image_data, college_name, student_name, usn, email=email)
+
+    # Audit copy always, the original upload only if verification failed
+    audit_path, original_path = store_verification_images(image_data, result['verified'])
+    verification = StudentVerification.objects.create(
+        college_name=college_name,
+        student_name=student_name,
+        usn=usn,
+        id_image_file=audit_path,
+        original_image_file=original_path,
+        image_sha256=content_hash(image_data),
+        college_score=result['college_score'],
+        name_score=result['name_score'],
+        usn_score=result['usn_score'],
+        verified=result['verified']
+    )
+    return result, verification
+
+
+def make_verification_token(verification):
+    """Signed token a registration can redeem for this (verified) record."""
+    return signing.dumps(
+        {'v': verification.verification_id, 'h': verification.image_sha256},
+        salt=VERIFICATION_TOKEN_SALT,
+    )
+
+
+def make_image_token(verification):
+    """Signed token for viewing a verification's audit image (see verification_image)."""
+    return signing.dumps(verification.verification_id, salt=VERIFICATION_IMAGE_SALT)
+
+
+def load_image_token(token):
+    """Verification id from an image token, or None if invalid or expired."""
+    try:
+        return signing.loads(
+            token,
+            salt=VERIFICATION_IMAGE_SALT,
+            max_age=getattr(settings, 'VERIFICATION_TOKEN_MAX_AGE', 1800),
+        )
+    except signing.BadSignature:
+        return None
+
+
+def _same_text(a, b):
+    return a.strip().lower() == b.strip().lower()
+
+
+def find_redeemable_verification(token, image_data, college_name, student_name, usn):
+    """
+    Verified, unredeemed record matching a token and the registration details.
+
+    Returns None (so the caller falls back to OCR) if the token is invalid or
+    older than VERIFICATION_TOKEN_MAX_AGE, the image hash differs, the record
+    was already used, or the college, name or USN do not match.
+    """
+    try:
+        payload = signing.loads(
+            token,
+            salt=VERIFICATION_TOKEN_SALT,
+            max_age=getattr(settings, 'VERIFICATION_TOKEN_MAX_AGE', 1800),
+        )
+    except signing.BadSignature:
+        logger.info("Verification token invalid or expired, falling back to OCR")
+        return None
+
+    if payload.get('h') != content_hash(image_data):
+        logger.info("Verification token is for a different image, falling back to OCR")
+        return None
+
+    verification = StudentVerification.objects.filter(
+        verification_id=payload.get('v'),
+        image_sha256=payload.get('h'),
+        verified=True,
+        redeemed_at__isnull=True,
+    ).first()
+    if verification is None:
+        logger.info("Verification token already used or not verified, falling back to OCR")
+        return None
+
+    if not (
+        _same_text(verification.college_name, college_name)
+        and _same_text(verification.student_name, student_name)
+        and _same_text(verification.usn, usn)
+    ):
+        logger.info("Verification token details differ from the registration, falling back to OCR")
+        return None
+    return verification
+
+
+def redeem_verification(verification):
+    """
+    Mark a verification as used by a registration.
+
+    Returns:
+        bool: False if another registration redeemed it first
+    """
+    return StudentVerification.objects.filter(
+        verification_id=verification.verification_id,
+        redeemed_at__isnull=True,
+    ).update(redeemed_at=timezone.now()) == 1
+
+
+def _finish_job(job_id, **fields):
+    """
+    Record a running job's outcome unless it was expired meanwhile.
+
+    Returns:
+        bool: False if the job is no longer running (expire_stale_job won)
+    """
+    return VerificationJob.objects.filter(
+        job_id=job_id,
+        status=VerificationJob.STATUS_RUNNING,
+    ).update(finished_at=timezone.now(), **fields) == 1
+
+
+def run_verification_job(job_id, image_data):
+    """
+    Worker entry point: run one job and record its outcome.
+
+    The job is claimed (pending -> running) and finished (running -> done or
+    failed) with conditional updates, so a job expire_stale_job() already
+    reported as timed out is neither run nor overwritten.
+    """
+    claimed = VerificationJob.objects.filter(
+        job_id=job_id,
+        status=VerificationJob.STATUS_PENDING,
+    ).update(status=VerificationJob.STATUS_RUNNING)
+    if not claimed:
+        logger.warning(f"Verification job {job_id} expired before it started, skipping OCR")
+        return
+
+    job = VerificationJob.objects.get(job_id=job_id)
+    try:
+        _, verification = record_verification(
+            image_data, job.college_name, job.student_name, job.usn, email=job.email or None
+        )
+    except Exception as e:
+        logger.error(f"Verification job {job_id} failed: {e}", exc_info=True)
+        finished = _finish_job(
+            job_id, status=VerificationJob.STATUS_FAILED, error=f'Error processing ID image: {e}'
+        )
+    else:
+        finished = _finish_job(job_id, status=VerificationJob.STATUS_DONE, verification=verification)
+    if not finished:
+        logger.warning(f"Verification job {job_id} expired while running, result discarded")
+
+
+class ThreadVerificationQueue:
+    """
+    Bounded thread pool running verification jobs in this process.
+
+    Args:
+        workers (int): Concurrent OCR jobs
+        max_pending (int): Jobs queued or running at once before submit fails
+    """
+
+    def __init__(self, workers=2, max_pending=16):
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ocr')
+
+    def submit(self, job_id, image_data):
+        if not self._slots.acquire(blocking=False):
+            raise VerificationQueueFull("Verification queue is full")
+        try:
+            future = self._executor.submit(self._run, job_id, image_data)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+    @staticmethod
+    def _run(job_id, image_data):
+        # Worker threads have their own database connections, managed here the
+        # way Django does it around requests
+        close_old_connections()
+        try:
+            run_verification_job(job_id, image_data)
+        except Exception:
+            logger.error(f"Verification job {job_id} crashed", exc_info=True)
+        finally:
+            close_old_connections()
+
+
+class ImmediateVerificationQueue:
+    """Runs jobs synchronously in submit()."""
+
+    def submit(self, job_id, image_data):
+        run_verification_job(job_id, image_data)
+
+
+def get_verification_queue():
+    global _queue
+
+    with _queue_lock:
+        if _queue is None:
+            config = getattr(settings, 'OCR_JOBS', {})
+            backend = config.get('BACKEND', 'thread')
+            if backend == 'immediate':
+                _queue = ImmediateVerificationQueue()
+            elif backend == 'thread':
+                _queue = ThreadVerificationQueue(
+                    workers=config.get('WORKERS', 2),
+                    max_pending=config.get('MAX_PENDING', 16),
+                )
+            else:
+                raise ValueError(f"Unknown OCR_JOBS backend: {backend}")
+        return _queue
+
+
+def submit_verification_job(image_data, college_name, student_name, usn, email=None):
+    """
+    Create a verification job and queue it.
+
+    Returns:
+        VerificationJob: The new job (already finished with the immediate backend)
+
+    Raises:
+        VerificationQueueFull: If the queue is saturated (the job is marked failed)
+    """
+    job = VerificationJob.objects.create(
+        college_name=college_name,
+        student_name=student_name,
+        usn=usn,
+        email=email or '',
+    )
+    try:
+        get_verification_queue().submit(job.job_id, image_data)
+    except VerificationQueueFull:
+        job.status = VerificationJob.STATUS_FAILED
+        job.error = 'Verification queue is full'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        raise
+    job.refresh_from_db()
+    return job
+
+
+def expire_stale_job(job):
+    """
+    Mark a job failed if its worker has not finished it within OCR_JOBS['TIMEOUT'].
+
+    The update only applies while the job is still pending or running, so a
+    worker finishing at the same moment is not overwritten; `job` is
+    refreshed with whichever outcome was stored.
+    """
+    if job.status not in (VerificationJob.STATUS_PENDING, VerificationJob.STATUS_RUNNING):
+        return job
+
+    timeout = getattr(settings, 'OCR_JOBS', {}).get('TIMEOUT', 300)
+    now = timezone.now()
+    if now - job.created_at <= timedelta(seconds=timeout):
+        return job
+
+    expired = VerificationJob.objects.filter(
+        job_id=job.job_id,
+        status__in=(VerificationJob.STATUS_PENDING, VerificationJob.STATUS_RUNNING),
+    ).update(status=VerificationJob.STATUS_FAILED, error='Verification timed out', finished_at=now)
+    if expired:
+        job.status = VerificationJob.STATUS_FAILED
+        job.error = 'Verification timed out'
+        job.finished_at = now
+    else:
+        job.refresh_from_db()
+    return job
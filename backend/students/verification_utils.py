@@ -1,18 +1,35 @@
 """
 OCR and verification utilities - EXACT SAME CODE AS ID_verifying/app.py
 """
+import logging
+import mmap
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pytesseract
 import cv2
 import re
 from rapidfuzz import fuzz
-import base64
 import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
 
 # Set Tesseract path for Windows - same as Flask version
 pytesseract.pytesseract.tesseract_cmd = (
     r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 )
 
+# ISO/IEC 7810 ID-1 card long side, used to pick the OCR resolution
+ID_CARD_WIDTH_INCHES = 3.375
+# Longest side of the copy used to find the card outline
+DETECTION_SIZE = 800
+# Smallest card area, as a fraction of the photo, accepted as a detection
+MIN_CARD_AREA = 0.2
+# Tilts below this many degrees are left alone
+MIN_DESKEW_ANGLE = 0.5
+
 
 def normalize(text):
     """EXACT SAME as Flask version"""
@@ -24,22 +41,125 @@ def fuzzy(a, b):
     return fuzz.partial_ratio(normalize(a), normalize(b))
 
 
-def extract_text(image_file):
+def _card_region(gray):
     """
-    EXACT SAME as Flask version - extract_text(image_path)
+    Locate the ID card in a photo.
+
+    Edges are detected on a small copy of the image and the largest outer
+    contour is taken as the card. Returns its rotated rectangle
+    ((cx, cy), (width, height), angle) in full-resolution coordinates with the
+    angle normalised to [-45, 45], or None if nothing card-sized is found.
+    """
+    height, width = gray.shape
+    scale = min(1.0, DETECTION_SIZE / max(height, width))
+    small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+    edges = cv2.Canny(cv2.GaussianBlur(small, (5, 5), 0), 50, 150)
+    edges = cv2.dilate(edges, np.ones((5, 5), np.uint8), iterations=2)
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+
+    (cx, cy), (rect_w, rect_h), angle = cv2.minAreaRect(max(contours, key=cv2.contourArea))
+    if rect_w * rect_h < MIN_CARD_AREA * small.shape[0] * small.shape[1]:
+        return None
+
+    # minAreaRect reports angles in (0, 90] or, before OpenCV 4.5.1 and again
+    # in 5.x, in [-90, 0); turn either into a small tilt, swapping the sides
+    # with every quarter turn
+    while angle > 45:
+        angle -= 90
+        rect_w, rect_h = rect_h, rect_w
+    while angle < -45:
+        angle += 90
+        rect_w, rect_h = rect_h, rect_w
+    return (cx / scale, cy / scale), (rect_w / scale, rect_h / scale), angle
+
+
+def preprocess_for_ocr(gray, dpi=300):
+    """
+    Crop, deskew and downscale a grayscale ID card photo for Tesseract.
+
+    The card is cropped out of the photo, rotated upright and resized so its
+    long side matches an ID-1 card (3.375in) scanned at `dpi` - about 1000px
+    at 300 DPI instead of the 4000px of a 12MP phone photo. Images that are
+    already smaller are not upscaled.
+    """
+    region = _card_region(gray)
+    if region is None:
+        # No card found: assume the photo is the card and only downscale
+        height, width = gray.shape
+        center, size, angle = (width / 2, height / 2), (width, height), 0.0
+    else:
+        center, size, angle = region
+
+    scale = min(1.0, ID_CARD_WIDTH_INCHES * dpi / max(size))
+    if scale < 1.0:
+        # Area interpolation before rotating avoids aliasing thin strokes
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        center = (center[0] * scale, center[1] * scale)
+    out_w, out_h = int(round(size[0] * scale)), int(round(size[1] * scale))
+
+    # Rotate about the card centre and translate it to the centre of the output
+    matrix = cv2.getRotationMatrix2D(center, angle if abs(angle) > MIN_DESKEW_ANGLE else 0.0, 1.0)
+    matrix[0, 2] += out_w / 2 - center[0]
+    matrix[1, 2] += out_h / 2 - center[1]
+    return cv2.warpAffine(
+        gray, matrix, (out_w, out_h),
+        flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE
+    )
+
+
+def _image_data(image):
+    """
+    Content of an image given as a bytes-like buffer or a file object.
+
+    Buffers are returned as they are (an mmap also has read(), which would copy it).
+    """
+    if isinstance(image, (bytes, bytearray, memoryview, mmap.mmap)):
+        return image
+    if hasattr(image, 'read'):
+        image.seek(0)
+        data = image.read()
+        image.seek(0)
+        return data
+    return image
+
+
+def decode_for_ocr(image_data, preprocess=None):
+    """
+    Decode an uploaded image to the grayscale array that gets thresholded for OCR.
+
+    image_data can be any bytes-like buffer (bytes, memoryview, mmap); it is
+    decoded in place without copying.
+
+    With OCR_PREPROCESS['ENABLED'] (or preprocess=True) the photo is first
+    cropped to the card, deskewed and downscaled by preprocess_for_ocr().
     """
-    # Read image data
-    image_data = image_file.read()
-    image_file.seek(0)
+    if preprocess is None:
+        preprocess = settings.OCR_PREPROCESS['ENABLED']
     
-    # Convert to numpy array
-    nparr = np.frombuffer(image_data, np.uint8)
+    # Decode image - same as cv2.imread in Flask. The array view over the
+    # buffer is dropped straight away so the buffer can be released.
+    img = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("Could not read the ID card image. Please upload a JPEG, PNG or WEBP photo.")
     
-    # Decode image - same as cv2.imread in Flask
-    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    if preprocess:
+        gray = preprocess_for_ocr(gray, dpi=settings.OCR_PREPROCESS['DPI'])
+    return gray
+
+
+def extract_text(image, preprocess=None):
+    """
+    EXACT SAME as Flask version - extract_text(image_path)
+
+    image is a file object or a bytes-like buffer.
+    """
+    gray = decode_for_ocr(_image_data(image), preprocess=preprocess)
     
     # EXACT SAME preprocessing as Flask
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     gray = cv2.threshold(gray, 150, 255, cv2.THRESH_BINARY)[1]
     
     # EXACT SAME OCR
@@ -47,18 +167,75 @@ def extract_text(image_file):
     return text.lower()
 
 
-def verify_student_id(image_file, college_name, student_name, usn, email=None):
+def _threshold(value):
+    return lambda gray: cv2.threshold(gray, value, 255, cv2.THRESH_BINARY)[1]
+
+
+# Binarisations tried by the multi-variant verification mode
+OCR_VARIANTS = {
+    'threshold-150': _threshold(150),  # the single-pass default
+    'threshold-120': _threshold(120),
+    'threshold-180': _threshold(180),
+    'otsu': lambda gray: cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1],
+    'adaptive': lambda gray: cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15
+    ),
+    'upscale-2x': lambda gray: _threshold(150)(
+        cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
+    ),
+}
+
+_variant_executor = None
+_variant_executor_lock = threading.Lock()
+
+
+def validate_ocr_variants(names):
     """
-    EXACT SAME logic as Flask version - index() route
+    Check a configured OCR_VARIANTS['VARIANTS'] list.
+
+    Raises:
+        ImproperlyConfigured: If the list is empty or names an unknown variant
     """
-    # Read image data for storage
-    image_file.seek(0)
-    image_data = image_file.read()
-    image_file.seek(0)
-    
-    # EXACT SAME as Flask: ocr_text = extract_text(image_path)
-    ocr_text = extract_text(image_file)
-    
+    if not names:
+        raise ImproperlyConfigured("OCR_VARIANTS['VARIANTS'] must name at least one variant")
+    unknown = [name for name in names if name not in OCR_VARIANTS]
+    if unknown:
+        raise ImproperlyConfigured(
+            f"Unknown OCR variant(s) {', '.join(unknown)}; choose from {', '.join(OCR_VARIANTS)}"
+        )
+
+
+def _get_variant_executor():
+    global _variant_executor
+    with _variant_executor_lock:
+        if _variant_executor is None:
+            # Checked once, before the first multi-variant verification
+            validate_ocr_variants(settings.OCR_VARIANTS['VARIANTS'])
+            _variant_executor = ThreadPoolExecutor(
+                max_workers=settings.OCR_VARIANTS['WORKERS'],
+                thread_name_prefix='ocr-variant',
+            )
+        return _variant_executor
+
+
+def _ocr_variant(gray, name, stop):
+    """
+    OCR one binarisation, or return None once `stop` is set.
+
+    A Tesseract call that is already running cannot be interrupted, but a
+    variant picked up after the request finished skips it instead of holding
+    a pool thread that later requests are queued behind.
+    """
+    if stop.is_set():
+        return None
+    binary = OCR_VARIANTS[name](gray)
+    if stop.is_set():
+        return None
+    return pytesseract.image_to_string(binary).lower()
+
+
+def score_ocr_text(ocr_text, college_name, student_name, usn, email=None):
+    """Fuzzy scores of OCR text against the submitted details, and the verdict."""
     # EXACT SAME as Flask: college_score = fuzzy(college, ocr_text)
     college_score = fuzzy(college_name, ocr_text)
     name_score = fuzzy(student_name, ocr_text)
@@ -77,20 +254,103 @@ def verify_student_id(image_file, college_name, student_name, usn, email=None):
         (usn_score >= 90 or domain_score >= 80)
     )
     
-    # Encode image to base64 for response
-    image_base64 = base64.b64encode(image_data).decode('utf-8')
-    
-    # EXACT SAME result format as Flask
-    result = {
+    return {
         "verified": verified,
         "college_score": college_score,
         "name_score": name_score,
         "usn_score": usn_score,
-        "image_base64": image_base64
+        "domain_score": domain_score,
+    }
+
+
+def _total_score(scores):
+    return scores["college_score"] + scores["name_score"] + max(scores["usn_score"], scores["domain_score"])
+
+
+def score_ocr_variants(image_data, college_name, student_name, usn, email=None):
+    """
+    OCR several binarisations of the image in parallel, stopping at the first
+    one whose text passes verification.
+
+    Variants (OCR_VARIANTS['VARIANTS']) run on a shared thread pool - each
+    Tesseract call is a separate process - so latency stays close to a single
+    pass. Once a variant passes (or verification fails) the remaining
+    variants are cancelled or, if a thread already picked them up, skip
+    their Tesseract call; if none passes, the best scoring variant is
+    returned.
+
+    Returns:
+        dict: score_ocr_text() result plus the winning "ocr_variant"
+    """
+    gray = decode_for_ocr(image_data)
+    executor = _get_variant_executor()
+    stop = threading.Event()
+    futures = {
+        executor.submit(_ocr_variant, gray, name, stop): name
+        for name in settings.OCR_VARIANTS['VARIANTS']
+    }
+    
+    best = None
+    error = None
+    try:
+        for future in as_completed(futures):
+            try:
+                ocr_text = future.result()
+            except Exception as e:
+                logger.warning("OCR variant %s failed: %s", futures[future], e)
+                error = e
+                continue
+            
+            scores = score_ocr_text(ocr_text, college_name, student_name, usn, email=email)
+            scores["ocr_variant"] = futures[future]
+            if scores["verified"]:
+                return scores
+            if best is None or _total_score(scores) > _total_score(best):
+                best = scores
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+    
+    if best is None:
+        raise error
+    return best
+
+
+def verify_student_id(image, college_name, student_name, usn, email=None, multi_variant=None):
+    """
+    EXACT SAME logic as Flask version - index() route
+
+    image is a bytes-like buffer (see storage.upload_buffer) or a file object,
+    read once. Unlike the Flask version the image is not echoed back as
+    base64; callers link to the stored copy instead.
+
+    With OCR_VARIANTS['ENABLED'] (or multi_variant=True) several binarisations
+    are tried in parallel instead of the single fixed threshold.
+    """
+    if multi_variant is None:
+        multi_variant = settings.OCR_VARIANTS['ENABLED']
+    
+    image_data = _image_data(image)
+    
+    if multi_variant:
+        scores = score_ocr_variants(image_data, college_name, student_name, usn, email=email)
+    else:
+        # EXACT SAME as Flask: ocr_text = extract_text(image_path)
+        ocr_text = extract_text(image_data)
+        scores = score_ocr_text(ocr_text, college_name, student_name, usn, email=email)
+    
+    # EXACT SAME result format as Flask (minus image_base64)
+    result = {
+        "verified": scores["verified"],
+        "college_score": scores["college_score"],
+        "name_score": scores["name_score"],
+        "usn_score": scores["usn_score"],
     }
     
     if email:
-        result["domain_score"] = domain_score
+        result["domain_score"] = scores["domain_score"]
+    if "ocr_variant" in scores:
+        result["ocr_variant"] = scores["ocr_variant"]
     
     return result
-
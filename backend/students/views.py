@@ -1,9 +1,12 @@
+import mimetypes
+
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenRefreshView
+from django.http import FileResponse
 from django.utils import timezone
 from django.conf import settings
 from django.db import IntegrityError
@@ -21,8 +24,22 @@ from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
 from .verification_utils import verify_student_id
 from .models import StudentVerification
+from .storage import store_verification_images, content_hash, upload_buffer
+from .verification_jobs import (
+    record_verification,
+    make_image_token,
+    load_image_token,
+    submit_verification_job,
+    expire_stale_job,
+    make_verification_token,
+    find_redeemable_verification,
+    redeem_verification,
+    VerificationQueueFull,
+)
+from .models import VerificationJob
 from django.db import transaction
 from colleges.models import College
+from kcet_eduguide.ratelimit import rate_limit
 
 
 @api_view(['POST'])
@@ -192,12 +209,17 @@ def me(request):
 @permission_classes([IsAuthenticated])
 def update_profile(request):
     """Update student profile"""
-    student = request.user
-    serializer = StudentSerializer(student, data=request.data, partial=True)
-    
-    if serializer.is_valid():
-        serializer.save()
-        return Response(serializer.data)
+    # request.user may be a cached copy (students.authentication); validate
+    # and write against the current row instead
+    with transaction.atomic():
+        student = Student.objects.select_for_update().select_related('unique_key').get(
+            student_user_id=request.user.student_user_id
+        )
+        serializer = StudentSerializer(student, data=request.data, partial=True)
+        
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -213,10 +235,12 @@ class StudentTokenRefreshView(TokenRefreshView):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@rate_limit('verify_student', '5/m', key='ip', message='Too many verification attempts. Please wait before trying again.')
 def verify_student(request):
     """
     Verify student ID - same pattern as Flask version.
-    Stores image in MySQL database and returns it in response.
+    Stores the image in the ID card storage and returns a short-lived
+    image_url for it (instead of echoing the upload back as base64).
     """
     serializer = StudentVerificationSerializer(data=request.data)
     
@@ -232,38 +256,29 @@ def verify_student(request):
     id_image = serializer.validated_data['id_image']
     
     try:
-        # Read image data for storage
-        id_image.seek(0)
-        image_data = id_image.read()
-        id_image.seek(0)
-        
-        # Verify the ID image - EXACT SAME as Flask version
-        result = verify_student_id(id_image, college_name, student_name, usn)
-        
-        # Store verification record in database with image
-        verification_record = StudentVerification.objects.create(
-            college_name=college_name,
-            student_name=student_name,
-            usn=usn,
-            id_image=image_data,  # Store binary image data in MySQL
-            college_score=result['college_score'],
-            name_score=result['name_score'],
-            usn_score=result['usn_score'],
-            verified=result['verified']
-        )
-        
-        # EXACT SAME response format as Flask version
+        # Verify the ID image - EXACT SAME as Flask version - and store the
+        # verification record with its images. The upload is read in place.
+        with upload_buffer(id_image) as image_data:
+            result, verification_record = record_verification(image_data, college_name, student_name, usn)
+        
+        # EXACT SAME response format as Flask version, with a link to the
+        # stored image instead of the image itself
+        image_token = make_image_token(verification_record)
         response_data = {
             "verified": result["verified"],
             "college_score": result["college_score"],
             "name_score": result["name_score"],
             "usn_score": result["usn_score"],
-            "image_base64": result["image_base64"]
+            "image_url": request.build_absolute_uri(f'/api/auth/student/verify/images/{image_token}/')
         }
         
         if "domain_score" in result:
             response_data["domain_score"] = result["domain_score"]
         
+        if result["verified"]:
+            # Lets register_studying_student skip a second OCR of this image
+            response_data["verification_token"] = make_verification_token(verification_record)
+        
         # Always return 200 OK (same as Flask)
         return Response(response_data, status=status.HTTP_200_OK)
             
@@ -285,6 +300,104 @@ def verify_student(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+def _verification_job_data(job):
+    """Status payload of a verification job (scores once it is done)."""
+    data = {
+        'job_id': str(job.job_id),
+        'status': job.status,
+        'created_at': job.created_at,
+        'finished_at': job.finished_at,
+    }
+    if job.status == VerificationJob.STATUS_FAILED:
+        data['error'] = job.error
+    elif job.status == VerificationJob.STATUS_DONE and job.verification is not None:
+        data['result'] = {
+            'verified': job.verification.verified,
+            'college_score': job.verification.college_score,
+            'name_score': job.verification.name_score,
+            'usn_score': job.verification.usn_score,
+        }
+        if job.verification.verified:
+            data['result']['verification_token'] = make_verification_token(job.verification)
+    return data
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@rate_limit('verify_student', '5/m', key='ip', message='Too many verification attempts. Please wait before trying again.')
+def submit_verification(request):
+    """
+    Queue ID verification and return immediately.
+    
+    Same input as verify_student. Responds 202 with a job id; poll
+    GET /api/auth/student/verify/jobs/<job_id>/ for the result.
+    """
+    serializer = StudentVerificationSerializer(data=request.data)
+    
+    if not serializer.is_valid():
+        return Response(
+            {'errors': serializer.errors, 'message': 'Validation failed'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    id_image = serializer.validated_data['id_image']
+    id_image.seek(0)
+    
+    try:
+        # The worker outlives this request (and the upload), so it gets a copy
+        job = submit_verification_job(
+            id_image.read(),
+            serializer.validated_data['college_name'],
+            serializer.validated_data['student_name'],
+            serializer.validated_data['usn'],
+        )
+    except VerificationQueueFull:
+        return Response(
+            {
+                'error': 'Verification service busy',
+                'message': 'Too many verifications are in progress. Please try again shortly.'
+            },
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': '10'}
+        )
+    
+    data = _verification_job_data(job)
+    data['status_url'] = request.build_absolute_uri(f'/api/auth/student/verify/jobs/{job.job_id}/')
+    return Response(data, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def verification_job_status(request, job_id):
+    """Poll a verification job submitted with submit_verification."""
+    try:
+        job = VerificationJob.objects.select_related('verification').get(job_id=job_id)
+    except VerificationJob.DoesNotExist:
+        return Response({'error': 'Verification job not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(_verification_job_data(expire_stale_job(job)))
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def verification_image(request, token):
+    """Audit copy of a verified ID image, via the signed link from verify_student."""
+    verification_id = load_image_token(token)
+    verification = None
+    if verification_id is not None:
+        verification = StudentVerification.objects.filter(verification_id=verification_id).first()
+    if verification is None or not verification.id_image_file:
+        return Response({'error': 'Image not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    image = verification.id_image_file
+    response = FileResponse(
+        image.open('rb'),
+        content_type=mimetypes.guess_type(image.name)[0] or 'application/octet-stream'
+    )
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def register_counselling_student(request):
@@ -358,11 +471,11 @@ def register_counselling_student(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
-@transaction.atomic
 def register_studying_student(request):
     """
     Register a studying student with verification.
-    Verification and registration happen atomically in a single transaction.
+    OCR runs before any database write; the student and verification records
+    are then created atomically in a single short transaction.
     """
     serializer = StudyingStudentRegisterSerializer(data=request.data)
     
@@ -398,60 +511,87 @@ def register_studying_student(request):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        # STEP 1: Perform verification FIRST
-        id_card_image.seek(0)
-        verification_result = verify_student_id(
-            id_card_image, 
-            college_name, 
-            student_name, 
-            usn, 
-            email=email_id
-        )
-        
-        # STEP 2: If verification FAILS, do NOT create student record
-        if not verification_result['verified']:
-            return Response({
-                'error': 'Verification failed',
-                'message': 'Student ID verification failed. Please ensure all information matches your ID card.',
-                'verification_scores': {
-                    'college_score': verification_result['college_score'],
-                    'name_score': verification_result['name_score'],
-                    'usn_score': verification_result['usn_score'],
-                }
-            }, status=status.HTTP_400_BAD_REQUEST)
-        
-        # STEP 3: Verification PASSED - Create student record with image
-        # Read image data for storage
-        id_card_image.seek(0)
-        image_data = id_card_image.read()
-        
-        # Create student with all data
-        validated_data = serializer.validated_data.copy()
-        validated_data.pop('password_confirm')
-        validated_data.pop('id_card_image')  # Remove from validated_data, we'll set it separately
-        password = validated_data.pop('password')
-        
-        # Normalize email
-        validated_data['email_id'] = validated_data['email_id'].strip().lower()
-        validated_data['type_of_student'] = 'studying'
-        
-        student = Student(**validated_data)
-        student.set_password(password)
-        student.is_verified_student = True
-        student.id_card_image = image_data  # Store binary image data
-        student.save()
-        
-        # Create verification record for audit trail
-        StudentVerification.objects.create(
-            college_name=college_name,
-            student_name=student_name,
-            usn=usn,
-            id_image=image_data,
-            college_score=verification_result['college_score'],
-            name_score=verification_result['name_score'],
-            usn_score=verification_result['usn_score'],
-            verified=True
-        )
+        # The upload is read in place (memory-mapped when Django spooled it
+        # to disk) for hashing, OCR and storage
+        with upload_buffer(id_card_image) as image_data:
+            # STEP 1: Reuse a verification from verify_student when its token is
+            # presented with the same image and details, otherwise run OCR
+            verification = None
+            verification_token = serializer.validated_data.get('verification_token')
+            if verification_token:
+                verification = find_redeemable_verification(
+                    verification_token, image_data, college_name, student_name, usn
+                )
+            
+            if verification is None:
+                verification_result = verify_student_id(
+                    image_data, 
+                    college_name, 
+                    student_name, 
+                    usn, 
+                    email=email_id
+                )
+                
+                # STEP 2: If verification FAILS, do NOT create student record
+                if not verification_result['verified']:
+                    return Response({
+                        'error': 'Verification failed',
+                        'message': 'Student ID verification failed. Please ensure all information matches your ID card.',
+                        'verification_scores': {
+                            'college_score': verification_result['college_score'],
+                            'name_score': verification_result['name_score'],
+                            'usn_score': verification_result['usn_score'],
+                        }
+                    }, status=status.HTTP_400_BAD_REQUEST)
+            
+            # STEP 3: Verification PASSED - Create student record with image
+            # Create student with all data
+            validated_data = serializer.validated_data.copy()
+            validated_data.pop('password_confirm')
+            validated_data.pop('id_card_image')  # Remove from validated_data, we'll set it separately
+            validated_data.pop('verification_token', None)
+            password = validated_data.pop('password')
+            
+            # Normalize email
+            validated_data['email_id'] = validated_data['email_id'].strip().lower()
+            validated_data['type_of_student'] = 'studying'
+            
+            student = Student(**validated_data)
+            student.set_password(password)
+            student.is_verified_student = True
+            
+            if verification is not None:
+                # Same image as the verified record, so its audit copy is ours too
+                student.id_card_file = verification.id_image_file.name
+                with transaction.atomic():
+                    if not redeem_verification(verification):
+                        return Response({
+                            'error': 'Verification already used',
+                            'message': 'This verification was already used for a registration. Please verify your ID again.',
+                        }, status=status.HTTP_409_CONFLICT)
+                    student.save()
+            else:
+                # Audit copy stored once by content hash and referenced from both rows
+                image_path, _ = store_verification_images(image_data, verified=True)
+                student.id_card_file = image_path
+                
+                with transaction.atomic():
+                    student.save()
+                    
+                    # Create verification record for audit trail (used up by
+                    # this registration)
+                    StudentVerification.objects.create(
+                        college_name=college_name,
+                        student_name=student_name,
+                        usn=usn,
+                        id_image_file=image_path,
+                        image_sha256=content_hash(image_data),
+                        college_score=verification_result['college_score'],
+                        name_score=verification_result['name_score'],
+                        usn_score=verification_result['usn_score'],
+                        verified=True,
+                        redeemed_at=timezone.now()
+                    )
         
         student_data = StudentSerializer(student).data
         
@@ -474,7 +614,7 @@ def register_studying_student(request):
             'message': str(e)
         }, status=status.HTTP_400_BAD_REQUEST)
     except IntegrityError as e:
-        # Rollback is automatic with @transaction.atomic
+        # Rollback is automatic with transaction.atomic
         error_message = str(e.args[0]) if e.args else str(e)
         error_message_lower = error_message.lower()
         
@@ -502,7 +642,7 @@ def register_studying_student(request):
             'message': 'A conflict occurred during registration. Please check your information and try again.',
         }, status=status.HTTP_409_CONFLICT)
     except Exception as e:
-        # Rollback is automatic with @transaction.atomic
+        # Rollback is automatic with transaction.atomic
         import logging
         logger = logging.getLogger(__name__)
         logger.error(f"Unexpected registration error: {str(e)}", exc_info=True)
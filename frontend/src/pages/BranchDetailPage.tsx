@@ -4,7 +4,7 @@ import { useAuth } from "../contexts/AuthContext";
 import { branchService, reviewService, meetingService } from "../services/api";
 import StarRating from "../components/StarRating";
 import CustomTooltip from "../components/charts/CustomTooltip";
-import type { Branch, Review, BranchInsightsResponse } from "../types";
+import type { Branch, BranchReview, BranchInsightsResponse } from "../types";
 import {
   LineChart,
   Line,
@@ -259,10 +259,12 @@ const BranchDetailPage = () => {
   const [cutoff, setCutoff] = useState<BranchCutoffResponse | null>(null);
   const [selectedCategory, setSelectedCategory] = useState<string>("");
   const [reviews, setReviews] = useState<{
-    reviews: Review[];
+    reviews: BranchReview[];
+    next: string | null;
     average_ratings: Record<string, number>;
     total_reviews: number;
   } | null>(null);
+  const [loadingMoreReviews, setLoadingMoreReviews] = useState(false);
   const [loading, setLoading] = useState(true);
   const [requestingMeeting, setRequestingMeeting] = useState<string | null>(
     null
@@ -282,6 +284,24 @@ const BranchDetailPage = () => {
     null
   );
 
+  const loadMoreReviews = async () => {
+    if (!publicId || !reviews?.next) return;
+    setLoadingMoreReviews(true);
+    try {
+      const cursor = new URL(reviews.next).searchParams.get("cursor");
+      const page = await reviewService.branchReviews(publicId, cursor);
+      setReviews((prev) =>
+        prev
+          ? { ...prev, reviews: [...prev.reviews, ...page.reviews], next: page.next }
+          : page
+      );
+    } catch (err) {
+      console.error(err);
+    } finally {
+      setLoadingMoreReviews(false);
+    }
+  };
+
   const prepareChartData = (
     categoryData?: Record<string, { r1?: any; r2?: any; r3?: any }>
   ) => {
@@ -958,9 +978,7 @@ border border-teal-200 dark:border-slate-700 text-white font-semibold py-2.5 sha
                     className="hover:bg-slate-50 dark:hover:bg-slate-700"
                   >
                     <td className="px-6 py-4 align-top font-medium text-sm text-slate-900 dark:text-gray-100">
-                      {r.student_user_id_data?.name ||
-                        r.student_user_id_data?.email_id ||
-                        r.student_user_id}
+                      {r.student_user_id_data?.name || r.student_user_id}
                     </td>
 
                     <td className="px-6 py-4 align-top text-sm text-slate-800 dark:text-gray-200">
@@ -1010,6 +1028,17 @@ border border-teal-200 dark:border-slate-700 text-white font-semibold py-2.5 sha
                 ))}
               </tbody>
             </table>
+            {reviews.next && (
+              <div className="mt-4 text-center">
+                <button
+                  onClick={loadMoreReviews}
+                  disabled={loadingMoreReviews}
+                  className="text-blue-600 dark:text-sky-400 hover:text-blue-800 dark:hover:text-sky-300 disabled:text-slate-400 dark:disabled:text-gray-600 disabled:cursor-not-allowed"
+                >
+                  {loadingMoreReviews ? "Loading..." : "Load more reviews"}
+                </button>
+              </div>
+            )}
           </div>
         ) : (
           <p className="text-slate-500 dark:text-gray-400">
@@ -8,6 +8,9 @@ const MeetingPage = () => {
   const [requests, setRequests] = useState<Meeting[]>([])
   const [invitations, setInvitations] = useState<Meeting[]>([])
   const [loading, setLoading] = useState(false)
+  // Page number of the next page of meetings (null when all are loaded)
+  const [nextPage, setNextPage] = useState<number | null>(null)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
     // Only load meetings if user is authenticated and not loading
@@ -19,29 +22,60 @@ const MeetingPage = () => {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [authLoading, user])
 
+  // Reload when the server pushes a meeting status change instead of polling
+  useEffect(() => {
+    if (authLoading || !user) return
+    const source = meetingService.subscribeEvents(() => {
+      loadMeetings()
+    })
+    return () => source?.close()
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [authLoading, user])
+
+  const isCounselling = () => user?.type_of_student === 'counselling'
+
+  const fetchMeetingPage = (page: number) =>
+    isCounselling() ? meetingService.myRequests(page) : meetingService.myInvitations(page)
+
+  const setMeetings = (update: (prev: Meeting[]) => Meeting[]) => {
+    if (isCounselling()) {
+      setRequests(update)
+    } else {
+      setInvitations(update)
+    }
+  }
+
+  // First page only; older meetings are loaded on demand
   const loadMeetings = async () => {
     setLoading(true)
     try {
-      if (user?.type_of_student === 'counselling') {
-        const data = await meetingService.myRequests()
-        setRequests(Array.isArray(data) ? data : [])
-      } else {
-        const data = await meetingService.myInvitations()
-        setInvitations(Array.isArray(data) ? data : [])
-      }
+      const data = await fetchMeetingPage(1)
+      setMeetings(() => data.results)
+      setNextPage(data.next ? 2 : null)
     } catch (err) {
       console.error('Error loading meetings:', err)
       // Set empty arrays on error to prevent UI issues
-      if (user?.type_of_student === 'counselling') {
-        setRequests([])
-      } else {
-        setInvitations([])
-      }
+      setMeetings(() => [])
+      setNextPage(null)
     } finally {
       setLoading(false)
     }
   }
 
+  const loadMoreMeetings = async () => {
+    if (!nextPage) return
+    setLoadingMore(true)
+    try {
+      const data = await fetchMeetingPage(nextPage)
+      setMeetings((prev) => [...prev, ...data.results])
+      setNextPage(data.next ? nextPage + 1 : null)
+    } catch (err) {
+      console.error('Error loading more meetings:', err)
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleStatusUpdate = async (meetingId: number, status: string) => {
     try {
       await meetingService.updateStatus(meetingId, status)
@@ -132,6 +166,17 @@ const MeetingPage = () => {
               ))}
             </div>
           )}
+          {!loading && nextPage && (
+            <div className="mt-4 text-center">
+              <button
+                onClick={loadMoreMeetings}
+                disabled={loadingMore}
+                className="text-blue-600 dark:text-sky-400 hover:text-blue-800 dark:hover:text-sky-300 disabled:text-slate-400 dark:disabled:text-gray-600 disabled:cursor-not-allowed"
+              >
+                {loadingMore ? 'Loading...' : 'Load more meetings'}
+              </button>
+            </div>
+          )}
         </div>
       )}
 
@@ -203,6 +248,17 @@ const MeetingPage = () => {
               ))}
             </div>
           )}
+          {!loading && nextPage && (
+            <div className="mt-4 text-center">
+              <button
+                onClick={loadMoreMeetings}
+                disabled={loadingMore}
+                className="text-blue-600 dark:text-sky-400 hover:text-blue-800 dark:hover:text-sky-300 disabled:text-slate-400 dark:disabled:text-gray-600 disabled:cursor-not-allowed"
+              >
+                {loadingMore ? 'Loading...' : 'Load more meetings'}
+              </button>
+            </div>
+          )}
         </div>
       )}
     </div>
@@ -8,6 +8,10 @@ const StudyingDashboard = () => {
   const { user, loading: authLoading } = useAuth();
 
   const [invitations, setInvitations] = useState<Meeting[]>([]);
+  // Pending requests in total and the next page to load (null when all are loaded)
+  const [invitationCount, setInvitationCount] = useState(0);
+  const [nextInvitationPage, setNextInvitationPage] = useState<number | null>(null);
+  const [loadingMoreInvitations, setLoadingMoreInvitations] = useState(false);
   const [showReviewForm, setShowReviewForm] = useState(false);
   const [branchName, setBranchName] = useState("");
   const [collegeName, setCollegeName] = useState("");
@@ -18,6 +22,33 @@ const StudyingDashboard = () => {
   const [validationSummary, setValidationSummary] = useState<Record<string, 'HUMAN-WRITTEN' | 'AI-GENERATED'> | null>(null);
   const [showValidationSummary, setShowValidationSummary] = useState(false);
 
+  // Pending meeting requests, one page at a time (page 1 replaces the list)
+  const loadInvitations = async (page = 1) => {
+    try {
+      const data = await meetingService.myInvitations(page, "requested");
+      setInvitations((prev) => (page === 1 ? data.results : [...prev, ...data.results]));
+      setInvitationCount(data.count);
+      setNextInvitationPage(data.next ? page + 1 : null);
+    } catch (err) {
+      console.error("Error loading invitations:", err);
+      if (page === 1) {
+        setInvitations([]);
+        setInvitationCount(0);
+        setNextInvitationPage(null);
+      }
+    }
+  };
+
+  const loadMoreInvitations = async () => {
+    if (!nextInvitationPage) return;
+    setLoadingMoreInvitations(true);
+    try {
+      await loadInvitations(nextInvitationPage);
+    } finally {
+      setLoadingMoreInvitations(false);
+    }
+  };
+
   const daysOfWeek = [
     "Monday",
     "Tuesday",
@@ -86,21 +117,6 @@ const StudyingDashboard = () => {
       }
     };
 
-    // load meeting requests
-    const loadInvitations = async () => {
-      try {
-        const data = await meetingService.myInvitations();
-        if (Array.isArray(data)) {
-          setInvitations(data.filter((m) => m.status === "requested"));
-        } else {
-          setInvitations([]);
-        }
-      } catch (err) {
-        console.error("Error loading invitations:", err);
-        setInvitations([]);
-      }
-    };
-
     // load existing review
     const loadExistingReview = async () => {
       try {
@@ -283,8 +299,7 @@ const StudyingDashboard = () => {
   const handleMeetingStatus = async (meetingId: number, status: string) => {
     try {
       await meetingService.updateStatus(meetingId, status);
-      const data = await meetingService.myInvitations();
-      setInvitations(data.filter((m) => m.status === "requested"));
+      await loadInvitations();
     } catch (err: any) {
       alert(err.response?.data?.error || "Error updating meeting status");
     }
@@ -372,7 +387,7 @@ const StudyingDashboard = () => {
         {/* Meeting Requests stays second */}
         <div className="bg-white dark:bg-slate-800 p-6 rounded-lg shadow-md border border-slate-300 dark:border-slate-700">
           <h2 className="text-xl font-semibold mb-4 text-slate-800 dark:text-gray-100">
-            Meeting Requests ({invitations.length})
+            Meeting Requests ({invitationCount})
           </h2>
           {invitations.length === 0 ? (
             <p className="text-slate-500 dark:text-gray-400">
@@ -410,6 +425,17 @@ const StudyingDashboard = () => {
               ))}
             </div>
           )}
+          {nextInvitationPage && (
+            <div className="mt-4 text-center">
+              <button
+                onClick={loadMoreInvitations}
+                disabled={loadingMoreInvitations}
+                className="text-blue-600 dark:text-sky-400 hover:text-blue-800 dark:hover:text-sky-300 disabled:text-slate-400 dark:disabled:text-gray-600 disabled:cursor-not-allowed"
+              >
+                {loadingMoreInvitations ? "Loading..." : "Load more requests"}
+              </button>
+            </div>
+          )}
         </div>
       </div>
 
@@ -4,7 +4,10 @@ import type {
   Recommendation,
   CounsellingChoice,
   Review,
+  BranchReview,
   Meeting,
+  MeetingListPage,
+  MeetingStatusEvent,
   College,
   Branch,
   Category,
@@ -177,6 +180,32 @@ export const studentVerificationService = {
     })
     return response.data
   },
+
+  // Queue verification; poll jobStatus(job_id) until status is done/failed
+  submitJob: async (
+    collegeName: string,
+    studentName: string,
+    usn: string,
+    idImage: File
+  ) => {
+    const formData = new FormData()
+    formData.append('college_name', collegeName)
+    formData.append('student_name', studentName)
+    formData.append('usn', usn)
+    formData.append('id_image', idImage)
+
+    const response = await api.post('/auth/student/verify/jobs/', formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+    })
+    return response.data
+  },
+
+  jobStatus: async (jobId: string) => {
+    const response = await api.get(`/auth/student/verify/jobs/${jobId}/`)
+    return response.data
+  },
 }
 
 // // services/api.ts  (replace existing collegeService block with this)
@@ -369,12 +398,17 @@ export const reviewService = {
     await api.delete(`/reviews/my-review/${uniqueKey}/delete/`)
   },
 
-  branchReviews: async (publicId: string): Promise<{
-    reviews: Review[]
+  branchReviews: async (publicId: string, cursor?: string | null): Promise<{
+    branch: Branch
+    reviews: BranchReview[]
+    next: string | null
+    previous: string | null
     average_ratings: Record<string, number>
     total_reviews: number
   }> => {
-    const response = await api.get(`/reviews/branches/${publicId}/`)
+    const response = await api.get(`/reviews/branches/${publicId}/`, {
+      params: cursor ? { cursor } : undefined,
+    })
     return response.data
   },
 
@@ -409,6 +443,12 @@ export const reviewService = {
   },
 }
 
+// Meeting list refresh interval when the server cannot stream events
+const MEETING_POLL_MS = 30000
+const MEETING_RECONNECT_MS = 5000
+
+const EMPTY_MEETING_PAGE: MeetingListPage = { count: 0, next: null, previous: null, results: [] }
+
 export const meetingService = {
   request: async (studyingUserId: string, scheduledTime?: string): Promise<Meeting> => {
     const response = await api.post('/meetings/request/', {
@@ -418,20 +458,22 @@ export const meetingService = {
     return response.data
   },
 
-  myRequests: async (): Promise<Meeting[]> => {
-    const response = await api.get('/meetings/my-requests/')
+  // Meeting lists are paginated; pass page + 1 while `next` is set to load
+  // more. `status` narrows the list (e.g. 'requested').
+  myRequests: async (page = 1, status?: string): Promise<MeetingListPage> => {
+    const response = await api.get('/meetings/my-requests/', { params: { page, status } })
     return response.data
   },
 
-  myInvitations: async (): Promise<Meeting[]> => {
+  myInvitations: async (page = 1, status?: string): Promise<MeetingListPage> => {
     try {
-      const response = await api.get('/meetings/my-invitations/')
-      return response.data || []
+      const response = await api.get('/meetings/my-invitations/', { params: { page, status } })
+      return response.data || EMPTY_MEETING_PAGE
     } catch (error: any) {
-      // If 401 or other auth errors, return empty array instead of throwing
+      // If 401 or other auth errors, return an empty page instead of throwing
       if (error.response?.status === 401 || error.response?.status === 403) {
         console.error('Authentication error loading invitations:', error)
-        return []
+        return EMPTY_MEETING_PAGE
       }
       throw error
     }
@@ -445,8 +487,86 @@ export const meetingService = {
     return response.data
   },
 
-  branchStudents: async (publicId: string) => {
-    const response = await api.get(`/meetings/branches/${publicId}/students/`)
+  // Server-sent meeting status changes for the logged-in student. EventSource
+  // cannot send headers, so each connection is opened with a short-lived
+  // ticket (not the access token); when the stream drops or ends a new ticket
+  // is fetched and onChange() is called to catch up on missed events. If the
+  // server cannot stream (503: WSGI, or several workers without a shared
+  // broker) onChange() is called every MEETING_POLL_MS instead. Call close() to stop.
+  subscribeEvents: (onChange: (event?: MeetingStatusEvent) => void): { close: () => void } => {
+    let source: EventSource | null = null
+    let retry: ReturnType<typeof setTimeout> | undefined
+    let poll: ReturnType<typeof setInterval> | undefined
+    let closed = false
+    let reconnecting = false
+
+    const connect = async () => {
+      let ticket: string
+      try {
+        const response = await api.post('/meetings/events/ticket/')
+        ticket = response.data.ticket
+      } catch (error: any) {
+        if (closed) return
+        const status = error.response?.status
+        if (status === 503) {
+          poll = setInterval(() => onChange(), MEETING_POLL_MS)
+        } else if (status !== 401 && status !== 403) {
+          retry = setTimeout(connect, MEETING_RECONNECT_MS)
+        }
+        return
+      }
+      if (closed) return
+
+      source = new EventSource(
+        `${API_BASE_URL}/meetings/events/?ticket=${encodeURIComponent(ticket)}`
+      )
+      source.addEventListener('open', () => {
+        if (reconnecting) onChange()
+      })
+      source.addEventListener('meeting.status', (message) => {
+        onChange(JSON.parse((message as MessageEvent).data))
+      })
+      source.onerror = () => {
+        // The ticket may have expired; reconnect with a new one
+        source?.close()
+        source = null
+        reconnecting = true
+        if (!closed) retry = setTimeout(connect, MEETING_RECONNECT_MS)
+      }
+    }
+
+    connect()
+    return {
+      close: () => {
+        closed = true
+        source?.close()
+        clearTimeout(retry)
+        clearInterval(poll)
+      },
+    }
+  },
+
+  // Free periods of a studying student in [start, end) (ISO 8601; default the next 7 days)
+  freeSlots: async (
+    studentUserId: string,
+    params?: { start?: string; end?: string; duration?: number }
+  ): Promise<{
+    student_user_id: string
+    start: string
+    end: string
+    duration_minutes: number
+    free_slots: { start: string; end: string }[]
+  }> => {
+    const response = await api.get(`/meetings/students/${studentUserId}/free-slots/`, { params })
+    return response.data
+  },
+
+  // Paginated; pass the `next` link's cursor to fetch the following page.
+  // `page_count` is the number of students on this page, not a total.
+  branchStudents: async (publicId: string, cursor?: string | null) => {
+    const response = await api.get(`/meetings/branches/${publicId}/students/`, {
+      params: cursor ? { cursor } : undefined,
+    })
     return response.data
   },
 }
@@ -74,6 +74,8 @@ export interface Review {
   student_user_id: string
   student_user_id_data?: Student
   unique_key: string
+  // Sent by the single-review endpoints, not by branch listings (BranchReview)
+  unique_key_data?: Branch
   teaching_rating: number
   courses_rating: number
   library_rating: number
@@ -98,12 +100,38 @@ export interface Review {
   placement_review?: string
 }
 
+// Reviewing student as shown in branch review listings: no contact details
+export interface Reviewer {
+  student_user_id: string
+  name?: string | null
+  year_of_starting?: number | null
+}
+
+// Review in a branch listing (BranchReviewSerializer); the branch is sent
+// once at the top level of the response instead of in every review
+export interface BranchReview extends Omit<Review, 'student_user_id_data' | 'unique_key_data'> {
+  student_user_id_data?: Reviewer
+  review_date?: string
+}
+
+// Participant as returned by the meeting list endpoints
+export interface MeetingParticipant {
+  student_user_id: string
+  type_of_student: 'counselling' | 'studying'
+  name?: string
+  email_id: string
+  year_of_starting?: number
+  unique_key?: string
+  branch_name?: string | null
+  college_name?: string | null
+}
+
 export interface Meeting {
   meeting_id: number
   counselling_user_id: string
   studying_user_id: string
-  counselling_user_id_data?: Student
-  studying_user_id_data?: Student
+  counselling_user_id_data?: MeetingParticipant
+  studying_user_id_data?: MeetingParticipant
   scheduled_time?: string
   duration_minutes: number
   meet_link?: string
@@ -112,6 +140,27 @@ export interface Meeting {
   updated_at?: string
 }
 
+// Pushed by /meetings/events/ when a meeting is created or changes status
+// One page of a meeting list (MeetingPagination)
+export interface MeetingListPage {
+  count: number
+  next: string | null
+  previous: string | null
+  results: Meeting[]
+}
+
+export interface MeetingStatusEvent {
+  type: 'meeting.status'
+  meeting_id: number
+  status: Meeting['status']
+  counselling_user_id: string
+  studying_user_id: string
+  scheduled_time?: string | null
+  duration_minutes: number
+  meet_link?: string | null
+  updated_at?: string
+}
+
 export interface BranchInsightsResponse {
   about: string
   admission_cutoffs: string